@@ -0,0 +1,289 @@
+"""
+Alert engine di background untuk signal trading di seluruh watchlist
+
+Setiap siklus (ALERT_INTERVAL detik):
+1. Ambil quote watchlist lewat get_cmc_quotes (cache yang sama dengan UI, jadi
+   request ke CMC hanya terjadi saat TTL freshness habis)
+2. Bandingkan input (harga, perubahan 24h, perubahan volume) dengan siklus
+   sebelumnya; hanya coin yang berubah yang dievaluasi ulang
+3. Evaluasi rule secara vectorized (analysis.generate_signals_table)
+4. Alert hanya dikirim saat rule berubah dari tidak aktif -> aktif, tidak
+   diulang dalam ALERT_COOLDOWN detik, dan dibatasi ALERT_RATE_LIMIT per menit
+5. Kirim ke sink: file JSONL (ALERTS_FILE) dan webhook (ALERT_WEBHOOK_URL)
+
+Aktif dengan ALERTS_ENABLED=1
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+import requests
+import streamlit as st
+
+import metrics
+from analysis import generate_signals_table
+from fetchers import get_cmc_quotes, get_fear_greed_index
+from watchlist import load_watchlist
+
+# ===== KONFIGURASI ALERT =====
+ALERTS_ENABLED = os.getenv("ALERTS_ENABLED", "").lower() in ("1", "true", "yes")
+ALERTS_FILE = os.getenv("ALERTS_FILE", "alerts.jsonl")
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL")
+ALERT_INTERVAL = float(os.getenv("ALERT_INTERVAL", "60"))
+ALERT_COOLDOWN = float(os.getenv("ALERT_COOLDOWN", "3600"))
+ALERT_RATE_LIMIT = int(os.getenv("ALERT_RATE_LIMIT", "30"))  # Alert per menit (semua sink)
+RECENT_ALERTS = 200
+
+# Rule per coin dan pesannya (sama dengan deskripsi di tab Trading Signals)
+COIN_RULES = {
+    "STRONG BUY": "Above pivot + bullish momentum",
+    "STRONG SELL": "Below pivot + bearish momentum",
+    "NEAR SUPPORT": "Only {support_distance:.1f}% above support",
+    "NEAR RESISTANCE": "Only {resistance_distance:.1f}% below resistance",
+    "Volume Spike": "High trading activity - trend confirmation",
+}
+# Rule market-wide: satu alert untuk seluruh market, bukan per coin
+MARKET_RULES = {
+    "EXTREME FEAR": "Market panic - potential opportunity",
+    "EXTREME GREED": "Market euphoria - exercise caution",
+}
+ENABLED_RULES = [
+    rule.strip() for rule in os.getenv("ALERT_RULES", ",".join([*COIN_RULES, *MARKET_RULES])).split(",")
+    if rule.strip()
+]
+INPUT_COLUMNS = ["harga", "perubahan_24h", "volume_change"]
+MARKET_ID = 0  # coin_id untuk rule market-wide
+
+
+# ===== SINK =====
+class LogFileSink:
+    """Tambahkan alert ke file JSONL, satu alert per baris"""
+    name = "log_file"
+
+    def __init__(self, path=ALERTS_FILE):
+        self.path = path
+
+    def send(self, alerts):
+        with open(self.path, "a") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+class WebhookSink:
+    """POST satu batch alert sebagai JSON, misalnya ke /webhook di mock_upstream.py"""
+    name = "webhook"
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        response = requests.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+        response.raise_for_status()
+
+def default_sinks():
+    sinks = [LogFileSink()]
+    if ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(ALERT_WEBHOOK_URL))
+    return sinks
+
+
+# ===== ENGINE =====
+class RateLimiter:
+    """Token bucket: `rate` alert per `per` detik, sisa token bertambah terus"""
+
+    def __init__(self, rate, per=60.0):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def allow(self, now=None):
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class AlertEngine:
+    """
+    Evaluasi rule untuk watchlist. fetch_quotes(coin_ids) -> QuoteTable dan
+    fetch_fear_greed() -> dict/None bisa diganti (misalnya untuk benchmark)
+    """
+
+    def __init__(self, fetch_quotes, fetch_fear_greed, sinks=None, watchlist=load_watchlist,
+                 rules=ENABLED_RULES, cooldown=ALERT_COOLDOWN, rate_limit=ALERT_RATE_LIMIT):
+        self.fetch_quotes = fetch_quotes
+        self.fetch_fear_greed = fetch_fear_greed
+        self.sinks = default_sinks() if sinks is None else sinks
+        self.watchlist = watchlist
+        self.coin_rules = [rule for rule in rules if rule in COIN_RULES]
+        self.market_rules = [rule for rule in rules if rule in MARKET_RULES]
+        self.cooldown = cooldown
+        self.limiter = RateLimiter(rate_limit)
+        self.lock = threading.Lock()
+        self.inputs = {}        # coin_id -> tuple input terakhir yang dievaluasi
+        self.active = set()     # (coin_id, rule) yang sedang aktif
+        self.last_sent = {}     # (coin_id, rule) -> waktu alert terakhir
+        self.recent = deque(maxlen=RECENT_ALERTS)
+        self.pending = {}       # (coin_id, rule) -> alert yang tertahan rate limit, dicoba lagi siklus berikutnya
+        self.last_cycle = None  # Ringkasan siklus terakhir untuk UI
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ----- siklus -----
+    def run_cycle(self, now=None):
+        """Satu siklus evaluasi, return list alert yang terkirim"""
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        coin_ids = self.watchlist()
+        table = self.fetch_quotes(coin_ids) if coin_ids else None
+        fear_greed = self.fetch_fear_greed()
+        fear_greed_value = fear_greed["value"] if fear_greed else None
+
+        candidates = []
+        changed = 0
+        if table is not None and len(table):
+            changed_table = self._changed_rows(table)
+            changed = len(changed_table)
+            if changed:
+                candidates += self._evaluate_coins(changed_table)
+            # Coin yang keluar dari watchlist: lupakan state-nya
+            watched = set(int(i) for i in table.ids)
+            for coin_id in set(self.inputs) - watched:
+                del self.inputs[coin_id]
+            self.active = {key for key in self.active if key[0] in watched or key[0] == MARKET_ID}
+        candidates += self._evaluate_market(fear_greed_value)
+
+        sent = self._dispatch(candidates, now)
+        with self.lock:
+            self.last_cycle = {
+                "ts": now, "coins": len(table) if table is not None else 0, "changed": changed,
+                "candidates": len(candidates), "sent": len(sent),
+                "seconds": time.perf_counter() - started,
+            }
+        metrics.observe("alert_cycle_seconds", time.perf_counter() - started)
+        metrics.inc("alert_coins_evaluated_total", changed)
+        return sent
+
+    def _changed_rows(self, table):
+        """Sub-tabel berisi coin yang inputnya berbeda dari siklus sebelumnya"""
+        columns = np.column_stack([table.column(name) for name in INPUT_COLUMNS])
+        previous = np.array([self.inputs.get(int(i), (np.nan,) * len(INPUT_COLUMNS)) for i in table.ids])
+        changed = ~(columns == previous).all(axis=1)
+        for coin_id, row in zip(table.ids[changed], columns[changed]):
+            self.inputs[int(coin_id)] = tuple(row)
+        return table.select(table.ids[changed])
+
+    def _evaluate_coins(self, table):
+        """Rule per coin (vectorized), return list ((coin_id, rule), alert) yang baru aktif"""
+        result = generate_signals_table(table)
+        candidates = []
+        for rule in self.coin_rules:
+            firing = result["signals"][rule]
+            for row in np.flatnonzero(firing):
+                key = (int(table.ids[row]), rule)
+                if key in self.active:
+                    continue
+                self.active.add(key)
+                message = COIN_RULES[rule].format(
+                    support_distance=result["support_distance"][row],
+                    resistance_distance=result["resistance_distance"][row],
+                )
+                candidates.append((key, {
+                    "coin_id": key[0],
+                    "symbol": table.column("symbol")[row],
+                    "rule": rule,
+                    "message": message,
+                    "price": float(table.column("harga")[row]),
+                }))
+            # Rule yang sudah tidak aktif boleh memicu alert lagi nanti
+            for row in np.flatnonzero(~firing):
+                self.active.discard((int(table.ids[row]), rule))
+        return candidates
+
+    def _evaluate_market(self, fear_greed_value):
+        candidates = []
+        for rule in self.market_rules:
+            firing = fear_greed_value is not None and (
+                fear_greed_value < 25 if rule == "EXTREME FEAR" else fear_greed_value > 75
+            )
+            key = (MARKET_ID, rule)
+            if not firing:
+                self.active.discard(key)
+            elif key not in self.active:
+                self.active.add(key)
+                candidates.append((key, {
+                    "coin_id": None, "symbol": "MARKET", "rule": rule,
+                    "message": f"{MARKET_RULES[rule]} (Fear & Greed {fear_greed_value})", "price": None,
+                }))
+        return candidates
+
+    def _dispatch(self, candidates, now):
+        """Dedupe (cooldown), rate limit, lalu kirim batch ke semua sink"""
+        sent = []
+        candidates = [*self.pending.items(), *candidates]
+        self.pending = {}
+        for key, alert in candidates:
+            if key not in self.active:
+                continue  # Alert tertahan yang rule-nya sudah tidak aktif lagi
+            if now - self.last_sent.get(key, -np.inf) < self.cooldown:
+                metrics.inc("alerts_suppressed_total", reason="duplicate")
+                continue
+            if not self.limiter.allow():
+                metrics.inc("alerts_suppressed_total", reason="rate_limit")
+                # Coin yang tidak berubah tidak dievaluasi ulang, jadi simpan untuk siklus berikutnya
+                if key in self.active:
+                    self.pending[key] = alert
+                continue
+            self.last_sent[key] = now
+            alert["ts"] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+            sent.append(alert)
+            metrics.inc("alerts_sent_total", rule=alert["rule"])
+
+        if sent:
+            for sink in self.sinks:
+                try:
+                    sink.send(sent)
+                except Exception:
+                    metrics.inc("alert_sink_errors_total", sink=sink.name)
+            with self.lock:
+                self.recent.extend(sent)
+        return sent
+
+    # ----- thread -----
+    def start(self, interval=ALERT_INTERVAL):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="alert-engine", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception:
+                metrics.inc("alert_cycle_errors_total")
+            self._stop.wait(interval)
+
+    def recent_alerts(self):
+        """Alert terbaru lebih dulu"""
+        with self.lock:
+            return list(reversed(self.recent))
+
+
+@st.cache_resource
+def get_alert_engine():
+    """AlertEngine bersama untuk semua sesi, None kalau ALERTS_ENABLED tidak di-set"""
+    if not ALERTS_ENABLED:
+        return None
+    engine = AlertEngine(get_cmc_quotes, get_fear_greed_index)
+    engine.start()
+    return engine
@@ -0,0 +1,227 @@
+import numpy as np
+
+
+# ===== FUNGSI ANALISIS =====
+def analyze_trend(data):
+    """Analisis trend sederhana berdasarkan perubahan harga"""
+    if data["perubahan_24h"] > 5:
+        return "🚀 BULLISH KUAT", "success"
+    elif data["perubahan_24h"] > 1:
+        return "📈 Bullish", "success"
+    elif data["perubahan_24h"] > -1:
+        return "➡️ Sideways", "info"
+    elif data["perubahan_24h"] > -5:
+        return "📉 Bearish", "warning"
+    else:
+        return "💥 BEARISH KUAT", "error"
+
+def calculate_pivot_points(high, low, close):
+    """
+    Hitung Pivot Points menggunakan rumus matematika standar
+    Berdasarkan High, Low, Close dari periode sebelumnya
+    Bisa dipanggil dengan angka biasa atau NumPy array (batch)
+    """
+    # Pivot Point utama
+    pivot_point = (high + low + close) / 3
+
+    # Resistance levels
+    r1 = (2 * pivot_point) - low
+    r2 = pivot_point + (high - low)
+    r3 = high + 2 * (pivot_point - low)
+
+    # Support levels
+    s1 = (2 * pivot_point) - high
+    s2 = pivot_point - (high - low)
+    s3 = low - 2 * (high - pivot_point)
+
+    return {
+        "pivot_point": pivot_point,
+        "resistance": {"R1": r1, "R2": r2, "R3": r3},
+        "support": {"S1": s1, "S2": s2, "S3": s3}
+    }
+
+def calculate_pivot_sets(high, low, close):
+    """
+    Pivot classic, Fibonacci, Camarilla dan Woodie sekaligus
+    Input angka atau NumPy array (misalnya satu elemen per timeframe), format
+    tiap metode sama dengan calculate_pivot_points
+    """
+    price_range = high - low
+    classic = calculate_pivot_points(high, low, close)
+    pivot_point = classic["pivot_point"]
+
+    # Fibonacci: jarak dari pivot = rasio Fibonacci x range
+    fibonacci = {
+        "pivot_point": pivot_point,
+        "resistance": {f"R{i}": pivot_point + ratio * price_range for i, ratio in enumerate([0.382, 0.618, 1.0], 1)},
+        "support": {f"S{i}": pivot_point - ratio * price_range for i, ratio in enumerate([0.382, 0.618, 1.0], 1)},
+    }
+
+    # Camarilla: level dihitung dari close, bukan dari pivot
+    camarilla = {
+        "pivot_point": pivot_point,
+        "resistance": {f"R{i}": close + price_range * 1.1 / divisor for i, divisor in enumerate([12, 6, 4, 2], 1)},
+        "support": {f"S{i}": close - price_range * 1.1 / divisor for i, divisor in enumerate([12, 6, 4, 2], 1)},
+    }
+
+    # Woodie: close diberi bobot dua kali
+    woodie_pivot = (high + low + 2 * close) / 4
+    woodie = {
+        "pivot_point": woodie_pivot,
+        "resistance": {
+            "R1": 2 * woodie_pivot - low,
+            "R2": woodie_pivot + price_range,
+            "R3": high + 2 * (woodie_pivot - low),
+        },
+        "support": {
+            "S1": 2 * woodie_pivot - high,
+            "S2": woodie_pivot - price_range,
+            "S3": low - 2 * (high - woodie_pivot),
+        },
+    }
+
+    return {"Classic": classic, "Fibonacci": fibonacci, "Camarilla": camarilla, "Woodie": woodie}
+
+def estimate_hlc_from_current_price(current_price, change_24h, volume_change):
+    """
+    Estimasi High, Low, Close dari data yang tersedia
+    Untuk crypto, kita estimasi berdasarkan volatilitas 24h
+    """
+    # Estimasi volatility range
+    volatility = abs(change_24h) / 100
+    if volatility < 0.02:  # Low volatility
+        range_multiplier = 0.015
+    elif volatility < 0.05:  # Medium volatility
+        range_multiplier = 0.025
+    else:  # High volatility
+        range_multiplier = 0.04
+
+    # Estimasi high dan low berdasarkan current price dan volatility
+    estimated_high = current_price * (1 + range_multiplier)
+    estimated_low = current_price * (1 - range_multiplier)
+
+    # Close price estimation (current price adjusted by 24h change)
+    estimated_close = current_price / (1 + (change_24h / 100))
+
+    return estimated_high, estimated_low, estimated_close
+
+def estimate_hlc_batch(current_price, change_24h):
+    """Versi vectorized dari estimate_hlc_from_current_price untuk banyak coin sekaligus"""
+    current_price = np.asarray(current_price, dtype=float)
+    change_24h = np.asarray(change_24h, dtype=float)
+    volatility = np.abs(change_24h) / 100
+    range_multiplier = np.select(
+        [volatility < 0.02, volatility < 0.05], [0.015, 0.025], default=0.04
+    )
+    estimated_high = current_price * (1 + range_multiplier)
+    estimated_low = current_price * (1 - range_multiplier)
+    estimated_close = current_price / (1 + (change_24h / 100))
+    return estimated_high, estimated_low, estimated_close
+
+# ===== TRADING SIGNALS =====
+def generate_signals(data, pivot_data, fear_greed):
+    """Daftar (signal, deskripsi) untuk satu coin, dipakai di tab Trading Signals"""
+    signals = []
+
+    # Pivot-based signals
+    if data['harga'] > pivot_data['pivot_point']:
+        if data['perubahan_24h'] > 2:
+            signals.append(("🟢 STRONG BUY", "Above pivot + bullish momentum"))
+        else:
+            signals.append(("🟡 BUY", "Above pivot point - bullish zone"))
+    else:
+        if data['perubahan_24h'] < -2:
+            signals.append(("🔴 STRONG SELL", "Below pivot + bearish momentum"))
+        else:
+            signals.append(("🟡 SELL", "Below pivot point - bearish zone"))
+
+    # Support/Resistance proximity signals
+    nearest_support = max([s for s in pivot_data['support'].values() if s < data['harga']], default=None)
+    nearest_resistance = min([r for r in pivot_data['resistance'].values() if r > data['harga']], default=None)
+
+    if nearest_support:
+        support_distance = ((data['harga'] - nearest_support) / data['harga']) * 100
+        if support_distance < 2:
+            signals.append(("💎 NEAR SUPPORT", f"Only {support_distance:.1f}% above support"))
+
+    if nearest_resistance:
+        resistance_distance = ((nearest_resistance - data['harga']) / data['harga']) * 100
+        if resistance_distance < 2:
+            signals.append(("⚠️ NEAR RESISTANCE", f"Only {resistance_distance:.1f}% below resistance"))
+
+    # Volume confirmation
+    if data['volume_change'] > 20:
+        signals.append(("📈 Volume Spike", "High trading activity - trend confirmation"))
+    elif data['volume_change'] < -20:
+        signals.append(("📉 Low Volume", "Weak activity - trend may reverse"))
+
+    # Fear & Greed context
+    if fear_greed:
+        if fear_greed['value'] < 25:
+            signals.append(("💎 EXTREME FEAR", "Market panic - potential opportunity"))
+        elif fear_greed['value'] > 75:
+            signals.append(("⚠️ EXTREME GREED", "Market euphoria - exercise caution"))
+
+    return signals
+
+def generate_signals_batch(price, change_24h, volume_change, pivot_data, fear_greed_value=None):
+    """
+    Versi vectorized dari generate_signals
+    Input berupa array per coin, pivot_data dari calculate_pivot_points dengan array
+    Return dict nama signal -> boolean array, plus jarak ke support/resistance (%)
+    """
+    price = np.asarray(price, dtype=float)
+    change_24h = np.asarray(change_24h, dtype=float)
+    volume_change = np.asarray(volume_change, dtype=float)
+
+    above_pivot = price > pivot_data['pivot_point']
+
+    supports = np.column_stack(list(pivot_data['support'].values()))
+    resistances = np.column_stack(list(pivot_data['resistance'].values()))
+    price_col = price[:, None]
+    nearest_support = np.where(supports < price_col, supports, -np.inf).max(axis=1)
+    nearest_resistance = np.where(resistances > price_col, resistances, np.inf).min(axis=1)
+
+    # Sama seperti versi scalar: support == 0 dianggap tidak ada
+    has_support = np.isfinite(nearest_support) & (nearest_support != 0)
+    has_resistance = np.isfinite(nearest_resistance)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        support_distance = np.where(has_support, (price - nearest_support) / price * 100, np.nan)
+        resistance_distance = np.where(has_resistance, (nearest_resistance - price) / price * 100, np.nan)
+
+    signals = {
+        "STRONG BUY": above_pivot & (change_24h > 2),
+        "BUY": above_pivot & (change_24h <= 2),
+        "STRONG SELL": ~above_pivot & (change_24h < -2),
+        "SELL": ~above_pivot & (change_24h >= -2),
+        "NEAR SUPPORT": has_support & (support_distance < 2),
+        "NEAR RESISTANCE": has_resistance & (resistance_distance < 2),
+        "Volume Spike": volume_change > 20,
+        "Low Volume": volume_change < -20,
+    }
+
+    fear = fear_greed_value is not None and fear_greed_value < 25
+    greed = fear_greed_value is not None and fear_greed_value > 75
+    signals["EXTREME FEAR"] = np.full(price.shape, fear)
+    signals["EXTREME GREED"] = np.full(price.shape, greed)
+
+    return signals, support_distance, resistance_distance
+
+def generate_signals_table(table, fear_greed_value=None):
+    """
+    generate_signals_batch langsung dari kolom QuoteTable (tanpa copy per coin)
+    Return dict yang sama plus pivot_data dan jarak support/resistance
+    """
+    price = table.column("harga")
+    change_24h = table.column("perubahan_24h")
+    high, low, close = estimate_hlc_batch(price, change_24h)
+    pivot_data = calculate_pivot_points(high, low, close)
+    signals, support_distance, resistance_distance = generate_signals_batch(
+        price, change_24h, table.column("volume_change"), pivot_data, fear_greed_value
+    )
+    return {
+        "signals": signals,
+        "pivot_data": pivot_data,
+        "support_distance": support_distance,
+        "resistance_distance": resistance_distance,
+    }
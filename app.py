@@ -1,123 +1,25 @@
 import streamlit as st
-import requests
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime
+from datetime import datetime, timezone
 import pandas as pd
+import numpy as np
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
-
-# ===== KONFIGURASI API =====
-CMC_API_KEY = os.getenv("CMC_API_KEY")
-FEAR_GREED_API = "https://api.alternative.me/fng/"
-
-# ===== FUNGSI AMBIL DATA =====
-@st.cache_data(ttl=300)  # Cache 5 menit
-def get_cmc_data(coin_id):
-    url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
-    params = {"id": coin_id, "convert": "USD"}
-    
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            data = response.json()["data"][str(coin_id)]
-            quote = data["quote"]["USD"]
-            return {
-                "name": data["name"],
-                "symbol": data["symbol"],
-                "harga": quote["price"],
-                "perubahan_1h": quote.get("percent_change_1h", 0),
-                "perubahan_24h": quote.get("percent_change_24h", 0),
-                "perubahan_7d": quote.get("percent_change_7d", 0),
-                "perubahan_30d": quote.get("percent_change_30d", 0),
-                "volume": quote["volume_24h"],
-                "volume_change": quote.get("volume_change_24h", 0),
-                "market_cap": quote["market_cap"],
-                "market_cap_dominance": quote.get("market_cap_dominance", 0),
-                "fully_diluted_market_cap": quote.get("fully_diluted_market_cap", 0),
-                "last_updated": quote["last_updated"],
-                "circulating_supply": data.get("circulating_supply", 0),
-                "total_supply": data.get("total_supply", 0),
-                "max_supply": data.get("max_supply", 0),
-                "cmc_rank": data.get("cmc_rank", 0)
-            }
-        else:
-            st.error(f"Error API: {response.status_code}")
-            return None
-    except Exception as e:
-        st.error(f"Kesalahan: {str(e)}")
-        return None
-
-@st.cache_data(ttl=3600)  # Cache 1 jam
-def get_fear_greed_index():
-    try:
-        response = requests.get(FEAR_GREED_API)
-        if response.status_code == 200:
-            data = response.json()["data"][0]
-            return {
-                "value": int(data["value"]),
-                "classification": data["value_classification"],
-                "timestamp": data["timestamp"]
-            }
-    except:
-        return None
-
-@st.cache_data(ttl=3600)
-def get_global_metrics():
-    url = "https://pro-api.coinmarketcap.com/v1/global-metrics/quotes/latest"
-    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
-    
-    try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            data = response.json()["data"]["quote"]["USD"]
-            return {
-                "total_market_cap": data["total_market_cap"],
-                "total_volume_24h": data["total_volume_24h"],
-                "bitcoin_dominance": data["btc_dominance"],
-                "eth_dominance": data["eth_dominance"],
-                "defi_dominance": data.get("defi_dominance", 0),
-                "defi_volume": data.get("defi_volume_24h", 0),
-                "stablecoin_dominance": data.get("stablecoin_dominance", 0)
-            }
-    except:
-        return None
-
-# ===== FUNGSI PENCARIAN COIN =====
-@st.cache_data(ttl=3600)
-def search_coin(query):
-    """Search coin by name or symbol"""
-    url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/map"
-    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
-    params = {"listing_status": "active", "limit": 100}
-    
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            coins = response.json()["data"]
-            # Filter berdasarkan query
-            filtered_coins = []
-            query_lower = query.lower()
-            
-            for coin in coins:
-                if (query_lower in coin["name"].lower() or 
-                    query_lower in coin["symbol"].lower()):
-                    filtered_coins.append({
-                        "id": coin["id"],
-                        "name": coin["name"],
-                        "symbol": coin["symbol"],
-                        "display": f"{coin['name']} ({coin['symbol']})"
-                    })
-            
-            return filtered_coins[:20]  # Limit to 20 results
-        else:
-            return []
-    except Exception as e:
-        st.error(f"Error searching coins: {str(e)}")
-        return []
+from fetchers import get_cmc_data, get_fear_greed_index, get_fear_greed_history, get_global_metrics, search_coin, get_price_history, price_history_generation, price_history_covers, get_coin_ids_by_symbol
+from analysis import analyze_trend, calculate_pivot_points, estimate_hlc_from_current_price, generate_signals
+from trading_log import LOG_FILE, OPEN_STATUSES, load_log, empty_log, append_log, save_log, filter_log, to_excel_bytes, open_positions
+from watchlist import load_watchlist, save_watchlist
+import charts
+import freshness
+import market_history
+import metrics
+import risk
+import settlement
+from metrics import span
+from price_stream import get_price_stream, LIVE_PIVOT_MIN_COVERAGE
+from alerts import get_alert_engine
+from resampler import BarResampler
 
 # ===== DAFTAR COIN POPULER =====
 popular_coins = {
@@ -138,66 +40,257 @@ popular_coins = {
     7083: "Uniswap (UNI)"
 }
 
-# ===== FUNGSI ANALISIS =====
-def analyze_trend(data):
-    """Analisis trend sederhana berdasarkan perubahan harga"""
-    if data["perubahan_24h"] > 5:
-        return "🚀 BULLISH KUAT", "success"
-    elif data["perubahan_24h"] > 1:
-        return "📈 Bullish", "success"  
-    elif data["perubahan_24h"] > -1:
-        return "➡️ Sideways", "info"
-    elif data["perubahan_24h"] > -5:
-        return "📉 Bearish", "warning"
+# ===== LIVE STREAM =====
+@st.fragment(run_every="1s")
+def render_live_price(coin_id, data):
+    """Harga Terkini dari stream, di-refresh tiap detik tanpa rerun seluruh app"""
+    live = get_price_stream().snapshot(coin_id)
+    if not live:
+        st.metric("💰 Harga Terkini", f"${data['harga']:,.4f}", f"{data['perubahan_24h']:+.2f}%")
+        st.caption("📡 Menunggu tick pertama...")
+        return
+    # Perubahan 24h dihitung ulang terhadap harga 24 jam lalu dari snapshot REST
+    price_24h_ago = data['harga'] / (1 + data['perubahan_24h'] / 100)
+    change_24h = (live['price'] / price_24h_ago - 1) * 100
+    st.metric("💰 Harga Terkini", f"${live['price']:,.4f}", f"{change_24h:+.2f}%")
+    st.caption(f"📡 Live · {datetime.fromtimestamp(live['ts'], timezone.utc).strftime('%H:%M:%S UTC')}")
+
+@st.fragment(run_every="2s")
+def render_live_indicators(coin_id):
+    """EMA, RSI Wilder dan High/Low rolling yang di-update per tick"""
+    live = get_price_stream().snapshot(coin_id)
+    if not live:
+        st.info("📡 Menunggu data stream...")
+        return
+    st.caption(f"{live['ticks']:,} tick · window {live['coverage_seconds'] / 3600:.1f} jam")
+    if live['ema_fast'] is not None and live['ema_slow'] is not None:
+        ema_trend = "📈 Bullish" if live['ema_fast'] > live['ema_slow'] else "📉 Bearish"
+        st.write(f"**EMA 12/26**: ${live['ema_fast']:,.4f} / ${live['ema_slow']:,.4f} ({ema_trend})")
+    if live['rsi'] is not None:
+        st.write(f"**RSI 14 (Wilder)**: {live['rsi']:.1f}")
+        st.progress(live['rsi'] / 100)
     else:
-        return "💥 BEARISH KUAT", "error"
+        st.write("**RSI 14 (Wilder)**: warming up...")
+    st.write(f"**High/Low Rolling**: ${live['high']:,.4f} / ${live['low']:,.4f}")
 
-def calculate_pivot_points(high, low, close):
+CHART_HISTORY_DAYS = 365
+CHART_WINDOWS = {
+    "15 Menit": 900, "1 Jam": 3600, "6 Jam": 6 * 3600, "24 Jam": 86400,
+    "7 Hari": 7 * 86400, "30 Hari": 30 * 86400, "1 Tahun": 365 * 86400, "Semua": None,
+}
+
+def load_chart_history(coin_id, include_daily):
     """
-    Hitung Pivot Points menggunakan rumus matematika standar
-    Berdasarkan High, Low, Close dari periode sebelumnya
+    Harga per jam (PIVOT_HISTORY_DAYS, sama dengan pivot per timeframe) untuk chart,
+    disambung di depannya dengan harga harian (CHART_HISTORY_DAYS) kalau include_daily
     """
-    # Pivot Point utama
-    pivot_point = (high + low + close) / 3
-    
-    # Resistance levels
-    r1 = (2 * pivot_point) - low
-    r2 = pivot_point + (high - low)
-    r3 = high + 2 * (pivot_point - low)
-    
-    # Support levels
-    s1 = (2 * pivot_point) - high
-    s2 = pivot_point - (high - low)
-    s3 = low - 2 * (high - pivot_point)
-    
-    return {
-        "pivot_point": pivot_point,
-        "resistance": {"R1": r1, "R2": r2, "R3": r3},
-        "support": {"S1": s1, "S2": s2, "S3": s3}
-    }
+    daily_generation = price_history_generation("daily") if include_daily else None
+    return _load_chart_history_cached(coin_id, include_daily, daily_generation, price_history_generation("hourly"))
+
+# *_generation sengaja tanpa underscore supaya ikut jadi key cache
+@metrics.track_cache("load_chart_history")
+@st.cache_data(ttl=2 * 86400, max_entries=20)
+def _load_chart_history_cached(coin_id, include_daily, daily_generation, hourly_generation):
+    metrics.mark_cache_miss()
+    intervals = [(CHART_HISTORY_DAYS, "daily")] if include_daily else []
+    parts = []
+    for days, interval in intervals + [(PIVOT_HISTORY_DAYS, "hourly")]:
+        history = get_price_history([coin_id], days, interval=interval)
+        if history and len(history['ids']):
+            prices = history['prices'][:, 0]
+            valid = np.isfinite(prices)
+            parts.append((history['ts'][valid], prices[valid], np.zeros(valid.sum())))
+    return charts.join_series(parts)
 
-def estimate_hlc_from_current_price(current_price, change_24h, volume_change):
+@st.fragment
+def render_price_chart(coin_id, pivot_data):
     """
-    Estimasi High, Low, Close dari data yang tersedia
-    Untuk crypto, kita estimasi berdasarkan volatilitas 24h
+    Chart harga dari history per jam (plus harian kalau dipilih) disambung tick terbaru stream,
+    dengan overlay pivot/support/resistance
+    Zoom dan geser hanya me-rerun fragment ini; data di-downsample di server (charts.py)
     """
-    # Estimasi volatility range
-    volatility = abs(change_24h) / 100
-    if volatility < 0.02:  # Low volatility
-        range_multiplier = 0.015
-    elif volatility < 0.05:  # Medium volatility  
-        range_multiplier = 0.025
-    else:  # High volatility
-        range_multiplier = 0.04
-    
-    # Estimasi high dan low berdasarkan current price dan volatility
-    estimated_high = current_price * (1 + range_multiplier)
-    estimated_low = current_price * (1 - range_multiplier)
-    
-    # Close price estimation (current price adjusted by 24h change)
-    estimated_close = current_price / (1 + (change_24h / 100))
-    
-    return estimated_high, estimated_low, estimated_close
+    col1, col2, col3 = st.columns([1, 2, 2])
+    with col1:
+        chart_kind = st.radio("Tipe Chart", ["Line", "Candlestick"], horizontal=True, key="chart_kind")
+        # History harian gratis kalau coin sudah di-sync (misalnya untuk portfolio risk);
+        # selain itu fetch pertama memakai credit CMC (1 credit per 100 titik), jadi harus dipilih.
+        # daily_synced ikut di key supaya default berubah setelah history tersimpan
+        daily_synced = price_history_covers(coin_id, CHART_HISTORY_DAYS)
+        include_daily = st.toggle(
+            "History 1 tahun", value=daily_synced, key=f"chart_daily_{coin_id}_{daily_synced:d}",
+            help="Sudah tersimpan, tanpa credit tambahan" if daily_synced
+            else f"Fetch {CHART_HISTORY_DAYS} titik harian (~{-(-CHART_HISTORY_DAYS // 100)} credit CMC)",
+        )
+
+    price_stream = get_price_stream()
+    live = price_stream.history_arrays(coin_id) if price_stream else (np.empty(0),) * 3
+    ts, price, volume = charts.join_series([load_chart_history(coin_id, include_daily), live])
+    if len(ts) < 2:
+        st.info("📡 Belum ada data harga untuk chart")
+        return
+
+    # Zoom yang lebih panjang dari data, atau yang isinya kurang dari 2 titik, tidak ditawarkan
+    total_seconds = ts[-1] - ts[0]
+    zoom_options = [
+        name for name, seconds in CHART_WINDOWS.items()
+        if seconds is None or (seconds < total_seconds and np.count_nonzero(ts >= ts[-1] - seconds) >= 2)
+    ]
+    if st.session_state.get("chart_zoom") not in zoom_options:
+        st.session_state.pop("chart_zoom", None)
+
+    with col2:
+        zoom = st.select_slider("Zoom", options=zoom_options, value="Semua", key="chart_zoom")
+    with col3:
+        position = st.slider("Geser", 0, 100, 100, key="chart_pan", help="100 = data terbaru")
+
+    # Plotly relayout (zoom di browser) tidak dikirim balik ke Streamlit, jadi rentang diatur dari kontrol di atas
+    start = end = None
+    window_seconds = CHART_WINDOWS[zoom]
+    if window_seconds and window_seconds < total_seconds:
+        end = ts[-1] - (100 - position) / 100 * (total_seconds - window_seconds)
+        start = end - window_seconds
+
+    with span("plotly_price_chart"):
+        fig, info = charts.price_figure(
+            ts, price, volume, pivot_data, start, end,
+            kind="candle" if chart_kind == "Candlestick" else "line"
+        )
+        st.plotly_chart(fig)
+    detail = f"bar {info['bar_seconds']}s" if info['bar_seconds'] else "downsampled"
+    sources = ("harian + " if include_daily else "") + "per jam" + (" + tick stream" if len(live[0]) else "")
+    st.caption(f"{info['raw_points']:,} titik → {info['shown_points']:,} ditampilkan ({detail}) · {sources}")
+
+# ===== MULTI-TIMEFRAME PIVOT =====
+PIVOT_HISTORY_DAYS = 35  # Cukup untuk beberapa bar mingguan yang sudah tutup
+PIVOT_METHODS = ["Classic", "Fibonacci", "Camarilla", "Woodie"]
+
+def load_bar_resampler(coin_id):
+    """Bar 1H/4H/1D/1W dari harga per jam quotes/historical, dibangun ulang hanya saat jam berikutnya tutup"""
+    return _load_bar_resampler_cached(coin_id, price_history_generation("hourly"))
+
+# history_generation sengaja tanpa underscore supaya ikut jadi key cache
+@metrics.track_cache("load_bar_resampler")
+@st.cache_data(ttl=2 * 86400, max_entries=20)
+def _load_bar_resampler_cached(coin_id, history_generation):
+    metrics.mark_cache_miss()
+    bars = BarResampler()
+    history = get_price_history([coin_id], PIVOT_HISTORY_DAYS, interval="hourly")
+    if history and len(history['ids']):
+        prices = history['prices'][:, 0]
+        valid = np.isfinite(prices)
+        ts, open_ = history['ts'][valid], prices[valid]
+        # Satu harga per jam: bar jam ini dibuka di harga jam ini dan ditutup di harga jam berikutnya
+        close = np.append(open_[1:], open_[-1:])
+        bars.add_bars(ts, open_, np.maximum(open_, close), np.minimum(open_, close), close)
+    return bars
+
+def timeframe_pivots(coin_id):
+    """Pivot semua timeframe; dengan stream aktif bar terbuka ikut di-update per tick"""
+    price_stream = get_price_stream()
+    if not price_stream:
+        return load_bar_resampler(coin_id).pivots()
+    pivots = price_stream.timeframe_pivots(coin_id)
+    if pivots is None:
+        price_stream.seed_bars(coin_id, load_bar_resampler(coin_id))
+        pivots = price_stream.timeframe_pivots(coin_id)
+    return pivots
+
+def render_timeframe_pivots(coin_id, current_price):
+    """Tabel pivot/support/resistance per timeframe untuk metode yang dipilih"""
+    method = st.radio("Metode Pivot", PIVOT_METHODS, horizontal=True, key="pivot_method")
+    with span("timeframe_pivots"):
+        pivots = timeframe_pivots(coin_id)
+    levels = pivots['levels'][method]
+    if np.isnan(pivots['bar_ts']).all():
+        st.info("Belum ada bar yang tutup untuk menghitung pivot per timeframe.")
+        return
+
+    columns = {"Bar Sumber": [
+        datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d %H:%M') if np.isfinite(ts) else "-"
+        for ts in pivots['bar_ts']
+    ]}
+    columns.update({level: levels['support'][level] for level in reversed(levels['support'])})
+    columns["Pivot"] = levels['pivot_point']
+    columns.update(levels['resistance'])
+    df = pd.DataFrame(columns, index=pivots['timeframes'])
+    df["Posisi"] = np.where(np.isnan(levels['pivot_point']), "-",
+                            np.where(current_price > levels['pivot_point'], "🟢 Above", "🔴 Below"))
+    price_columns = [column for column in df.columns if column not in ("Bar Sumber", "Posisi")]
+    st.dataframe(df.style.format({column: "${:,.4f}" for column in price_columns}, na_rep="-"))
+    st.caption("Pivot periode berjalan dari High/Low/Close bar terakhir yang sudah tutup")
+
+# ===== MARKET HISTORY =====
+HISTORY_RANGES = {"24 Jam": 1, "7 Hari": 7, "30 Hari": 30, "1 Tahun": 365, "Semua": None}
+
+@metrics.track_cache("load_market_history")
+@st.cache_data(ttl=600, max_entries=20)
+def load_market_history(days, latest_ts):
+    """History global metrics; latest_ts ikut jadi key cache supaya snapshot baru langsung terlihat"""
+    metrics.mark_cache_miss()
+    start = latest_ts - days * 86400 if days else None
+    return market_history.load_global_history(start, latest_ts)
+
+# ===== FEAR & GREED HISTORY =====
+FEAR_GREED_RANGES = {"90 Hari": 90, "1 Tahun": 365, "Semua": None}
+FEAR_GREED_ORDER = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
+
+@metrics.track_cache("load_fear_greed_vs_price")
+@st.cache_data(ttl=3600, max_entries=20)
+def load_fear_greed_vs_price(coin_id, days, history_generation):
+    """
+    Harga harian coin (maks 1 tahun) dengan nilai Fear & Greed di hari yang sama
+    history_generation (price_history_generation) ikut jadi key cache supaya ikut refresh dengan history
+    """
+    metrics.mark_cache_miss()
+    history = get_price_history([coin_id], min(days or 365, 365))
+    if not history or not len(history['ids']):
+        return None
+    df = pd.DataFrame({
+        "ts": pd.to_datetime(history['ts'], unit="s", utc=True),
+        "price": history['prices'][:, 0],
+    }).dropna()
+    df = market_history.join_fear_greed(df)
+    # Return hari berikutnya, untuk melihat perilaku harga setelah tiap kondisi sentimen
+    df["next_return"] = df["price"].pct_change().shift(-1) * 100
+    return df
+
+# ===== TRADE SETTLEMENT =====
+def settle_open_trades(df_log, log_file):
+    """
+    Tutup trade terbuka yang TP/SL-nya sudah tersentuh, log disimpan ulang kalau ada yang berubah
+    Return (df_log, jumlah trade ditutup, settlement.unsettled_reasons untuk trade yang tidak bisa dicek)
+    """
+    symbols = settlement.open_symbols(df_log)
+    if not symbols:
+        return df_log, 0, pd.Series(dtype="int64")
+    symbol_ids = get_coin_ids_by_symbol(symbols)
+    coin_ids = sorted({symbol_ids[symbol] for symbol in symbols if symbol in symbol_ids})
+    history = get_price_history(coin_ids, settlement.history_days(df_log)) if coin_ids else None
+    df_log, settled = settlement.settle_trades(df_log, history, symbol_ids)
+    if settled:
+        save_log(df_log, log_file)
+    return df_log, settled, settlement.unsettled_reasons(df_log, history, symbol_ids)
+
+# ===== PORTFOLIO RISK =====
+RISK_HISTORY_DAYS = 365
+RISK_WINDOWS = {"30 Hari": 30, "90 Hari": 90, "180 Hari": 180}
+
+@metrics.track_cache("compute_risk")
+@st.cache_data(ttl=3600, max_entries=50)
+def compute_risk(coin_ids, window, weights, history_generation):
+    """risk.risk_report untuk coin_ids, di-cache per (coin, window, bobot, generation history harian)"""
+    metrics.mark_cache_miss()
+    history = get_price_history(coin_ids, RISK_HISTORY_DAYS)
+    if not history or len(history['ids']) < 2:
+        return None
+    weight_by_id = dict(zip(coin_ids, weights))
+    report = risk.risk_report(
+        history['prices'], [weight_by_id.get(int(coin_id), 0) for coin_id in history['ids']], window
+    )
+    report['symbols'] = history['symbols']
+    report['weights'] = np.array([weight_by_id.get(int(coin_id), 0) for coin_id in history['ids']])
+    report['rolling_dates'] = pd.to_datetime(history['ts'][report['rolling_ends']], unit='s')
+    return report
 
 # ===== APLIKASI STREAMLIT =====
 st.set_page_config(
@@ -206,6 +299,9 @@ st.set_page_config(
     layout="wide"
 )
 
+metrics.start_rerun()
+metrics.start_metrics_server()
+
 st.title("📈 Advanced Crypto Trading Dashboard")
 st.markdown("Dashboard lengkap untuk analisis dan trading cryptocurrency")
 
@@ -310,18 +406,24 @@ if coin_id:
     data = get_cmc_data(coin_id)
     global_data = get_global_metrics()
     fear_greed = get_fear_greed_index()
+    price_stream = get_price_stream()
+    if price_stream:
+        price_stream.subscribe(coin_id)
 else:
     st.warning("⚠️ Silakan pilih atau cari coin terlebih dahulu!")
     st.stop()
 
 if data:
-    with tab1:
+    with tab1, span("tab_overview"):
         # Header coin info
         col1, col2, col3 = st.columns([2, 1, 1])
         with col1:
             st.header(f"{data['name']} ({data['symbol']})")
             st.caption(f"Rank #{data['cmc_rank']} | Selected: {selected_coin_name}")
             st.caption(f"Last Update: {datetime.fromisoformat(data['last_updated'].replace('Z', '+00:00')).strftime('%H:%M:%S UTC')}")
+            refresh = freshness.next_refresh_in(("cmc", coin_id))
+            if refresh:
+                st.caption(f"🔄 Refresh berikutnya: {refresh[0]:.0f}s (TTL adaptif {refresh[1]}s)")
         
         with col2:
             trend, trend_color = analyze_trend(data)
@@ -342,11 +444,14 @@ if data:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric(
-                "💰 Harga Terkini", 
-                f"${data['harga']:,.4f}",
-                f"{data['perubahan_24h']:+.2f}%"
-            )
+            if price_stream:
+                render_live_price(coin_id, data)
+            else:
+                st.metric(
+                    "💰 Harga Terkini", 
+                    f"${data['harga']:,.4f}",
+                    f"{data['perubahan_24h']:+.2f}%"
+                )
         
         with col2:
             st.metric(
@@ -385,13 +490,20 @@ if data:
                 delta_color = "normal" if change >= 0 else "inverse"
                 st.metric(tf, f"{change:+.2f}%", delta_color=delta_color)
 
-    with tab2:
+    with tab2, span("tab_analisis_teknis"):
         st.subheader("📈 Analisis Teknis & Pivot Points")
         
         # Hitung pivot points
-        estimated_high, estimated_low, estimated_close = estimate_hlc_from_current_price(
-            data['harga'], data['perubahan_24h'], data['volume_change']
-        )
+        # Pakai High/Low asli dari stream kalau datanya sudah cukup panjang
+        live = price_stream.snapshot(coin_id) if price_stream else None
+        if live and live['coverage_seconds'] >= LIVE_PIVOT_MIN_COVERAGE:
+            estimated_high, estimated_low, estimated_close = live['high'], live['low'], live['price']
+            pivot_source = f"📡 Berdasarkan High/Low live stream ({live['coverage_seconds'] / 3600:.1f} jam terakhir)"
+        else:
+            estimated_high, estimated_low, estimated_close = estimate_hlc_from_current_price(
+                data['harga'], data['perubahan_24h'], data['volume_change']
+            )
+            pivot_source = "📊 Berdasarkan estimasi High/Low/Close 24h"
         
         pivot_data = calculate_pivot_points(estimated_high, estimated_low, estimated_close)
         current_price = data['harga']
@@ -400,7 +512,7 @@ if data:
         
         with col1:
             st.markdown("### 🎯 Pivot Points Analysis")
-            st.caption("📊 Berdasarkan estimasi High/Low/Close 24h")
+            st.caption(pivot_source)
             
             # Pivot Point utama
             st.info(f"**🎯 Pivot Point**: ${pivot_data['pivot_point']:,.4f}")
@@ -454,6 +566,10 @@ if data:
             else:
                 st.info("✅ Normal Range")
             
+            if price_stream:
+                st.markdown("### 📡 Live Indicators")
+                render_live_indicators(coin_id)
+            
             # Volatility assessment
             st.markdown("### ⚡ Volatility Assessment")
             volatility = abs(data['perubahan_24h'])
@@ -514,7 +630,14 @@ if data:
             vol_mcap_ratio = (data['volume'] / data['market_cap']) * 100
             st.metric("Volume/MCap Ratio", f"{vol_mcap_ratio:.3f}%")
 
-    with tab3:
+        st.markdown("### 🕐 Multi-Timeframe Pivots")
+        live_price = live['price'] if live else current_price
+        render_timeframe_pivots(coin_id, live_price)
+
+        st.markdown("### 📉 Price Chart")
+        render_price_chart(coin_id, pivot_data)
+
+    with tab3, span("tab_market_global"):
         st.subheader("🌍 Global Market Metrics")
         
         if global_data:
@@ -555,15 +678,100 @@ if data:
                 ]
             }
             
-            fig = px.pie(
-                dominance_data, 
-                values='Dominance', 
-                names='Asset',
-                title="Crypto Market Dominance"
-            )
-            st.plotly_chart(fig)
+            with span("plotly_dominance_pie"):
+                fig = px.pie(
+                    dominance_data, 
+                    values='Dominance', 
+                    names='Asset',
+                    title="Crypto Market Dominance"
+                )
+                st.plotly_chart(fig)
 
-    with tab4:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("🏦 DeFi Dominance", f"{global_data['defi_dominance']:.2f}%")
+            with col2:
+                st.metric("💵 Stablecoin Dominance", f"{global_data['stablecoin_dominance']:.2f}%")
+            with col3:
+                st.metric("🔁 DeFi Volume 24h", f"${global_data['defi_volume']:,.0f}")
+
+            # History dominance & market cap dari snapshot yang tersimpan (market_history.py)
+            st.markdown("### 📈 Dominance & Market Cap History")
+            bounds = market_history.history_bounds()
+            if not bounds:
+                st.info("Belum ada history tersimpan. Snapshot dicatat setiap global metrics di-refresh.")
+            else:
+                history_range = st.radio("Rentang", list(HISTORY_RANGES), index=1, horizontal=True, key="history_range")
+                with span("market_history_query"):
+                    history = load_market_history(HISTORY_RANGES[history_range], bounds[1])
+
+                if history.empty:
+                    st.info("Tidak ada snapshot di rentang ini.")
+                else:
+                    with span("plotly_market_history"):
+                        fig = go.Figure()
+                        for column, label in [("bitcoin_dominance", "Bitcoin"), ("eth_dominance", "Ethereum"),
+                                              ("stablecoin_dominance", "Stablecoin"), ("defi_dominance", "DeFi")]:
+                            fig.add_trace(go.Scatter(x=history['ts'], y=history[column], mode='lines', name=label))
+                        fig.update_layout(title="Market Dominance (%)", height=350, hovermode='x unified')
+                        st.plotly_chart(fig)
+
+                        fig = go.Figure()
+                        if 'total_market_cap_min' in history:
+                            # Rollup: tampilkan rentang min-max per bucket sebagai band
+                            fig.add_trace(go.Scatter(x=history['ts'], y=history['total_market_cap_max'], mode='lines',
+                                                     line=dict(width=0), showlegend=False, hoverinfo='skip'))
+                            fig.add_trace(go.Scatter(x=history['ts'], y=history['total_market_cap_min'], mode='lines',
+                                                     line=dict(width=0), fill='tonexty', name='Min-Max', hoverinfo='skip'))
+                        fig.add_trace(go.Scatter(x=history['ts'], y=history['total_market_cap'], mode='lines',
+                                                 name='Total Market Cap'))
+                        fig.update_layout(title="Total Market Cap (USD)", height=350, hovermode='x unified')
+                        st.plotly_chart(fig)
+
+                    resolution = {"raw": "snapshot mentah", "1h": "rollup per jam", "1d": "rollup per hari"}
+                    st.caption(f"{len(history):,} titik · {resolution[history.attrs['resolution']]} · "
+                               f"{bounds[2]:,} snapshot tersimpan sejak "
+                               f"{datetime.fromtimestamp(bounds[0], timezone.utc).strftime('%Y-%m-%d')}")
+
+        # History Fear & Greed: backfill sekali, lalu hanya hari baru yang diambil (fetchers.sync_fear_greed_history)
+        st.markdown("### 😱 Fear & Greed History")
+        fear_greed_range = st.radio("Rentang", list(FEAR_GREED_RANGES), index=1, horizontal=True, key="fear_greed_range")
+        with span("fear_greed_history_query"):
+            fear_greed_history = get_fear_greed_history(FEAR_GREED_RANGES[fear_greed_range])
+
+        if fear_greed_history.empty:
+            st.info("History Fear & Greed belum tersedia.")
+        else:
+            with span("plotly_fear_greed_history"):
+                fig = go.Figure()
+                fig.add_hrect(y0=0, y1=25, fillcolor="#e74c3c", opacity=0.1, line_width=0)
+                fig.add_hrect(y0=75, y1=100, fillcolor="#2ecc71", opacity=0.1, line_width=0)
+                fig.add_trace(go.Scatter(x=fear_greed_history['ts'], y=fear_greed_history['value'],
+                                         mode='lines', name='Fear & Greed'))
+                price_vs_fear_greed = load_fear_greed_vs_price(
+                    coin_id, FEAR_GREED_RANGES[fear_greed_range], price_history_generation("daily")
+                )
+                if price_vs_fear_greed is not None:
+                    fig.add_trace(go.Scatter(x=price_vs_fear_greed['ts'], y=price_vs_fear_greed['price'], mode='lines',
+                                             name=f"Harga {data['symbol'] if data else coin_id}", yaxis='y2'))
+                fig.update_layout(title="Fear & Greed Index", height=350, hovermode='x unified',
+                                  yaxis=dict(range=[0, 100]),
+                                  yaxis2=dict(overlaying='y', side='right', showgrid=False))
+                st.plotly_chart(fig)
+
+            if price_vs_fear_greed is not None:
+                summary = (price_vs_fear_greed.dropna(subset=['fear_greed_classification', 'next_return'])
+                           .groupby('fear_greed_classification')['next_return']
+                           .agg(['count', 'mean', 'median'])
+                           .reindex(FEAR_GREED_ORDER).dropna(how='all'))
+                if not summary.empty:
+                    st.markdown("**Return harian berikutnya per kondisi sentimen**")
+                    st.dataframe(summary.rename(columns={"count": "Hari", "mean": "Rata-rata (%)", "median": "Median (%)"})
+                                 .style.format({"Hari": "{:.0f}", "Rata-rata (%)": "{:+.2f}", "Median (%)": "{:+.2f}"}))
+            st.caption(f"{len(fear_greed_history):,} hari · terakhir "
+                       f"{fear_greed_history['ts'].iloc[-1].strftime('%Y-%m-%d')}")
+
+    with tab4, span("tab_trading_signals"):
         st.subheader("🎯 Trading Signals & Recommendations")
         
         col1, col2 = st.columns(2)
@@ -572,46 +780,7 @@ if data:
             st.markdown("### 🚦 Trading Signals")
             
             # Enhanced signal generation with pivot points
-            signals = []
-            
-            # Pivot-based signals
-            if data['harga'] > pivot_data['pivot_point']:
-                if data['perubahan_24h'] > 2:
-                    signals.append(("🟢 STRONG BUY", "Above pivot + bullish momentum"))
-                else:
-                    signals.append(("🟡 BUY", "Above pivot point - bullish zone"))
-            else:
-                if data['perubahan_24h'] < -2:
-                    signals.append(("🔴 STRONG SELL", "Below pivot + bearish momentum"))
-                else:
-                    signals.append(("🟡 SELL", "Below pivot point - bearish zone"))
-            
-            # Support/Resistance proximity signals
-            nearest_support = max([s for s in pivot_data['support'].values() if s < data['harga']], default=None)
-            nearest_resistance = min([r for r in pivot_data['resistance'].values() if r > data['harga']], default=None)
-            
-            if nearest_support:
-                support_distance = ((data['harga'] - nearest_support) / data['harga']) * 100
-                if support_distance < 2:
-                    signals.append(("💎 NEAR SUPPORT", f"Only {support_distance:.1f}% above support"))
-            
-            if nearest_resistance:
-                resistance_distance = ((nearest_resistance - data['harga']) / data['harga']) * 100
-                if resistance_distance < 2:
-                    signals.append(("⚠️ NEAR RESISTANCE", f"Only {resistance_distance:.1f}% below resistance"))
-            
-            # Volume confirmation
-            if data['volume_change'] > 20:
-                signals.append(("📈 Volume Spike", "High trading activity - trend confirmation"))
-            elif data['volume_change'] < -20:
-                signals.append(("📉 Low Volume", "Weak activity - trend may reverse"))
-            
-            # Fear & Greed context
-            if fear_greed:
-                if fear_greed['value'] < 25:
-                    signals.append(("💎 EXTREME FEAR", "Market panic - potential opportunity"))
-                elif fear_greed['value'] > 75:
-                    signals.append(("⚠️ EXTREME GREED", "Market euphoria - exercise caution"))
+            signals = generate_signals(data, pivot_data, fear_greed)
             
             # Display signals with proper colors
             for signal, description in signals:
@@ -666,21 +835,141 @@ if data:
             
             st.warning("⚠️ **Disclaimer**: Pivot points are estimates based on 24h data. Real High/Low/Close from exchange data will be more accurate!")
 
-    with tab5:
+        # Risk kuantitatif untuk watchlist + coin yang ada di trading log
+        st.markdown("### 🧮 Portfolio Risk")
+        watchlist = load_watchlist()
+        coin_labels = {**popular_coins, coin_id: popular_coins.get(coin_id, selected_coin_name)}
+        # Pilihan di multiselect hanya untuk sesi ini (session_state); file watchlist dipakai
+        # bersama semua sesi dan alert engine, jadi hanya ditulis lewat tombol simpan
+        col1, col2 = st.columns([4, 1], vertical_alignment="bottom")
+        with col1:
+            selected_watchlist = st.multiselect(
+                "⭐ Watchlist",
+                options=list(dict.fromkeys(list(coin_labels) + watchlist)),
+                default=watchlist,
+                format_func=lambda i: coin_labels.get(i, f"Coin ID: {i}"),
+                key="watchlist"
+            )
+        with col2:
+            if st.button("💾 Simpan Watchlist", disabled=set(selected_watchlist) == set(watchlist),
+                         help="Watchlist tersimpan dipakai semua sesi dan alert engine"):
+                save_watchlist(selected_watchlist)
+                st.toast("✅ Watchlist disimpan")
+
+        # Posisi terbuka di trading log (modal per symbol) -> CMC id
+        try:
+            positions = open_positions(load_log(LOG_FILE))
+        except Exception:
+            positions = {}
+        symbol_ids = get_coin_ids_by_symbol(tuple(sorted(positions))) if positions else {}
+        position_modal = {symbol_ids[symbol]: modal for symbol, modal in positions.items() if symbol in symbol_ids}
+        risk_coins = tuple(sorted(set(selected_watchlist) | set(position_modal)))
+
+        col1, col2 = st.columns(2)
+        with col1:
+            risk_window = st.radio("Window", list(RISK_WINDOWS), horizontal=True, key="risk_window")
+        with col2:
+            weighting = st.radio("Bobot", ["Sama rata", "Modal posisi terbuka"], horizontal=True, key="risk_weighting")
+        if weighting == "Modal posisi terbuka" and not position_modal:
+            st.info("Belum ada posisi terbuka (Planned/Open) di trading log, memakai bobot sama rata.")
+            weighting = "Sama rata"
+
+        if len(risk_coins) < 2:
+            st.info("Pilih minimal 2 coin di watchlist untuk menghitung korelasi dan VaR.")
+        else:
+            if weighting == "Sama rata":
+                weights = tuple(1.0 for _ in risk_coins)
+            else:
+                weights = tuple(float(position_modal.get(i, 0)) for i in risk_coins)
+            with span("portfolio_risk"):
+                report = compute_risk(risk_coins, RISK_WINDOWS[risk_window], weights, price_history_generation("daily"))
+
+            if report is None:
+                st.warning("History harga tidak tersedia untuk menghitung risk.")
+            else:
+                var = report['var']
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("📉 VaR 1 Hari (95%)", f"{var['parametric'] * 100:.2f}%", help="Parametric (variance-covariance)")
+                with col2:
+                    st.metric("📜 Historical VaR (95%)", f"{var['historical'] * 100:.2f}%",
+                              f"ES {var['expected_shortfall'] * 100:.2f}%", delta_color="off")
+                with col3:
+                    st.metric("⚡ Volatilitas Portfolio", f"{var['volatility'] * 100:.1f}%/thn")
+                with col4:
+                    avg_corr = risk.average_correlation(report['correlation'])
+                    st.metric("🔗 Rata-rata Korelasi", f"{avg_corr:.2f}")
+                if weighting != "Sama rata":
+                    total_modal = sum(weights)
+                    st.caption(f"VaR 95% 1 hari untuk modal Rp {total_modal:,.0f}: "
+                               f"≈ Rp {var['parametric'] * total_modal:,.0f} (parametric)")
+
+                col1, col2 = st.columns([3, 2])
+                with col1:
+                    with span("plotly_correlation_heatmap"):
+                        fig = px.imshow(
+                            report['correlation'], x=report['symbols'], y=report['symbols'],
+                            zmin=-1, zmax=1, color_continuous_scale="RdBu_r",
+                            text_auto=".2f" if len(report['symbols']) <= 15 else False,
+                            title=f"Korelasi Return ({risk_window})"
+                        )
+                        st.plotly_chart(fig)
+                with col2:
+                    st.dataframe(pd.DataFrame({
+                        "Coin": report['symbols'],
+                        "Volatilitas (%/thn)": (report['volatility'] * 100).round(1),
+                        "Bobot (%)": (report['weights'] / report['weights'].sum() * 100).round(1),
+                    }), hide_index=True)
+                    fig = go.Figure(go.Scatter(x=report['rolling_dates'], y=report['rolling_avg_correlation'], mode='lines'))
+                    fig.update_layout(title="Rata-rata Korelasi Rolling", height=250, margin=dict(t=40, b=20))
+                    st.plotly_chart(fig)
+
+        # Alert engine background (alerts.py) untuk seluruh watchlist
+        st.markdown("### 🔔 Watchlist Alerts")
+        alert_engine = get_alert_engine()
+        if alert_engine is None:
+            st.caption("Alert engine belum aktif. Set ALERTS_ENABLED=1 (opsional ALERT_WEBHOOK_URL) lalu restart app.")
+        else:
+            cycle = alert_engine.last_cycle
+            if cycle:
+                st.caption(
+                    f"Siklus terakhir {datetime.fromtimestamp(cycle['ts'], timezone.utc).strftime('%H:%M:%S UTC')} · "
+                    f"{cycle['coins']} coin, {cycle['changed']} berubah · {cycle['sent']} alert · "
+                    f"{cycle['seconds'] * 1000:.1f} ms"
+                )
+            recent_alerts = alert_engine.recent_alerts()
+            if recent_alerts:
+                st.dataframe(
+                    pd.DataFrame(recent_alerts)[['ts', 'symbol', 'rule', 'message', 'price']],
+                    hide_index=True
+                )
+            else:
+                st.info("Belum ada alert.")
+
+    with tab5, span("tab_trading_log"):
         st.subheader("📋 Trading Log & Kalkulator Harian")
         
         # Load existing data if available
-        log_file = "trading_log.csv"
-        if os.path.exists(log_file):
+        log_file = LOG_FILE
+        try:
+            with span("trading_log_load"):
+                df_log = load_log(log_file)
+        except Exception as e:
+            st.error(f"Error loading log: {e}")
+            df_log = empty_log()
+
+        # Settlement otomatis: trade terbuka ditutup begitu harga harian menyentuh TP/SL
+        if not df_log.empty:
             try:
-                df_log = pd.read_csv(log_file)
-                # Ensure proper column types
-                df_log['Tanggal'] = pd.to_datetime(df_log['Tanggal'])
+                with span("trade_settlement"):
+                    df_log, settled, unsettled = settle_open_trades(df_log, log_file)
+                if settled:
+                    st.success(f"✅ {settled} trade ditutup otomatis (TP/SL tersentuh)")
+                if not unsettled.empty:
+                    reasons = "; ".join(f"{count} {reason}" for reason, count in unsettled.items())
+                    st.warning(f"⚠️ {unsettled.sum()} trade terbuka tidak bisa dicek TP/SL otomatis: {reasons}")
             except Exception as e:
-                st.error(f"Error loading log: {e}")
-                df_log = pd.DataFrame(columns=["Tanggal", "Coin", "Entry Price", "TP Price", "SL Price", "Modal (Rp)", "% Gain", "Laba Bersih (Rp)", "Total Saldo (Rp)", "Status"])
-        else:
-            df_log = pd.DataFrame(columns=["Tanggal", "Coin", "Entry Price", "TP Price", "SL Price", "Modal (Rp)", "% Gain", "Laba Bersih (Rp)", "Total Saldo (Rp)", "Status"])
+                st.warning(f"Settlement otomatis gagal: {e}")
 
         # Summary statistics
         if not df_log.empty:
@@ -690,18 +979,30 @@ if data:
                 total_trades = len(df_log)
                 st.metric("📊 Total Trades", total_trades)
             
+            # Win rate dan P&L hanya dari trade yang sudah ditutup (trade terbuka masih menyimpan skenario TP)
+            closed_log = df_log[~df_log['Status'].isin(OPEN_STATUSES)]
             with col2:
-                profitable_trades = len(df_log[df_log['% Gain'] > 0])
-                win_rate = (profitable_trades / total_trades * 100) if total_trades > 0 else 0
-                st.metric("🎯 Win Rate", f"{win_rate:.1f}%")
+                profitable_trades = len(closed_log[closed_log['% Gain'] > 0])
+                win_rate = (profitable_trades / len(closed_log) * 100) if len(closed_log) > 0 else 0
+                st.metric("🎯 Win Rate", f"{win_rate:.1f}%", f"{len(closed_log)} closed", delta_color="off")
             
             with col3:
-                total_profit = df_log['Laba Bersih (Rp)'].sum()
-                st.metric("💰 Total P&L", f"Rp {total_profit:,.0f}")
+                total_profit = closed_log['Laba Bersih (Rp)'].sum()
+                st.metric("💰 Realized P&L", f"Rp {total_profit:,.0f}")
             
             with col4:
-                avg_gain = df_log['% Gain'].mean()
-                st.metric("📈 Avg Gain", f"{avg_gain:.2f}%")
+                avg_gain = closed_log['% Gain'].mean()
+                st.metric("📈 Avg Gain", f"{avg_gain:.2f}%" if len(closed_log) else "-")
+
+            if not closed_log.empty:
+                with st.expander("🧭 Performa per Fear & Greed saat Entry"):
+                    entry_ts = closed_log['Tanggal'].dt.normalize().to_numpy().astype("datetime64[s]").astype(np.int64)
+                    entry_fear_greed = market_history.fear_greed_at(entry_ts, get_fear_greed_history())
+                    by_sentiment = settlement.sentiment_performance(closed_log, entry_fear_greed)
+                    if by_sentiment.empty:
+                        st.info("History Fear & Greed belum mencakup tanggal trade yang sudah ditutup.")
+                    else:
+                        st.dataframe(by_sentiment.style.format({"Win Rate (%)": "{:.1f}", "Avg Gain (%)": "{:.2f}"}))
 
         # Input section
         st.markdown("### ➕ Tambahkan Trading Log Baru")
@@ -803,21 +1104,22 @@ if data:
             new_row = {
                 "Tanggal": tanggal,
                 "Coin": coin,
+                "Type": trade_type,
                 "Entry Price": entry_price,
                 "TP Price": tp_price,
                 "SL Price": sl_price,
                 "Modal (Rp)": modal_idr,
+                "Fee (%)": fee_percent,
                 "% Gain": round(tp_percent_gain, 2),
                 "Laba Bersih (Rp)": round(laba_bersih, 0),
                 "Total Saldo (Rp)": round(total_saldo, 0),
                 "Status": "Planned"
             }
             
-            df_log = pd.concat([df_log, pd.DataFrame([new_row])], ignore_index=True)
-
             # Save to CSV
             try:
-                df_log.to_csv(log_file, index=False)
+                with span("trading_log_append"):
+                    df_log = append_log(df_log, new_row, log_file)
                 st.success("✅ Trading log berhasil disimpan!")
                 st.rerun()
             except Exception as e:
@@ -853,25 +1155,15 @@ if data:
                 selected_status = st.selectbox("📊 Filter Status", unique_status)
             
             # Apply filters
-            df_filtered = df_log.copy()
-            
-            if len(date_range) == 2:
-                df_filtered = df_filtered[
-                    (df_filtered['Tanggal'].dt.date >= date_range[0]) &
-                    (df_filtered['Tanggal'].dt.date <= date_range[1])
-                ]
-            
-            if selected_coin != 'All':
-                df_filtered = df_filtered[df_filtered['Coin'] == selected_coin]
-            
-            if selected_status != 'All':
-                df_filtered = df_filtered[df_filtered['Status'] == selected_status]
+            with span("trading_log_filter"):
+                df_filtered = filter_log(df_log, date_range, selected_coin, selected_status)
             
             # Display filtered data
             if not df_filtered.empty:
                 # Format display
                 df_display = df_filtered.copy()
                 df_display['Tanggal'] = df_display['Tanggal'].dt.strftime('%Y-%m-%d')
+                df_display['Tanggal Tutup'] = df_display['Tanggal Tutup'].dt.strftime('%Y-%m-%d')
                 df_display['Modal (Rp)'] = df_display['Modal (Rp)'].apply(lambda x: f"Rp {x:,.0f}")
                 df_display['Laba Bersih (Rp)'] = df_display['Laba Bersih (Rp)'].apply(lambda x: f"Rp {x:,.0f}")
                 df_display['Total Saldo (Rp)'] = df_display['Total Saldo (Rp)'].apply(lambda x: f"Rp {x:,.0f}")
@@ -882,25 +1174,31 @@ if data:
                     hide_index=True
                 )
                 
-                # Performance metrics for filtered data
+                # Performance metrics for filtered data (hanya trade yang sudah ditutup)
                 st.markdown("### 📊 Performance Summary (Filtered)")
+                closed_filtered = df_filtered[~df_filtered['Status'].isin(OPEN_STATUSES)]
+                has_closed = not closed_filtered.empty
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    avg_return = df_filtered['% Gain'].mean()
-                    st.metric("📈 Avg Return", f"{avg_return:.2f}%")
+                    avg_return = closed_filtered['% Gain'].mean()
+                    st.metric("📈 Avg Return", f"{avg_return:.2f}%" if has_closed else "-")
                 
                 with col2:
-                    best_trade = df_filtered['% Gain'].max()
-                    st.metric("🏆 Best Trade", f"{best_trade:.2f}%")
+                    best_trade = closed_filtered['% Gain'].max()
+                    st.metric("🏆 Best Trade", f"{best_trade:.2f}%" if has_closed else "-")
                 
                 with col3:
-                    worst_trade = df_filtered['% Gain'].min()
-                    st.metric("📉 Worst Trade", f"{worst_trade:.2f}%")
+                    worst_trade = closed_filtered['% Gain'].min()
+                    st.metric("📉 Worst Trade", f"{worst_trade:.2f}%" if has_closed else "-")
                 
                 with col4:
-                    total_pl = df_filtered['Laba Bersih (Rp)'].sum()
-                    st.metric("💰 Total P&L", f"Rp {total_pl:,.0f}")
+                    total_pl = closed_filtered['Laba Bersih (Rp)'].sum()
+                    st.metric("💰 Realized P&L", f"Rp {total_pl:,.0f}")
+                
+                open_filtered = len(df_filtered) - len(closed_filtered)
+                if open_filtered:
+                    st.caption(f"{open_filtered} trade masih terbuka, tidak dihitung di summary ini")
                 
                 # Action buttons
                 col1, col2, col3 = st.columns(3)
@@ -927,17 +1225,12 @@ if data:
                 with col3:
                     # Export to Excel (if needed)
                     try:
-                        excel_buffer = pd.ExcelWriter('trading_log.xlsx', engine='openpyxl')
-                        df_filtered.to_excel(excel_buffer, sheet_name='Trading_Log', index=False)
-                        excel_buffer.close()
-                        
-                        with open('trading_log.xlsx', 'rb') as f:
-                            st.download_button(
-                                "📊 Download Excel",
-                                data=f.read(),
-                                file_name=f"trading_log_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                            )
+                        st.download_button(
+                            "📊 Download Excel",
+                            data=to_excel_bytes(df_filtered),
+                            file_name=f"trading_log_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        )
                     except:
                         pass  # Excel export optional
             
@@ -953,7 +1246,7 @@ if data:
             **📋 Cara Menggunakan Trading Log:**
             1. **Pre-trade**: Input entry, TP, SL untuk planning
             2. **Live Calculator**: Lihat real-time P&L calculation
-            3. **Post-trade**: Update status setelah trade selesai
+            3. **Post-trade**: Status otomatis menjadi TP Hit / SL Hit saat harga harian menyentuh TP atau SL
             4. **Analysis**: Gunakan filter untuk review performance
             
             **🎯 Best Practices:**
@@ -976,4 +1269,42 @@ else:
 # Footer
 st.markdown("---")
 st.markdown("**⚠️ Disclaimer**: Dashboard ini hanya untuk edukasi. Bukan saran investasi!")
-st.markdown("🔗 **Data Source**: [CoinMarketCap](https://coinmarketcap.com) | [Fear & Greed Index](https://alternative.me)")
\ No newline at end of file
+st.markdown("🔗 **Data Source**: [CoinMarketCap](https://coinmarketcap.com) | [Fear & Greed Index](https://alternative.me)")
+
+# ===== DEBUG PANEL =====
+if metrics.DEBUG_PANEL or st.query_params.get("debug") == "1":
+    with st.sidebar.expander("🐞 Debug Metrics", expanded=False):
+        st.markdown("**⏱️ Rerun ini:**")
+        spans = metrics.rerun_spans()
+        if spans:
+            st.dataframe(
+                pd.DataFrame(spans, columns=["Span", "Detik"]).sort_values("Detik", ascending=False),
+                hide_index=True
+            )
+
+        counters, histograms = metrics.snapshot()
+        cache_rows = {}
+        for (name, labels), value in counters.items():
+            if name == "dashboard_cache_requests_total":
+                labels = dict(labels)
+                cache_rows.setdefault(labels["fetcher"], {"hit": 0, "miss": 0})[labels["result"]] = value
+        if cache_rows:
+            st.markdown("**💾 Cache (sejak server start):**")
+            st.dataframe(pd.DataFrame.from_dict(cache_rows, orient="index"))
+
+        upstream_rows = []
+        for (name, labels), hist in histograms.items():
+            if name == "upstream_request_seconds" and hist["count"]:
+                upstream_rows.append({
+                    "Endpoint": dict(labels)["endpoint"],
+                    "Request": hist["count"],
+                    "Rata-rata (ms)": hist["sum"] / hist["count"] * 1000,
+                })
+        if upstream_rows:
+            st.markdown("**🌐 Upstream:**")
+            st.dataframe(pd.DataFrame(upstream_rows), hide_index=True)
+
+        credits = sum(value for (name, _), value in counters.items() if name == "cmc_api_credits_total")
+        st.metric("🪙 CMC Credits Terpakai", f"{credits:,.0f}")
+
+metrics.finish_rerun()
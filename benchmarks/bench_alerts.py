@@ -0,0 +1,37 @@
+from alerts import AlertEngine
+from benchmarks.common import measure, repeat_for, result
+from mock_upstream import synthetic_coin
+from quote_table import QuoteTable
+
+SUITE = "alerts"
+# Jumlah coin di watchlist, bukan --sizes
+WATCHLIST_SIZES = [100, 500, 2000]
+
+
+class _NullSink:
+    name = "null"
+
+    def send(self, alerts):
+        pass
+
+def _engine(table):
+    ids = list(table.ids)
+    return AlertEngine(lambda coin_ids: table, lambda: {"value": 50}, sinks=[_NullSink()],
+                       watchlist=lambda: ids, rate_limit=10 ** 9)
+
+def run(sizes, quick=False):
+    results = []
+    for n in WATCHLIST_SIZES:
+        table = QuoteTable.from_cmc_data([synthetic_coin(20000 + i, now=0) for i in range(n)])
+        repeat = repeat_for(n, quick)
+
+        # Semua coin berubah: engine baru setiap run supaya tidak ada state sebelumnya
+        stats = measure(lambda engine: engine.run_cycle(), repeat=repeat, setup=lambda: _engine(table))
+        results.append(result(SUITE, "cycle_all_changed", {"coins": n}, stats))
+
+        # Tidak ada yang berubah (cache hit): hanya perbandingan input
+        engine = _engine(table)
+        engine.run_cycle()
+        stats = measure(engine.run_cycle, repeat=repeat)
+        results.append(result(SUITE, "cycle_unchanged", {"coins": n}, stats))
+    return results
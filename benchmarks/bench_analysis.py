@@ -0,0 +1,59 @@
+import numpy as np
+
+from analysis import (
+    calculate_pivot_points,
+    estimate_hlc_batch,
+    estimate_hlc_from_current_price,
+    generate_signals,
+    generate_signals_batch,
+)
+from benchmarks.common import measure, repeat_for, result
+
+SUITE = "analysis"
+
+
+def _market(n, seed=42):
+    """Data pasar acak untuk n coin (harga, perubahan 24h, perubahan volume)"""
+    rng = np.random.default_rng(seed)
+    price = 10 ** rng.uniform(-3, 5, n)
+    change_24h = rng.normal(0, 6, n)
+    volume_change = rng.normal(0, 25, n)
+    return price, change_24h, volume_change
+
+def _scalar_pass(price, change_24h, volume_change, fear_greed):
+    """Alur per coin seperti di app.py: estimasi HLC -> pivot -> signals"""
+    for i in range(len(price)):
+        data = {"harga": price[i], "perubahan_24h": change_24h[i], "volume_change": volume_change[i]}
+        high, low, close = estimate_hlc_from_current_price(price[i], change_24h[i], volume_change[i])
+        pivot_data = calculate_pivot_points(high, low, close)
+        generate_signals(data, pivot_data, fear_greed)
+
+def _batch_pass(price, change_24h, volume_change, fear_greed):
+    high, low, close = estimate_hlc_batch(price, change_24h)
+    pivot_data = calculate_pivot_points(high, low, close)
+    generate_signals_batch(price, change_24h, volume_change, pivot_data, fear_greed["value"])
+
+def run(sizes, quick=False):
+    results = []
+    fear_greed = {"value": 20, "classification": "Extreme Fear"}
+
+    stats = measure(lambda: calculate_pivot_points(101.0, 95.0, 98.0), repeat=repeat_for(1, quick))
+    results.append(result(SUITE, "pivot_points_scalar_single", {"n": 1}, stats))
+
+    for n in sizes:
+        price, change_24h, volume_change = _market(n)
+        repeat = repeat_for(n, quick)
+
+        # Loop Python per coin hanya sampai 100k, 1M terlalu lama untuk dijalankan rutin
+        if n <= 100_000:
+            stats = measure(lambda: _scalar_pass(price, change_24h, volume_change, fear_greed), repeat=repeat)
+            results.append(result(SUITE, "signals_scalar_loop", {"n": n}, stats))
+
+        high, low, close = estimate_hlc_batch(price, change_24h)
+        stats = measure(lambda: calculate_pivot_points(high, low, close), repeat=repeat)
+        results.append(result(SUITE, "pivot_points_batch", {"n": n}, stats))
+
+        stats = measure(lambda: _batch_pass(price, change_24h, volume_change, fear_greed), repeat=repeat)
+        results.append(result(SUITE, "signals_batch", {"n": n}, stats))
+
+    return results
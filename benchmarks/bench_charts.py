@@ -0,0 +1,33 @@
+import numpy as np
+
+import charts
+from benchmarks.common import measure, repeat_for, result
+
+SUITE = "charts"
+
+
+def _ticks(n, seed=3):
+    """Random walk n tick, satu tick per detik"""
+    rng = np.random.default_rng(seed)
+    ts = 1.7e9 + np.arange(n, dtype=float)
+    price = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    volume = rng.exponential(1, n)
+    return ts, price, volume
+
+def run(sizes, quick=False):
+    results = []
+    pivot_data = {"pivot_point": 100.0, "resistance": {"R1": 101.0}, "support": {"S1": 99.0}}
+    for n in sizes:
+        ts, price, volume = _ticks(n)
+        repeat = repeat_for(n, quick)
+
+        stats = measure(lambda: charts.minmax_indices(price, charts.MAX_POINTS), repeat=repeat)
+        results.append(result(SUITE, "minmax", {"n": n}, stats))
+        stats = measure(lambda: charts.downsample(ts, price), repeat=repeat)
+        results.append(result(SUITE, "minmax_lttb", {"n": n}, stats))
+        stats = measure(lambda: charts.ohlc_bars(ts, price, volume, charts.pick_bar_seconds(n)), repeat=repeat)
+        results.append(result(SUITE, "ohlc_bars", {"n": n}, stats))
+        for kind in ("line", "candle"):
+            stats = measure(lambda: charts.price_figure(ts, price, volume, pivot_data, kind=kind), repeat=repeat)
+            results.append(result(SUITE, f"price_figure_{kind}", {"n": n}, stats))
+    return results
@@ -0,0 +1,45 @@
+import os
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import fetchers
+import freshness
+from benchmarks.common import measure, result
+
+SUITE = "dashboard"
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def clear_all_caches():
+    """Cold start: st.cache_data, store history dan jadwal freshness ikut dikosongkan"""
+    st.cache_data.clear()
+    fetchers.reset_price_history()
+    freshness.reset()
+
+def run(server, latencies, quick=False):
+    """Rerun penuh app.py lewat AppTest (semua tab dirender setiap rerun)"""
+    results = []
+    repeat = 2 if quick else 5
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.run()
+    at.radio[0].set_value("⭐ Popular Coins").run()
+
+    for latency in latencies:
+        server.upstream.latency_ms = latency
+
+        stats = measure(lambda _: at.run(), repeat=repeat, setup=clear_all_caches)
+        results.append(result(SUITE, "rerun_cold_cache", {"latency_ms": latency}, stats))
+
+        stats = measure(at.run, repeat=repeat)
+        results.append(result(SUITE, "rerun_warm_cache", {"latency_ms": latency}, stats))
+
+    # Ganti coin: setiap coin baru = cache miss untuk get_cmc_data saja
+    coins = list(at.sidebar.selectbox[0].options)
+    switch = iter(coins * (repeat + 2))
+    stats = measure(lambda: at.sidebar.selectbox[0].set_value(next(switch)).run(), repeat=repeat)
+    results.append(result(SUITE, "switch_coin", {"latency_ms": latencies[-1]}, stats))
+
+    server.upstream.latency_ms = 0
+    return results
@@ -0,0 +1,32 @@
+import fetchers
+from benchmarks.common import measure, result
+
+SUITE = "fetch"
+
+
+def run(server, latencies, quick=False):
+    """
+    Ukur fetcher terhadap mock server dengan latency tertentu
+    cold = cache dikosongkan sebelum setiap panggilan, warm = langsung dari st.cache_data
+    """
+    results = []
+    calls = {
+        "get_cmc_data": lambda: fetchers.get_cmc_data(1),
+        "get_global_metrics": fetchers.get_global_metrics,
+        "get_fear_greed_index": fetchers.get_fear_greed_index,
+        "search_coin": lambda: fetchers.search_coin("bit"),
+    }
+    repeat = 3 if quick else 10
+
+    for latency in latencies:
+        server.upstream.latency_ms = latency
+        for name, call in calls.items():
+            cached_fn = getattr(fetchers, name)
+            stats = measure(lambda _: call(), repeat=repeat, setup=cached_fn.clear, track_memory=False)
+            results.append(result(SUITE, f"{name}_cold", {"latency_ms": latency}, stats))
+
+            stats = measure(call, repeat=repeat * 10)
+            results.append(result(SUITE, f"{name}_warm", {"latency_ms": latency}, stats))
+
+    server.upstream.latency_ms = 0
+    return results
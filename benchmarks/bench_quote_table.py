@@ -0,0 +1,58 @@
+import pickle
+
+from benchmarks.common import measure, repeat_for, result
+from mock_upstream import synthetic_coin
+from quote_table import QuoteTable
+
+SUITE = "quote_table"
+# Payload JSON sintetis 1M coin butuh beberapa GB, cukup sampai 100k
+MAX_COINS = 100_000
+
+
+def _legacy_records(data):
+    """Dict 17-key per coin seperti get_cmc_data versi lama"""
+    records = {}
+    for coin in data:
+        quote = coin["quote"]["USD"]
+        records[coin["id"]] = {
+            "name": coin["name"],
+            "symbol": coin["symbol"],
+            "harga": quote["price"],
+            "perubahan_1h": quote.get("percent_change_1h", 0),
+            "perubahan_24h": quote.get("percent_change_24h", 0),
+            "perubahan_7d": quote.get("percent_change_7d", 0),
+            "perubahan_30d": quote.get("percent_change_30d", 0),
+            "volume": quote["volume_24h"],
+            "volume_change": quote.get("volume_change_24h", 0),
+            "market_cap": quote["market_cap"],
+            "market_cap_dominance": quote.get("market_cap_dominance", 0),
+            "fully_diluted_market_cap": quote.get("fully_diluted_market_cap", 0),
+            "last_updated": quote["last_updated"],
+            "circulating_supply": coin.get("circulating_supply", 0),
+            "total_supply": coin.get("total_supply", 0),
+            "max_supply": coin.get("max_supply", 0),
+            "cmc_rank": coin.get("cmc_rank", 0)
+        }
+    return records
+
+def run(sizes, quick=False):
+    results = []
+    for n in sizes:
+        if n > MAX_COINS:
+            continue
+        data = [synthetic_coin(20000 + i, now=0) for i in range(n)]
+        repeat = repeat_for(n, quick)
+
+        stats = measure(lambda: _legacy_records(data), repeat=repeat)
+        results.append(result(SUITE, "parse_dicts", {"n": n}, stats))
+        stats = measure(lambda: QuoteTable.from_cmc_data(data), repeat=repeat)
+        results.append(result(SUITE, "parse_table", {"n": n}, stats))
+
+        # Ukuran dan waktu pickle = biaya simpan/ambil di st.cache_data
+        records = _legacy_records(data)
+        table = QuoteTable.from_cmc_data(data)
+        for name, value in (("dicts", records), ("table", table)):
+            stats = measure(lambda: pickle.loads(pickle.dumps(value)), repeat=repeat)
+            stats["payload_bytes"] = len(pickle.dumps(value))
+            results.append(result(SUITE, f"pickle_roundtrip_{name}", {"n": n}, stats))
+    return results
@@ -0,0 +1,46 @@
+import numpy as np
+
+from benchmarks.common import measure, repeat_for, result
+from resampler import BarResampler
+
+SUITE = "resampler"
+TICK_UPDATES = 10_000  # Tick per pengukuran untuk jalur update per tick
+
+
+def _ticks(n, seed=5):
+    """Random walk n tick, satu tick per 10 detik (1 juta tick ~ 4 bulan)"""
+    rng = np.random.default_rng(seed)
+    ts = 1.7e9 + np.arange(n, dtype=float) * 10
+    price = 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n)))
+    volume = rng.exponential(1, n)
+    return ts, price, volume
+
+def _seeded(ts, price, volume):
+    bars = BarResampler()
+    bars.add_prices(ts, price, volume)
+    return bars
+
+def run(sizes, quick=False):
+    results = []
+    for n in sizes:
+        ts, price, volume = _ticks(n)
+        repeat = repeat_for(n, quick)
+
+        stats = measure(lambda: _seeded(ts, price, volume), repeat=repeat)
+        results.append(result(SUITE, "add_prices", {"n": n}, stats))
+
+        bars = _seeded(ts, price, volume)
+        stats = measure(bars.pivots, repeat=repeat)
+        results.append(result(SUITE, "pivots_all_timeframes", {"n": n}, stats))
+
+    # Jalur per tick: hanya bar terbuka yang berubah, tidak tergantung panjang history
+    ts, price, volume = _ticks(TICK_UPDATES)
+
+    def stream():
+        bars = BarResampler()
+        for tick_ts, tick_price, tick_volume in zip(ts.tolist(), price.tolist(), volume.tolist()):
+            bars.update(tick_ts, tick_price, tick_volume)
+
+    stats = measure(stream, repeat=3 if quick else 10)
+    results.append(result(SUITE, "update_per_tick", {"ticks": TICK_UPDATES}, stats))
+    return results
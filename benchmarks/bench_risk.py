@@ -0,0 +1,36 @@
+import numpy as np
+
+import risk
+from benchmarks.common import measure, repeat_for, result
+
+SUITE = "risk"
+# Jumlah coin, bukan --sizes: target modul risk adalah beberapa ratus coin
+ASSET_COUNTS = [10, 100, 300]
+DAYS = 366
+
+
+def _prices(n_assets, days=DAYS, seed=11):
+    """Harga harian dengan faktor market bersama dan sebagian coin baru listing (NaN)"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.03, days)
+    returns = market[:, None] * rng.uniform(0.5, 1.5, n_assets) + rng.normal(0, 0.02, (days, n_assets))
+    prices = 100 * np.exp(np.cumsum(returns, axis=0))
+    listed = rng.integers(0, days // 2, n_assets) * (rng.random(n_assets) < 0.1)
+    prices[np.arange(days)[:, None] < listed] = np.nan
+    return prices
+
+def run(sizes, quick=False):
+    results = []
+    for n in ASSET_COUNTS:
+        prices = _prices(n)
+        returns = risk.log_returns(prices)
+        repeat = repeat_for(1, quick)
+
+        stats = measure(lambda: risk.correlation_matrix(returns), repeat=repeat)
+        results.append(result(SUITE, "correlation_matrix", {"assets": n, "days": DAYS}, stats))
+        stats = measure(lambda: risk.portfolio_var(returns[-30:], np.ones(n)), repeat=repeat)
+        results.append(result(SUITE, "portfolio_var_30d", {"assets": n}, stats))
+        for window in (30, 90):
+            stats = measure(lambda: risk.risk_report(prices, window=window), repeat=repeat)
+            results.append(result(SUITE, "risk_report", {"assets": n, "window": window}, stats))
+    return results
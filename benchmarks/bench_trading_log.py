@@ -0,0 +1,115 @@
+import datetime
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import settlement
+from benchmarks.common import measure, repeat_for, result
+from trading_log import LOG_COLUMNS, append_log, base_symbol, filter_log, load_log, to_excel_bytes
+
+SUITE = "trading_log"
+# Export Excel lewat openpyxl sangat lambat, cukup diukur sampai 100k baris
+EXCEL_MAX_ROWS = 100_000
+
+
+def make_log(n, seed=7):
+    """Trading log sintetis dengan kolom yang sama seperti tab Trading Log"""
+    rng = np.random.default_rng(seed)
+    coins = np.array(["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "DOGEUSDT", "XRPUSDT", "ADAUSDT"])
+    entry = 10 ** rng.uniform(-1, 5, n)
+    gain = rng.normal(2, 6, n).round(2)
+    modal = rng.integers(1, 50, n) * 100_000
+    laba = (modal * gain / 100).round(0)
+    df_log = pd.DataFrame({
+        "Tanggal": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 900, n), unit="D"),
+        "Coin": coins[rng.integers(0, len(coins), n)],
+        "Type": "Long",
+        "Entry Price": entry,
+        "TP Price": entry * 1.05,
+        "SL Price": entry * 0.95,
+        "Modal (Rp)": modal,
+        "Fee (%)": 0.075,
+        "% Gain": gain,
+        "Laba Bersih (Rp)": laba,
+        "Total Saldo (Rp)": modal + laba,
+        "Status": np.where(rng.random(n) < 0.7, "Planned", "Closed"),
+        "Exit Price": np.nan,
+        "Tanggal Tutup": pd.NaT,
+    })
+    return df_log[LOG_COLUMNS]
+
+def make_settlement_input(df_log, seed=11):
+    """
+    Harga harian sintetis (format get_price_history) untuk coin di make_log, dengan
+    Entry Price di-set ke harga hari trade supaya TP/SL tersentuh setelah beberapa hari
+    """
+    rng = np.random.default_rng(seed)
+    symbols = sorted(set(df_log['Coin'].map(base_symbol)))
+    days = pd.date_range("2023-01-01", periods=1000, freq="D")
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(days), len(symbols))), axis=0))
+    history = {
+        "ts": days.to_numpy().astype("datetime64[s]").astype(np.int64),
+        "ids": np.arange(1, len(symbols) + 1),
+        "symbols": symbols,
+        "prices": prices,
+    }
+    symbol_ids = {symbol: i + 1 for i, symbol in enumerate(symbols)}
+
+    df_log = df_log.copy()
+    day = (df_log['Tanggal'] - days[0]).dt.days.to_numpy()
+    entry = prices[day, df_log['Coin'].map(base_symbol).map(symbol_ids).to_numpy() - 1]
+    df_log['Entry Price'] = entry
+    df_log['TP Price'] = entry * 1.05
+    df_log['SL Price'] = entry * 0.95
+    return df_log, history, symbol_ids
+
+def run(sizes, quick=False):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="bench_trading_log_")
+    new_row = {
+        "Tanggal": datetime.date(2025, 6, 1), "Coin": "BTCUSDT", "Entry Price": 65000.0,
+        "TP Price": 68250.0, "SL Price": 61750.0, "Modal (Rp)": 3000000, "% Gain": 5.0,
+        "Laba Bersih (Rp)": 149888.0, "Total Saldo (Rp)": 3149888.0, "Status": "Planned",
+    }
+    date_range = (datetime.date(2023, 6, 1), datetime.date(2024, 6, 1))
+
+    try:
+        for n in sizes:
+            repeat = repeat_for(n, quick)
+            log_file = os.path.join(workdir, f"trading_log_{n}.csv")
+            make_log(n).to_csv(log_file, index=False)
+            file_size = os.path.getsize(log_file)
+            df_log = load_log(log_file)
+
+            stats = measure(lambda: load_log(log_file), repeat=repeat)
+            results.append(result(SUITE, "load", {"rows": n, "file_bytes": file_size}, stats))
+
+            # Append menulis ulang seluruh CSV, jadi selalu mulai dari salinan file asli
+            append_file = os.path.join(workdir, f"append_{n}.csv")
+            stats = measure(
+                lambda _: append_log(df_log, new_row, append_file),
+                repeat=repeat,
+                setup=lambda: shutil.copyfile(log_file, append_file),
+            )
+            results.append(result(SUITE, "append", {"rows": n}, stats))
+
+            stats = measure(lambda: filter_log(df_log, date_range, "ETHUSDT", "Planned"), repeat=repeat)
+            results.append(result(SUITE, "filter", {"rows": n}, stats))
+
+            settle_log, history, symbol_ids = make_settlement_input(df_log)
+            stats = measure(lambda: settlement.settle_trades(settle_log, history, symbol_ids), repeat=repeat)
+            results.append(result(SUITE, "settle", {"rows": n}, stats))
+
+            stats = measure(lambda: df_log.to_csv(index=False), repeat=repeat)
+            results.append(result(SUITE, "export_csv", {"rows": n}, stats))
+
+            if n <= EXCEL_MAX_ROWS:
+                stats = measure(lambda: to_excel_bytes(df_log), repeat=min(repeat, 3), warmup=0)
+                results.append(result(SUITE, "export_excel", {"rows": n}, stats))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
@@ -0,0 +1,60 @@
+import gc
+import statistics
+import time
+import tracemalloc
+
+
+# ===== HELPER PENGUKURAN =====
+def measure(fn, repeat=5, warmup=1, setup=None, track_memory=True):
+    """
+    Jalankan fn beberapa kali dan return statistik waktu (detik) + peak memory (bytes)
+    setup() dipanggil sebelum setiap run dan tidak ikut diukur, hasilnya jadi argumen fn
+    Memory diukur di run terpisah karena tracemalloc memperlambat eksekusi
+    """
+    def call():
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+
+    for _ in range(warmup):
+        call()
+
+    gc.collect()
+    timings = [call() for _ in range(repeat)]
+
+    peak_memory = None
+    if track_memory:
+        args = (setup(),) if setup else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(*args)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    timings_sorted = sorted(timings)
+    return {
+        "repeat": repeat,
+        "min_s": timings_sorted[0],
+        "median_s": statistics.median(timings_sorted),
+        "mean_s": statistics.fmean(timings_sorted),
+        "p95_s": timings_sorted[min(len(timings_sorted) - 1, int(round(0.95 * (len(timings_sorted) - 1))))],
+        "max_s": timings_sorted[-1],
+        "peak_memory_bytes": peak_memory,
+    }
+
+def result(suite, name, params, stats):
+    """Satu baris hasil benchmark (format JSON yang sama untuk semua suite)"""
+    return {"suite": suite, "name": name, "params": params, **stats}
+
+def repeat_for(size, quick=False):
+    """Jumlah pengulangan yang wajar berdasarkan ukuran data"""
+    if quick:
+        return 2
+    if size >= 1_000_000:
+        return 1
+    if size >= 100_000:
+        return 3
+    return 7
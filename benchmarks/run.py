@@ -0,0 +1,144 @@
+"""
+Benchmark suite untuk fetch layer, analisis, chart dan trading log
+
+Contoh:
+    python -m benchmarks.run                         # semua suite, hasil ke bench_results.json
+    python -m benchmarks.run --suite analysis --suite trading_log --sizes 1000 100000
+    python -m benchmarks.run --quick --output new.json --compare bench_results.json
+
+Semua request ke API diarahkan ke mock_upstream.py, jadi tidak memakai credit CMC
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SUITES = ["analysis", "quote_table", "charts", "resampler", "risk", "alerts", "trading_log", "fetch", "dashboard"]
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_LATENCIES = [0, 50, 200]
+
+
+def environment_info():
+    import numpy
+    import pandas
+    import streamlit
+
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+def compare(current, baseline_file):
+    """Cetak rasio median waktu terhadap hasil sebelumnya (>1 berarti lebih lambat)"""
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+
+    def key(row):
+        return (row["suite"], row["name"], json.dumps(row["params"], sort_keys=True))
+
+    old = {key(row): row for row in baseline["results"]}
+    print(f"\nPerbandingan dengan {baseline_file} ({baseline['environment'].get('git_commit')})")
+    for row in current["results"]:
+        previous = old.get(key(row))
+        if not previous or not previous["median_s"]:
+            continue
+        ratio = row["median_s"] / previous["median_s"]
+        flag = "  <-- REGRESI" if ratio > 1.2 else ""
+        print(f"{row['suite']:12} {row['name']:28} {json.dumps(row['params']):40} x{ratio:6.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crypto dashboard")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="Suite yang dijalankan (default semua)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Jumlah coin/baris log")
+    parser.add_argument("--latencies", type=float, nargs="+", default=DEFAULT_LATENCIES, help="Latency mock (ms)")
+    parser.add_argument("--quick", action="store_true", help="Pengulangan minimal, untuk cek cepat")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="File hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+    suites = args.suite or SUITES
+
+    # Mock server dan env harus siap sebelum fetchers / app.py di-import
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    from mock_upstream import start_server
+    server, base_url = start_server(seed=0)
+    os.environ["MOCK_UPSTREAM_URL"] = base_url
+    # Semua file state app ke direktori sementara, supaya data mock tidak tercampur dengan history asli
+    log_dir = tempfile.mkdtemp(prefix="bench_app_")
+    os.environ["TRADING_LOG_FILE"] = os.path.join(log_dir, "trading_log.csv")
+    os.environ["MARKET_HISTORY_DB"] = os.path.join(log_dir, "market_history.db")
+    os.environ["WATCHLIST_FILE"] = os.path.join(log_dir, "watchlist.json")
+    os.environ["ALERTS_FILE"] = os.path.join(log_dir, "alerts.jsonl")
+
+    results = []
+    for suite in suites:
+        started = time.perf_counter()
+        print(f"== {suite} ==", flush=True)
+        if suite == "analysis":
+            from benchmarks import bench_analysis
+            rows = bench_analysis.run(args.sizes, args.quick)
+        elif suite == "quote_table":
+            from benchmarks import bench_quote_table
+            rows = bench_quote_table.run(args.sizes, args.quick)
+        elif suite == "charts":
+            from benchmarks import bench_charts
+            rows = bench_charts.run(args.sizes, args.quick)
+        elif suite == "resampler":
+            from benchmarks import bench_resampler
+            rows = bench_resampler.run(args.sizes, args.quick)
+        elif suite == "risk":
+            from benchmarks import bench_risk
+            rows = bench_risk.run(args.sizes, args.quick)
+        elif suite == "alerts":
+            from benchmarks import bench_alerts
+            rows = bench_alerts.run(args.sizes, args.quick)
+        elif suite == "trading_log":
+            from benchmarks import bench_trading_log
+            rows = bench_trading_log.run(args.sizes, args.quick)
+        elif suite == "fetch":
+            from benchmarks import bench_fetch
+            rows = bench_fetch.run(server, args.latencies, args.quick)
+        else:
+            from benchmarks import bench_dashboard, bench_trading_log
+            bench_trading_log.make_log(1_000).to_csv(os.environ["TRADING_LOG_FILE"], index=False)
+            rows = bench_dashboard.run(server, args.latencies, args.quick)
+
+        for row in rows:
+            memory = row["peak_memory_bytes"]
+            memory = f"{memory / 1e6:9.2f} MB" if memory is not None else " " * 12
+            print(f"  {row['name']:28} {json.dumps(row['params']):40} median {row['median_s'] * 1000:10.3f} ms {memory}")
+        print(f"  ({time.perf_counter() - started:.1f}s)")
+        results.extend(rows)
+
+    server.shutdown()
+    output = {"environment": environment_info(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nHasil disimpan ke {args.output}")
+
+    if args.compare:
+        compare(output, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Chart harga dengan downsampling di server
+
+Browser hanya menerima sekitar max_points titik, berapa pun panjang history:
+- line   : MinMax (pre-seleksi cepat, vectorized) lalu LTTB untuk bentuk visual
+- candle : tick digabung jadi bar OHLC, ukuran bar dipilih dari rentang yang terlihat
+Trace line memakai Scattergl (WebGL) supaya pan/zoom tetap ringan
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+# ===== KONFIGURASI CHART =====
+MAX_POINTS = 2000    # Kira-kira lebar chart dalam pixel
+MAX_CANDLES = 300
+# MinMax dulu sampai MAX_POINTS * MINMAX_RATIO titik, baru LTTB (jauh lebih cepat untuk jutaan titik)
+MINMAX_RATIO = 4
+BAR_SIZES = [1, 5, 15, 60, 300, 900, 3600, 4 * 3600, 86400, 7 * 86400]
+
+
+# ===== DOWNSAMPLING =====
+def minmax_indices(y, n_buckets):
+    """
+    Index titik minimum dan maksimum di setiap bucket (jumlah titik per bucket sama)
+    Puncak dan lembah tidak pernah hilang, cocok untuk harga
+    """
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    padded = np.full(size * n_buckets, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(padded).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    argmin = np.nanargmin(padded[valid], axis=1) + offsets
+    argmax = np.nanargmax(padded[valid], axis=1) + offsets
+    # Titik pertama dan terakhir selalu ikut supaya rentang x tidak berubah
+    return np.unique(np.concatenate([[0, n - 1], argmin, argmax]))
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: pilih titik yang paling menjaga bentuk garis"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata bucket berikutnya)
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """Index titik yang dikirim ke browser untuk line chart"""
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    candidates = np.arange(n)
+    if n > max_points * MINMAX_RATIO:
+        candidates = minmax_indices(y, max_points * MINMAX_RATIO // 2)
+    return candidates[lttb_indices(x[candidates], y[candidates], max_points)]
+
+def pick_bar_seconds(span_seconds, max_bars=MAX_CANDLES):
+    """Ukuran bar terkecil dari BAR_SIZES yang menghasilkan <= max_bars bar"""
+    for seconds in BAR_SIZES:
+        if span_seconds / seconds <= max_bars:
+            return seconds
+    return BAR_SIZES[-1]
+
+def ohlc_bars(ts, price, volume=None, bar_seconds=60):
+    """
+    Gabungkan tick (ts urut naik, epoch detik) jadi bar OHLC, vectorized dengan reduceat
+    Return dict array: ts (awal bar), open, high, low, close, volume
+    """
+    ts = np.asarray(ts, dtype=float)
+    price = np.asarray(price, dtype=float)
+    if len(ts) == 0:
+        empty = np.empty(0)
+        return {"ts": empty, "open": empty, "high": empty, "low": empty, "close": empty, "volume": empty}
+    bucket = np.floor(ts / bar_seconds).astype(np.int64)
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.append(starts[1:], len(ts)) - 1
+    volume = np.zeros(len(ts)) if volume is None else np.asarray(volume, dtype=float)
+    return {
+        "ts": bucket[starts].astype(float) * bar_seconds,
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[ends],
+        "volume": np.add.reduceat(volume, starts),
+    }
+
+def join_series(parts):
+    """
+    Sambung beberapa seri (ts, price, volume) urut dari yang paling jarang ke paling rapat
+    (misalnya harian, per jam, tick): seri berikutnya menggantikan seri sebelumnya mulai titik pertamanya
+    """
+    ts, price, volume = np.empty(0), np.empty(0), np.empty(0)
+    for part_ts, part_price, part_volume in parts:
+        part_ts = np.asarray(part_ts, dtype=float)
+        if not len(part_ts):
+            continue
+        keep = ts < part_ts[0]
+        ts = np.concatenate([ts[keep], part_ts])
+        price = np.concatenate([price[keep], np.asarray(part_price, dtype=float)])
+        volume = np.concatenate([volume[keep], np.asarray(part_volume, dtype=float)])
+    return ts, price, volume
+
+def visible_slice(ts, start=None, end=None):
+    """Slice (tanpa copy) untuk rentang waktu yang terlihat, ts harus urut naik"""
+    lo = 0 if start is None else np.searchsorted(ts, start, side="left")
+    hi = len(ts) if end is None else np.searchsorted(ts, end, side="right")
+    return slice(lo, hi)
+
+
+# ===== FIGURE =====
+def _to_datetime(ts):
+    return (np.asarray(ts, dtype=float) * 1000).astype("datetime64[ms]")
+
+def add_pivot_overlay(fig, pivot_data):
+    """Garis horizontal pivot, support dan resistance (shape, tidak menambah titik data)"""
+    fig.add_hline(y=pivot_data['pivot_point'], line_dash="dash", line_color="#888",
+                  annotation_text="Pivot", annotation_position="right")
+    for level, price in pivot_data['resistance'].items():
+        fig.add_hline(y=price, line_dash="dot", line_color="#e74c3c",
+                      annotation_text=level, annotation_position="right")
+    for level, price in pivot_data['support'].items():
+        fig.add_hline(y=price, line_dash="dot", line_color="#2ecc71",
+                      annotation_text=level, annotation_position="right")
+
+def price_figure(ts, price, volume=None, pivot_data=None, start=None, end=None,
+                 kind="line", max_points=MAX_POINTS, max_candles=MAX_CANDLES, title=None):
+    """
+    Figure harga untuk rentang [start, end] dengan jumlah titik terbatas
+    Return (fig, info) dengan info = {"raw_points", "shown_points", "bar_seconds"}
+    """
+    ts = np.asarray(ts, dtype=float)
+    price = np.asarray(price, dtype=float)
+    window = visible_slice(ts, start, end)
+    ts, price = ts[window], price[window]
+    if volume is not None:
+        volume = np.asarray(volume, dtype=float)[window]
+    info = {"raw_points": len(ts), "shown_points": 0, "bar_seconds": None}
+
+    fig = go.Figure()
+    if len(ts) and kind == "candle":
+        bar_seconds = pick_bar_seconds(ts[-1] - ts[0], max_candles)
+        bars = ohlc_bars(ts, price, volume, bar_seconds)
+        fig.add_trace(go.Candlestick(
+            x=_to_datetime(bars["ts"]), open=bars["open"], high=bars["high"],
+            low=bars["low"], close=bars["close"], name="OHLC",
+        ))
+        fig.update_layout(xaxis_rangeslider_visible=False)
+        info["shown_points"] = len(bars["ts"])
+        info["bar_seconds"] = bar_seconds
+    elif len(ts):
+        keep = downsample(ts, price, max_points)
+        fig.add_trace(go.Scattergl(x=_to_datetime(ts[keep]), y=price[keep], mode="lines", name="Harga"))
+        info["shown_points"] = len(keep)
+
+    if pivot_data:
+        add_pivot_overlay(fig, pivot_data)
+    fig.update_layout(title=title, height=450, hovermode="x unified", margin=dict(r=60))
+    return fig, info
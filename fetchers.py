@@ -0,0 +1,392 @@
+import streamlit as st
+import requests
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from datetime import datetime
+from dotenv import load_dotenv
+
+import freshness
+import market_history
+import metrics
+from quote_table import QuoteTable
+
+load_dotenv()
+
+# ===== KONFIGURASI API =====
+CMC_API_KEY = os.getenv("CMC_API_KEY")
+# Arahkan semua request ke mock server lokal (lihat mock_upstream.py), contoh: http://127.0.0.1:8765
+MOCK_UPSTREAM_URL = os.getenv("MOCK_UPSTREAM_URL")
+if MOCK_UPSTREAM_URL:
+    CMC_API_BASE = f"{MOCK_UPSTREAM_URL.rstrip('/')}/cmc"
+    FEAR_GREED_API = f"{MOCK_UPSTREAM_URL.rstrip('/')}/fng/"
+else:
+    CMC_API_BASE = "https://pro-api.coinmarketcap.com"
+    FEAR_GREED_API = "https://api.alternative.me/fng/"
+HISTORY_INTERVALS = {"hourly": 3600, "daily": 86400}  # Interval quotes/historical -> detik
+HISTORY_STORE_POINTS = 2000  # Titik historis maksimal per (coin, interval) di _history_store
+
+# Titik quotes/historical per (coin_id, interval), dipakai bersama semua sesi di proses ini
+_history_lock = threading.Lock()
+_history_store = {}  # (coin_id, interval) -> {"symbol", "first", "latest", "points": {ts: harga}}
+
+# ===== HELPER REQUEST =====
+def upstream_get(endpoint, url, **kwargs):
+    """requests.get yang mencatat latency dan credit CMC ke metrics"""
+    started = time.perf_counter()
+    response = requests.get(url, **kwargs)
+    elapsed = time.perf_counter() - started
+    credits = 0
+    if url.startswith(CMC_API_BASE):
+        try:
+            credits = response.json().get("status", {}).get("credit_count", 0) or 0
+        except ValueError:
+            pass
+    metrics.observe_upstream(endpoint, response.status_code, elapsed, credits)
+    freshness.record_credits(credits)
+    return response
+
+# ===== FUNGSI AMBIL DATA =====
+def get_cmc_data(coin_id):
+    """Quote coin dengan TTL adaptif per coin (lihat freshness.py)"""
+    generation = freshness.cache_generation(("cmc", coin_id), freshness.quote_ttl(coin_id))
+    table = _get_cmc_data_cached(coin_id, generation)
+    data = table.record(coin_id) if table is not None else None
+    if data:
+        freshness.observe_quote(coin_id, data)
+    return data
+
+# cache_generation sengaja tanpa underscore supaya ikut jadi key cache
+@metrics.track_cache("get_cmc_data")
+@st.cache_data(ttl=freshness.MAX_TTL, max_entries=2000)
+def _get_cmc_data_cached(coin_id, cache_generation):
+    metrics.mark_cache_miss()
+    return _fetch_quote_table("cmc_quotes_latest", "/v1/cryptocurrency/quotes/latest",
+                              {"id": coin_id, "convert": "USD"})
+
+def get_cmc_quotes(coin_ids):
+    """
+    QuoteTable untuk banyak coin dalam satu request (id=1,1027,...)
+    TTL mengikuti coin paling volatil di daftar
+    """
+    coin_ids = tuple(sorted(set(int(i) for i in coin_ids)))
+    if not coin_ids:
+        return None
+    ttl = min(freshness.quote_ttl(coin_id) for coin_id in coin_ids)
+    generation = freshness.cache_generation(("cmc_quotes", coin_ids), ttl)
+    table = _get_cmc_quotes_cached(coin_ids, generation)
+    if table is not None:
+        for coin_id in coin_ids:
+            data = table.record(coin_id)
+            if data:
+                freshness.observe_quote(coin_id, data)
+    return table
+
+@metrics.track_cache("get_cmc_quotes")
+@st.cache_data(ttl=freshness.MAX_TTL, max_entries=200)
+def _get_cmc_quotes_cached(coin_ids, cache_generation):
+    metrics.mark_cache_miss()
+    return _fetch_quote_table("cmc_quotes_latest", "/v1/cryptocurrency/quotes/latest",
+                              {"id": ",".join(map(str, coin_ids)), "convert": "USD"})
+
+def _fetch_quote_table(endpoint, path, params):
+    """Request CMC lalu parse bagian "data" ke QuoteTable"""
+    url = f"{CMC_API_BASE}{path}"
+    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    
+    try:
+        response = upstream_get(endpoint, url, headers=headers, params=params)
+        if response.status_code == 200:
+            return QuoteTable.from_cmc_data(response.json()["data"])
+        else:
+            st.error(f"Error API: {response.status_code}")
+            return None
+    except Exception as e:
+        st.error(f"Kesalahan: {str(e)}")
+        return None
+
+def get_price_history(coin_ids, days=90, interval="daily"):
+    """
+    Harga historis (quotes/historical, interval daily atau hourly) untuk banyak coin
+    Cache berganti saat interval berikutnya tutup (freshness.history_generation), dan yang
+    di-fetch hanya titik yang belum ada di _history_store
+    Return dict: ts (epoch awal interval, UTC), ids, symbols, prices (array titik x coin, NaN kalau tidak ada)
+    """
+    generation = price_history_generation(interval)
+    try:
+        return _get_price_history_cached(tuple(int(i) for i in coin_ids), days, interval, generation)
+    except Exception as e:
+        # Exception tidak di-cache st.cache_data; generation dimajukan supaya cache turunan
+        # (risk, chart, pivot) yang sempat menyimpan hasil kosong ikut dicoba ulang
+        freshness.retry_soon(("price_history", interval))
+        st.error(f"Kesalahan: {str(e)}")
+        return None
+
+def price_history_generation(interval="daily"):
+    """Generation cache get_price_history; naik saat interval berikutnya tutup (lihat freshness.history_generation)"""
+    return freshness.history_generation(("price_history", interval), HISTORY_INTERVALS[interval])
+
+# cache_generation sengaja tanpa underscore supaya ikut jadi key cache
+@metrics.track_cache("get_price_history")
+@st.cache_data(ttl=2 * 86400, max_entries=50)
+def _get_price_history_cached(coin_ids, days, interval, cache_generation):
+    metrics.mark_cache_miss()
+    step = HISTORY_INTERVALS[interval]
+    count = days * 86400 // step
+    latest = int(time.time()) // step * step
+    first = latest - (count - 1) * step
+    _sync_price_history(coin_ids, interval, first, latest)
+
+    with _history_lock:
+        series = {
+            coin_id: _history_store[(coin_id, interval)]
+            for coin_id in coin_ids if (coin_id, interval) in _history_store
+        }
+        ids = [coin_id for coin_id in coin_ids if coin_id in series]
+        points = {
+            coin_id: {ts: price for ts, price in series[coin_id]["points"].items() if ts >= first}
+            for coin_id in ids
+        }
+        symbols = [series[coin_id]["symbol"] for coin_id in ids]
+    ts = np.array(sorted(set().union(*points.values())), dtype=np.int64)
+    row = {point: i for i, point in enumerate(ts)}
+    prices = np.full((len(ts), len(ids)), np.nan)
+    for col, coin_id in enumerate(ids):
+        for point, price in points[coin_id].items():
+            prices[row[point], col] = price
+    return {"ts": ts, "ids": np.array(ids), "symbols": symbols, "prices": prices}
+
+def _sync_price_history(coin_ids, interval, first, latest):
+    """
+    Lengkapi _history_store sampai interval `latest` untuk coin_ids
+    Coin yang sudah tersimpan sejak `first` hanya mengambil interval yang belum ada
+    (plus titik terakhir, yang mungkin diambil sebelum intervalnya tutup); selain itu full.
+    Raise RuntimeError kalau request gagal (store tidak berubah untuk chunk yang gagal)
+    """
+    step = HISTORY_INTERVALS[interval]
+    url = f"{CMC_API_BASE}/v2/cryptocurrency/quotes/historical"
+    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
+
+    # Lock hanya saat membaca / menggabung store, request jalan tanpa lock
+    by_count = {}
+    with _history_lock:
+        for coin_id in coin_ids:
+            entry = _history_store.get((coin_id, interval))
+            if entry is None or entry["first"] > first:
+                count = (latest - first) // step + 1
+            else:
+                count = (latest - entry["latest"]) // step + 1 if entry["latest"] < latest else 0
+            if count:
+                by_count.setdefault(count, []).append(coin_id)
+
+    for count, ids in by_count.items():
+        # Maksimal 100 id per request
+        for i in range(0, len(ids), 100):
+            chunk = ids[i:i + 100]
+            params = {"id": ",".join(map(str, chunk)), "interval": interval, "count": count, "convert": "USD"}
+            response = upstream_get("cmc_quotes_historical", url, headers=headers, params=params)
+            if response.status_code != 200:
+                raise RuntimeError(f"Error API: {response.status_code}")
+            fetched = {
+                coin["id"]: (coin["symbol"], {
+                    int(datetime.fromisoformat(q["timestamp"].replace("Z", "+00:00")).timestamp()) // step * step:
+                    q["quote"]["USD"]["price"]
+                    for q in coin["quotes"]
+                })
+                for coin in response.json()["data"].values()
+            }
+            with _history_lock:
+                for coin_id, (symbol, points) in fetched.items():
+                    _merge_history(coin_id, interval, symbol, points, first, latest)
+
+def price_history_covers(coin_id, days, interval="daily"):
+    """True kalau _history_store sudah punya coin ini sejak `days` lalu (fetch berikutnya hanya titik baru)"""
+    step = HISTORY_INTERVALS[interval]
+    first = int(time.time()) // step * step - (days * 86400 // step - 1) * step
+    with _history_lock:
+        entry = _history_store.get((int(coin_id), interval))
+        return entry is not None and entry["first"] <= first
+
+def reset_price_history():
+    """Kosongkan _history_store, fetch berikutnya mengambil history penuh (untuk benchmark cold start)"""
+    with _history_lock:
+        _history_store.clear()
+
+def _merge_history(coin_id, interval, symbol, points, first, latest):
+    """Gabungkan titik baru ke _history_store (dipanggil dengan _history_lock)"""
+    entry = _history_store.setdefault(
+        (coin_id, interval), {"symbol": symbol, "first": first, "latest": latest, "points": {}}
+    )
+    entry["points"].update(points)
+    entry["first"] = min(entry["first"], first)
+    entry["latest"] = max(entry["latest"], latest)
+    # Buang titik tertua supaya store per coin tetap terbatas
+    if len(entry["points"]) > HISTORY_STORE_POINTS:
+        keep = sorted(entry["points"])[-HISTORY_STORE_POINTS:]
+        entry["points"] = {ts: entry["points"][ts] for ts in keep}
+        entry["first"] = max(entry["first"], keep[0])
+
+@metrics.track_cache("get_coin_ids_by_symbol")
+@st.cache_data(ttl=86400)
+def get_coin_ids_by_symbol(symbols):
+    """Map symbol -> CMC id (id dengan rank terbaik kalau symbol dipakai beberapa coin)"""
+    metrics.mark_cache_miss()
+    symbols = sorted({symbol.upper() for symbol in symbols if symbol})
+    if not symbols:
+        return {}
+    url = f"{CMC_API_BASE}/v1/cryptocurrency/map"
+    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    params = {"symbol": ",".join(symbols)}
+
+    try:
+        response = upstream_get("cmc_map", url, headers=headers, params=params)
+        if response.status_code != 200:
+            return {}
+        mapping = {}
+        for coin in sorted(response.json()["data"], key=lambda c: c.get("rank") or 10 ** 9):
+            mapping.setdefault(coin["symbol"].upper(), coin["id"])
+        return mapping
+    except Exception:
+        return {}
+
+@metrics.track_cache("get_fear_greed_index")
+@st.cache_data(ttl=3600)  # Cache 1 jam
+def get_fear_greed_index():
+    metrics.mark_cache_miss()
+    try:
+        response = upstream_get("fear_greed", FEAR_GREED_API)
+        if response.status_code == 200:
+            data = response.json()["data"][0]
+            return {
+                "value": int(data["value"]),
+                "classification": data["value_classification"],
+                "timestamp": data["timestamp"]
+            }
+    except:
+        return None
+
+def sync_fear_greed_history(now=None):
+    """
+    Backfill seluruh history Fear & Greed sekali (limit=0), setelah itu hanya
+    hari yang lebih baru dari titik terakhir yang tersimpan di market_history
+    Satu-satunya penulis tabel fear_greed, jadi history selalu bersambung
+    Return jumlah titik yang diterima (0 kalau sudah up to date)
+    """
+    now = now or time.time()
+    last_ts = market_history.fear_greed_last_ts()
+    if last_ts is None:
+        limit = 0
+    else:
+        missing_days = int((now - last_ts) // 86400)
+        if missing_days < 1:
+            return 0
+        limit = missing_days + 1  # Titik terakhir ikut diambil ulang, nilainya bisa berubah sampai hari selesai
+
+    response = upstream_get("fear_greed_history", FEAR_GREED_API, params={"limit": limit})
+    if response.status_code != 200:
+        return 0
+    points = response.json()["data"]
+    try:
+        market_history.save_fear_greed(points)
+    except sqlite3.Error:
+        metrics.inc("market_history_errors_total")
+        return 0
+    metrics.inc("fear_greed_points_synced_total", len(points))
+    return len(points)
+
+@metrics.track_cache("sync_fear_greed")
+@st.cache_data(ttl=3600)
+def _sync_fear_greed_hourly(hour):
+    """Sync maksimal sekali per jam per proses, gagal sync dicoba lagi jam berikutnya"""
+    metrics.mark_cache_miss()
+    try:
+        return sync_fear_greed_history()
+    except Exception:
+        return 0
+
+def get_fear_greed_history(days=None):
+    """DataFrame (ts, value, classification) dari penyimpanan lokal, setelah sync delta"""
+    _sync_fear_greed_hourly(int(time.time() // 3600))
+    start = time.time() - days * 86400 if days else None
+    return market_history.load_fear_greed(start)
+
+def get_global_metrics():
+    """Global metrics, TTL 1 jam yang diperpanjang saat budget credit menipis"""
+    generation = freshness.cache_generation("global_metrics", freshness.global_metrics_ttl())
+    return _get_global_metrics_cached(generation)
+
+@metrics.track_cache("get_global_metrics")
+@st.cache_data(ttl=freshness.MAX_TTL, max_entries=10)
+def _get_global_metrics_cached(cache_generation):
+    metrics.mark_cache_miss()
+    url = f"{CMC_API_BASE}/v1/global-metrics/quotes/latest"
+    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    
+    try:
+        response = upstream_get("cmc_global_metrics", url, headers=headers)
+        if response.status_code == 200:
+            data = response.json()["data"]["quote"]["USD"]
+            global_data = {
+                "total_market_cap": data["total_market_cap"],
+                "total_volume_24h": data["total_volume_24h"],
+                "bitcoin_dominance": data["btc_dominance"],
+                "eth_dominance": data["eth_dominance"],
+                "defi_dominance": data.get("defi_dominance", 0),
+                "defi_volume": data.get("defi_volume_24h", 0),
+                "stablecoin_dominance": data.get("stablecoin_dominance", 0),
+                "last_updated": data.get("last_updated")
+            }
+            _save_global_snapshot(global_data)
+            return global_data
+    except:
+        return None
+
+def _save_global_snapshot(global_data):
+    """Snapshot baru masuk ke market_history.py; gagal simpan tidak boleh mengganggu dashboard"""
+    try:
+        market_history.record_global_snapshot(global_data)
+    except sqlite3.Error:
+        metrics.inc("market_history_errors_total")
+
+# ===== FUNGSI PENCARIAN COIN =====
+@metrics.track_cache("search_coin")
+@st.cache_data(ttl=3600)
+def search_coin(query):
+    """Search coin by name or symbol"""
+    metrics.mark_cache_miss()
+    url = f"{CMC_API_BASE}/v1/cryptocurrency/map"
+    headers = {"X-CMC_PRO_API_KEY": CMC_API_KEY}
+    params = {"listing_status": "active", "limit": 100}
+    
+    try:
+        response = upstream_get("cmc_map", url, headers=headers, params=params)
+        if response.status_code == 200:
+            coins = response.json()["data"]
+            # Filter berdasarkan query
+            filtered_coins = []
+            query_lower = query.lower()
+            
+            for coin in coins:
+                if (query_lower in coin["name"].lower() or 
+                    query_lower in coin["symbol"].lower()):
+                    filtered_coins.append({
+                        "id": coin["id"],
+                        "name": coin["name"],
+                        "symbol": coin["symbol"],
+                        "display": f"{coin['name']} ({coin['symbol']})"
+                    })
+            
+            return filtered_coins[:20]  # Limit to 20 results
+        else:
+            return []
+    except Exception as e:
+        st.error(f"Error searching coins: {str(e)}")
+        return []
+
+# Supaya get_cmc_data.clear() tetap bisa dipakai seperti fungsi @st.cache_data biasa
+get_cmc_data.clear = _get_cmc_data_cached.clear
+get_global_metrics.clear = _get_global_metrics_cached.clear
+get_cmc_quotes.clear = _get_cmc_quotes_cached.clear
+get_price_history.clear = _get_price_history_cached.clear
@@ -0,0 +1,165 @@
+"""
+Kebijakan freshness adaptif untuk cache data CMC
+
+TTL per coin diturunkan dari volatilitas terakhir (bucket yang sama dengan
+Volatility Assessment di tab 2) lalu dikali faktor budget credit CMC:
+semakin dekat pemakaian 24 jam terakhir ke CMC_DAILY_CREDIT_BUDGET,
+semakin jarang refresh. Jadwal refresh disimpan per proses sehingga semua
+sesi berbagi generation cache yang sama. Harga historis refresh saat interval
+berikutnya (jam / hari UTC) tutup, lihat history_generation.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+
+# ===== KONFIGURASI FRESHNESS =====
+# Plan Basic CMC = 10.000 credit/bulan, kira-kira 333 per hari
+CMC_DAILY_CREDIT_BUDGET = float(os.getenv("CMC_DAILY_CREDIT_BUDGET", "333"))
+MIN_TTL = 60
+MAX_TTL = 3600 * 4
+DEFAULT_QUOTE_TTL = 300  # Sama dengan TTL lama, dipakai sebelum volatilitas coin diketahui
+GLOBAL_METRICS_TTL = 3600
+HISTORY_MAX_SKIPPED = 3  # Interval historis yang boleh dilewati saat budget habis (per jam: 4 jam, harian: 4 hari)
+
+# (batas |perubahan 24h| %, TTL detik), dicek dari atas
+VOLATILITY_TTLS = [
+    (10, 60),    # 🔥 Extreme
+    (5, 120),    # ⚡ High
+    (2, 300),    # 📊 Medium
+    (0.5, 900),  # 😌 Low
+    (0, 1800),   # Stablecoin / hampir tidak bergerak
+]
+
+_lock = threading.Lock()
+_volatility = {}   # coin_id -> (|perubahan_1h|, |perubahan_24h|)
+_schedule = {}     # key -> {"generation", "ttl", "refresh_at", "fetched_at"}
+_credit_log = deque()  # (timestamp, credits)
+
+
+# ===== VOLATILITAS & BUDGET =====
+def observe_quote(coin_id, data):
+    """Simpan volatilitas terbaru dari hasil get_cmc_data"""
+    with _lock:
+        _volatility[coin_id] = (abs(data.get("perubahan_1h") or 0), abs(data.get("perubahan_24h") or 0))
+
+def record_credits(credits, now=None):
+    if not credits:
+        return
+    with _lock:
+        _credit_log.append((now or time.time(), credits))
+
+def credits_used_24h(now=None):
+    now = now or time.time()
+    with _lock:
+        while _credit_log and _credit_log[0][0] < now - 86400:
+            _credit_log.popleft()
+        return sum(credits for _, credits in _credit_log)
+
+def budget_multiplier(now=None):
+    """
+    Faktor pengali TTL dari pemakaian credit 24 jam terakhir:
+    < 50% budget -> 1x, naik linear sampai 4x di 100%, lewat budget -> MAX_TTL
+    """
+    if CMC_DAILY_CREDIT_BUDGET <= 0:
+        return 1.0
+    usage = credits_used_24h(now) / CMC_DAILY_CREDIT_BUDGET
+    if usage < 0.5:
+        return 1.0
+    if usage < 1.0:
+        return 1.0 + (usage - 0.5) * 6
+    return MAX_TTL / MIN_TTL
+
+def volatility_ttl(change_1h, change_24h):
+    """TTL dasar dari volatilitas; perubahan 1 jam dikali 5 supaya lonjakan mendadak cepat terdeteksi"""
+    volatility = max(abs(change_24h), abs(change_1h) * 5)
+    for threshold, ttl in VOLATILITY_TTLS:
+        if volatility > threshold:
+            return ttl
+    return VOLATILITY_TTLS[-1][1]
+
+def _clamp(ttl):
+    return int(min(MAX_TTL, max(MIN_TTL, ttl)))
+
+def quote_ttl(coin_id, now=None):
+    """TTL cache untuk get_cmc_data(coin_id) saat ini"""
+    with _lock:
+        observed = _volatility.get(coin_id)
+    base = volatility_ttl(*observed) if observed else DEFAULT_QUOTE_TTL
+    return _clamp(base * budget_multiplier(now))
+
+def global_metrics_ttl(now=None):
+    return _clamp(GLOBAL_METRICS_TTL * budget_multiplier(now))
+
+def history_ttl(step, now=None):
+    """
+    TTL harga historis per interval `step` detik: sampai interval berikutnya (jam / hari UTC) tutup,
+    saat budget menipis diperpanjang kelipatan utuh interval (maks HISTORY_MAX_SKIPPED interval)
+    supaya refresh selalu jatuh tepat di batas interval
+    """
+    now = now or time.time()
+    remaining = step - now % step
+    skipped = min(math.ceil(budget_multiplier(now) - 1), HISTORY_MAX_SKIPPED)
+    return math.ceil(remaining + skipped * step)
+
+
+def reset():
+    """Lupakan volatilitas, pemakaian credit dan jadwal refresh (untuk benchmark cold start)"""
+    with _lock:
+        _volatility.clear()
+        _schedule.clear()
+        _credit_log.clear()
+
+# ===== JADWAL REFRESH =====
+def cache_generation(key, ttl, now=None):
+    """
+    Nomor generation untuk key cache; naik ketika data sudah lebih tua dari ttl
+    Dipakai sebagai argumen tambahan fungsi @st.cache_data supaya TTL bisa berbeda per coin
+    """
+    now = now or time.time()
+    with _lock:
+        entry = _schedule.get(key)
+        if entry is not None and ttl < entry["ttl"]:
+            # Coin jadi lebih volatil: majukan jadwal refresh
+            entry["refresh_at"] = min(entry["refresh_at"], entry["fetched_at"] + ttl)
+            entry["ttl"] = ttl
+        if entry is None or now >= entry["refresh_at"]:
+            generation = entry["generation"] + 1 if entry else 0
+            entry = _schedule[key] = {"generation": generation, "ttl": ttl, "refresh_at": now + ttl, "fetched_at": now}
+        return entry["generation"]
+
+def next_refresh_in(key, now=None):
+    """(detik sampai refresh berikutnya, ttl), None kalau belum pernah di-fetch"""
+    now = now or time.time()
+    with _lock:
+        entry = _schedule.get(key)
+        if entry is None:
+            return None
+        return max(0, entry["refresh_at"] - now), entry["ttl"]
+
+def history_generation(key, step, now=None):
+    """
+    Seperti cache_generation untuk harga historis: jadwal refresh dihitung sekali per
+    generation dari history_ttl, tidak dimajukan lagi walaupun sisa waktu interval mengecil
+    """
+    now = now or time.time()
+    with _lock:
+        entry = _schedule.get(key)
+        if entry is not None and now < entry["refresh_at"]:
+            return entry["generation"]
+    ttl = history_ttl(step, now)
+    with _lock:
+        entry = _schedule.get(key)
+        if entry is None or now >= entry["refresh_at"]:
+            generation = entry["generation"] + 1 if entry else 0
+            entry = _schedule[key] = {"generation": generation, "ttl": ttl, "refresh_at": now + ttl, "fetched_at": now}
+        return entry["generation"]
+
+def retry_soon(key, delay=MIN_TTL, now=None):
+    """Majukan refresh key setelah fetch gagal, supaya hasil kosong tidak tertahan sampai jadwal berikutnya"""
+    now = now or time.time()
+    with _lock:
+        entry = _schedule.get(key)
+        if entry is not None:
+            entry["refresh_at"] = min(entry["refresh_at"], now + delay)
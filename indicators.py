@@ -0,0 +1,113 @@
+"""
+Indikator incremental untuk data streaming: setiap tick diproses O(1)
+tanpa menghitung ulang seluruh history
+"""
+from collections import deque
+
+
+# ===== INDIKATOR ONLINE =====
+class OnlineEMA:
+    """Exponential Moving Average, alpha = 2 / (period + 1)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.value = None
+
+    def update(self, price):
+        if self.value is None:
+            self.value = price
+        else:
+            self.value += self.alpha * (price - self.value)
+        return self.value
+
+
+class WilderRSI:
+    """
+    RSI dengan smoothing Wilder
+    `period` perubahan pertama memakai rata-rata biasa, setelah itu
+    avg = (avg * (period - 1) + nilai baru) / period
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_price = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+        self.value = None
+
+    def update(self, price):
+        if self.prev_price is None:
+            self.prev_price = price
+            return self.value
+
+        change = price - self.prev_price
+        self.prev_price = price
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        self.count += 1
+
+        if self.count <= self.period:
+            # Fase warm-up: rata-rata sederhana
+            self.avg_gain += (gain - self.avg_gain) / self.count
+            self.avg_loss += (loss - self.avg_loss) / self.count
+            if self.count < self.period:
+                return self.value
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        if self.avg_loss == 0:
+            self.value = 100.0 if self.avg_gain > 0 else 50.0
+        else:
+            rs = self.avg_gain / self.avg_loss
+            self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class RollingHighLow:
+    """
+    High/Low dalam jendela waktu (detik) memakai monotonic deque
+    Setiap update amortized O(1), dipakai untuk pivot points dari data live
+    """
+
+    def __init__(self, window_seconds=86400):
+        self.window_seconds = window_seconds
+        self._max = deque()  # (ts, price), harga menurun
+        self._min = deque()  # (ts, price), harga naik
+        self.first_ts = None
+        self.last = None
+
+    def update(self, ts, price):
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last = price
+
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._max.append((ts, price))
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        self._min.append((ts, price))
+
+        cutoff = ts - self.window_seconds
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+        return self.high, self.low
+
+    @property
+    def high(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def low(self):
+        return self._min[0][1] if self._min else None
+
+    def coverage(self, now):
+        """Berapa detik data yang sudah terkumpul (maksimal window_seconds)"""
+        if self.first_ts is None:
+            return 0
+        return min(self.window_seconds, now - self.first_ts)
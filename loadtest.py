@@ -0,0 +1,371 @@
+"""
+Load test untuk dashboard: N sesi simulasi terhadap satu server Streamlit
+
+Setiap sesi terhubung lewat websocket yang sama dengan browser (/_stcore/stream)
+dan menjalankan alur realistis: search coin, ganti coin, lihat tab, simpan trading log.
+Upstream selalu mock_upstream.py, jadi tidak memakai credit CMC.
+
+Contoh:
+    python loadtest.py --sessions 20 --actions 15
+    python loadtest.py --sessions 20 --no-cache          # bandingkan beban tanpa st.cache_data
+    python loadtest.py --target http://127.0.0.1:8501 --upstream http://127.0.0.1:8765
+
+Catatan: pindah tab di Streamlit terjadi di browser saja (semua tab dirender setiap
+rerun), jadi aksi "tab" hanya berupa think time tanpa request ke server.
+Protokol websocket mengikuti versi Streamlit yang terpasang (diuji dengan 1.66).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SEARCH_QUERIES = ["bit", "eth", "sol", "doge", "usd", "bnb", "cardano", "tron"]
+# Bobot aksi per sesi (kira-kira pola pemakaian analis)
+ACTION_WEIGHTS = {"switch_coin": 5, "search": 3, "tab": 4, "manual_id": 1, "log_submit": 1}
+
+
+# ===== SESI WEBSOCKET =====
+class DashboardSession:
+    """Satu 'browser tab' yang berbicara protokol websocket Streamlit"""
+
+    def __init__(self, ws_url, rng, no_cache=False):
+        self.ws_url = ws_url
+        self.rng = rng
+        self.no_cache = no_cache
+        self.ws = None
+        self.widgets = {}        # label -> (tipe element, proto widget)
+        self.widget_states = {}  # id -> WidgetState yang dikirim di setiap rerun
+        self.latencies = []      # (aksi, detik)
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws:
+            await self.ws.close()
+
+    async def rerun(self, action, trigger_id=None):
+        """Kirim rerun_script dengan state widget saat ini, tunggu sampai script selesai"""
+        if self.no_cache:
+            clear = BackMsg()
+            clear.clear_cache = True
+            await self.ws.send(clear.SerializeToString())
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        for state in self.widget_states.values():
+            msg.rerun_script.widget_states.widgets.add().CopyFrom(state)
+        if trigger_id:
+            trigger = msg.rerun_script.widget_states.widgets.add()
+            trigger.id = trigger_id
+            trigger.trigger_value = True
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        self.widgets = {}
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._collect_element(fwd.delta.new_element)
+            elif kind == "script_finished":
+                # st.rerun() di app (misalnya setelah simpan log) -> tunggu run berikutnya
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    break
+                self.widgets = {}
+        self.latencies.append((action, time.perf_counter() - started))
+
+    def _collect_element(self, element):
+        element_type = element.WhichOneof("type")
+        if element_type == "exception":
+            self.errors += 1
+            return
+        widget = getattr(element, element_type)
+        if getattr(widget, "id", "") and getattr(widget, "label", ""):
+            self.widgets[widget.label] = (element_type, widget)
+
+    def _find(self, label_prefix):
+        for label, found in self.widgets.items():
+            if label.startswith(label_prefix):
+                return found
+        return None, None
+
+    def set_widget(self, label_prefix, value):
+        """Simpan nilai widget (dikirim di rerun berikutnya), False kalau widget tidak ada"""
+        element_type, widget = self._find(label_prefix)
+        if widget is None:
+            return False
+        state = self.widget_states.get(widget.id)
+        if state is None:
+            state = self.widget_states[widget.id] = WidgetState(id=widget.id)
+        if element_type in ("radio", "selectbox", "text_input"):
+            state.string_value = str(value)
+        elif element_type == "number_input":
+            if widget.data_type == NumberInput.INT:
+                state.int_value = int(value)
+            else:
+                state.double_value = float(value)
+        elif element_type == "date_input":
+            del state.string_array_value.data[:]
+            state.string_array_value.data.extend(value)
+        else:
+            raise ValueError(f"Tipe widget tidak didukung: {element_type}")
+        return True
+
+    def options(self, label_prefix):
+        _, widget = self._find(label_prefix)
+        return list(widget.options) if widget is not None else []
+
+    # ===== ALUR PENGGUNA =====
+    async def act_switch_coin(self):
+        self.set_widget("Pilih Metode", "⭐ Popular Coins")
+        if not self.options("Pilih Popular Coins"):
+            await self.rerun("switch_coin")
+        self.set_widget("Pilih Popular Coins", self.rng.choice(self.options("Pilih Popular Coins")))
+        await self.rerun("switch_coin")
+
+    async def act_search(self):
+        self.set_widget("Pilih Metode", "🔍 Search Coin")
+        if not self._find("🔍 Cari Coin")[1]:
+            await self.rerun("search")
+        self.set_widget("🔍 Cari Coin", self.rng.choice(SEARCH_QUERIES))
+        await self.rerun("search")
+        results = self.options("Pilih dari hasil pencarian")
+        if results:
+            self.set_widget("Pilih dari hasil pencarian", self.rng.choice(results))
+            await self.rerun("search_select")
+
+    async def act_manual_id(self):
+        self.set_widget("Pilih Metode", "🔢 Manual ID")
+        if not self._find("Masukkan Coin ID")[1]:
+            await self.rerun("manual_id")
+        self.set_widget("Masukkan Coin ID", self.rng.choice([1, 52, 74, 1027, 1839, 5426]))
+        await self.rerun("manual_id")
+
+    async def act_log_submit(self):
+        _, submit = self._find("💾 Simpan Log")
+        if submit is None:
+            await self.act_switch_coin()
+            _, submit = self._find("💾 Simpan Log")
+        if submit is not None:
+            await self.rerun("log_submit", trigger_id=submit.id)
+
+    async def act_tab(self):
+        # Ganti tab murni di browser, tidak ada rerun
+        self.latencies.append(("tab", 0.0))
+
+
+async def run_session(index, args, ws_url):
+    rng = random.Random(args.seed * 1000 + index)
+    session = DashboardSession(ws_url, rng, no_cache=args.no_cache)
+    await asyncio.sleep(index * args.ramp_up / max(1, args.sessions))
+    await session.connect()
+    try:
+        await session.rerun("initial")
+        await session.act_switch_coin()
+        actions = list(ACTION_WEIGHTS)
+        weights = list(ACTION_WEIGHTS.values())
+        for _ in range(args.actions):
+            action = rng.choices(actions, weights)[0]
+            await getattr(session, f"act_{action}")()
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000)
+    finally:
+        await session.close()
+    return session
+
+
+# ===== SERVER & PENGUKURAN =====
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _rss_bytes(pid):
+    """RSS proses server (Linux /proc), None kalau tidak tersedia"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+def _wait_healthy(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/_stcore/health", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server Streamlit di {base_url} tidak merespon")
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def summarize(sessions, upstream_stats, memory, args, wall_time):
+    rerun_latencies = [s for session in sessions for action, s in session.latencies if action != "tab"]
+    per_action = {}
+    for session in sessions:
+        for action, seconds in session.latencies:
+            if action != "tab":
+                per_action.setdefault(action, []).append(seconds)
+
+    def stats(values):
+        return {
+            "count": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "mean_ms": statistics.fmean(values) * 1000,
+        }
+
+    endpoints = (upstream_stats or {}).get("endpoints", {})
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "actions_per_session": args.actions,
+            "think_ms": args.think_ms,
+            "upstream_latency_ms": args.upstream_latency_ms,
+            "no_cache": args.no_cache,
+        },
+        "wall_time_s": wall_time,
+        "reruns": stats(rerun_latencies) if rerun_latencies else None,
+        "reruns_per_second": len(rerun_latencies) / wall_time if wall_time else None,
+        "per_action": {action: stats(values) for action, values in sorted(per_action.items())},
+        "script_exceptions": sum(session.errors for session in sessions),
+        "upstream_calls": {path: info["calls"] for path, info in endpoints.items()},
+        "upstream_calls_total": sum(info["calls"] for info in endpoints.values()),
+        "memory": memory,
+    }
+
+def print_summary(summary):
+    config = summary["config"]
+    print(f"\n{config['sessions']} sesi x {config['actions_per_session']} aksi"
+          f" | cache {'OFF' if config['no_cache'] else 'ON'} | {summary['wall_time_s']:.1f}s")
+    reruns = summary["reruns"]
+    if reruns:
+        print(f"Rerun: {reruns['count']}  p50 {reruns['p50_ms']:.0f} ms  p99 {reruns['p99_ms']:.0f} ms"
+              f"  ({summary['reruns_per_second']:.1f} rerun/s)")
+    for action, values in summary["per_action"].items():
+        print(f"  {action:14} n={values['count']:5}  p50 {values['p50_ms']:8.0f} ms  p99 {values['p99_ms']:8.0f} ms")
+    print(f"Upstream calls: {summary['upstream_calls_total']}")
+    for path, calls in sorted(summary["upstream_calls"].items()):
+        print(f"  {path:45} {calls}")
+    memory = summary["memory"]
+    if memory.get("per_session_bytes") is not None:
+        print(f"Memory server: {memory['baseline_bytes'] / 1e6:.1f} MB -> {memory['peak_bytes'] / 1e6:.1f} MB"
+              f"  (~{memory['per_session_bytes'] / 1e6:.2f} MB/sesi)")
+    if summary["script_exceptions"]:
+        print(f"⚠️ Exception di script: {summary['script_exceptions']}")
+
+async def drive(args, ws_url, server_pid):
+    memory = {"baseline_bytes": None, "peak_bytes": None, "per_session_bytes": None}
+    if server_pid:
+        memory["baseline_bytes"] = _rss_bytes(server_pid)
+
+    tasks = [asyncio.create_task(run_session(i, args, ws_url)) for i in range(args.sessions)]
+
+    async def sample_memory():
+        while server_pid and not all(task.done() for task in tasks):
+            rss = _rss_bytes(server_pid)
+            if rss:
+                memory["peak_bytes"] = max(memory["peak_bytes"] or 0, rss)
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.create_task(sample_memory())
+    sessions = await asyncio.gather(*tasks)
+    await sampler
+
+    if memory["baseline_bytes"] and memory["peak_bytes"]:
+        memory["per_session_bytes"] = (memory["peak_bytes"] - memory["baseline_bytes"]) / args.sessions
+    return sessions, memory
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test multi-sesi untuk dashboard")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--actions", type=int, default=10, help="Aksi per sesi setelah load awal")
+    parser.add_argument("--think-ms", type=float, default=500, help="Jeda rata-rata antar aksi")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Detik untuk menyalakan semua sesi")
+    parser.add_argument("--upstream-latency-ms", type=float, default=100)
+    parser.add_argument("--no-cache", action="store_true", help="Kosongkan st.cache_data sebelum setiap rerun")
+    parser.add_argument("--target", help="URL server Streamlit yang sudah jalan (default: jalankan app.py)")
+    parser.add_argument("--upstream", help="URL mock_upstream yang dipakai server --target (untuk hitung call)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="loadtest_results.json")
+    args = parser.parse_args()
+
+    server = process = None
+    if args.target:
+        base_url = args.target.rstrip("/")
+        upstream_url = args.upstream
+    else:
+        from mock_upstream import start_server
+        server, upstream_url = start_server(latency_ms=args.upstream_latency_ms, jitter_ms=args.upstream_latency_ms / 4)
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        # Semua file state app ke direktori sementara, supaya data mock tidak tercampur dengan history asli
+        log_dir = tempfile.mkdtemp(prefix="loadtest_")
+        env = dict(
+            os.environ,
+            MOCK_UPSTREAM_URL=upstream_url,
+            TRADING_LOG_FILE=os.path.join(log_dir, "trading_log.csv"),
+            MARKET_HISTORY_DB=os.path.join(log_dir, "market_history.db"),
+            WATCHLIST_FILE=os.path.join(log_dir, "watchlist.json"),
+            ALERTS_FILE=os.path.join(log_dir, "alerts.jsonl"),
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+             "--server.port", str(port), "--server.headless", "true",
+             "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    try:
+        _wait_healthy(base_url)
+        if upstream_url:
+            requests.post(f"{upstream_url}/__reset", timeout=5)
+        ws_url = base_url.replace("http", "ws", 1) + "/_stcore/stream"
+
+        started = time.perf_counter()
+        sessions, memory = asyncio.run(drive(args, ws_url, process.pid if process else None))
+        wall_time = time.perf_counter() - started
+
+        upstream_stats = requests.get(f"{upstream_url}/__stats", timeout=5).json() if upstream_url else None
+        summary = summarize(sessions, upstream_stats, memory, args, wall_time)
+        print_summary(summary)
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nHasil disimpan ke {args.output}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+History global metrics (market cap, volume, dominance) dan Fear & Greed di SQLite
+
+- global_snapshots : snapshot mentah, satu baris per last_updated dari CMC
+- global_rollup_1h / global_rollup_1d : agregat per jam / per hari
+  (count, sum, min, max, nilai terakhir) yang di-update incremental setiap
+  snapshot baru, jadi chart multi-tahun tidak perlu scan snapshot mentah
+- fear_greed : satu nilai per hari dari alternative.me (backfill + sync delta)
+Semua tabel memakai timestamp epoch (detik) sebagai INTEGER PRIMARY KEY
+sehingga query rentang waktu langsung lewat B-tree
+"""
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ===== KONFIGURASI =====
+MARKET_HISTORY_DB = os.getenv("MARKET_HISTORY_DB", "market_history.db")
+
+# Kolom snapshot (key yang sama dengan hasil get_global_metrics)
+GLOBAL_COLUMNS = [
+    "total_market_cap",
+    "total_volume_24h",
+    "bitcoin_dominance",
+    "eth_dominance",
+    "defi_dominance",
+    "defi_volume",
+    "stablecoin_dominance",
+]
+ROLLUPS = {"1h": 3600, "1d": 86400}
+# Resolusi otomatis: rentang <= 2 hari pakai snapshot mentah, <= 90 hari per jam, sisanya per hari
+AUTO_RESOLUTION = [(2 * 86400, "raw"), (90 * 86400, "1h")]
+
+_initialized = set()  # File database yang skemanya sudah dibuat di proses ini
+
+
+# ===== SKEMA =====
+def connect(db_file=None):
+    """Koneksi SQLite baru (satu per pemanggilan, aman dipakai dari thread Streamlit mana pun)"""
+    db_file = db_file or MARKET_HISTORY_DB
+    conn = sqlite3.connect(db_file, timeout=10)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if db_file not in _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            _create_schema(conn)
+        _initialized.add(db_file)
+    return conn
+
+def _create_schema(conn):
+    columns = ", ".join(f"{name} REAL" for name in GLOBAL_COLUMNS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS global_snapshots (ts INTEGER PRIMARY KEY, {columns})")
+    rollup_columns = ", ".join(
+        f"sum_{name} REAL, min_{name} REAL, max_{name} REAL, last_{name} REAL" for name in GLOBAL_COLUMNS
+    )
+    for rollup in ROLLUPS:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS global_rollup_{rollup} "
+            f"(bucket INTEGER PRIMARY KEY, n INTEGER, last_ts INTEGER, {rollup_columns})"
+        )
+    conn.execute("CREATE TABLE IF NOT EXISTS fear_greed (ts INTEGER PRIMARY KEY, value INTEGER, classification TEXT)")
+
+def _rollup_upsert_sql(rollup):
+    """INSERT satu snapshot ke bucket; kalau bucket sudah ada, gabungkan agregatnya"""
+    names = ["bucket", "n", "last_ts"]
+    updates = ["n = n + 1", "last_ts = MAX(last_ts, excluded.last_ts)"]
+    for name in GLOBAL_COLUMNS:
+        names += [f"sum_{name}", f"min_{name}", f"max_{name}", f"last_{name}"]
+        updates += [
+            f"sum_{name} = sum_{name} + excluded.sum_{name}",
+            f"min_{name} = MIN(min_{name}, excluded.min_{name})",
+            f"max_{name} = MAX(max_{name}, excluded.max_{name})",
+            f"last_{name} = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last_{name} ELSE last_{name} END",
+        ]
+    placeholders = ", ".join("?" * len(names))
+    return (
+        f"INSERT INTO global_rollup_{rollup} ({', '.join(names)}) VALUES ({placeholders}) "
+        f"ON CONFLICT(bucket) DO UPDATE SET {', '.join(updates)}"
+    )
+
+
+# ===== SIMPAN SNAPSHOT =====
+def record_global_snapshot(global_data, ts=None, db_file=None):
+    """
+    Simpan satu snapshot get_global_metrics dan update rollup per jam / per hari
+    ts default dari last_updated CMC, jadi snapshot yang sama tidak tersimpan dua kali
+    Return True kalau snapshot baru
+    """
+    if ts is None:
+        last_updated = global_data.get("last_updated")
+        if last_updated:
+            ts = datetime.fromisoformat(last_updated.replace("Z", "+00:00")).timestamp()
+        else:
+            ts = time.time()
+    ts = int(ts)
+    values = [global_data.get(name) or 0 for name in GLOBAL_COLUMNS]
+
+    conn = connect(db_file)
+    try:
+        with conn:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO global_snapshots (ts, {', '.join(GLOBAL_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(GLOBAL_COLUMNS))})",
+                [ts, *values],
+            )
+            if cursor.rowcount != 1:
+                return False
+            for rollup, seconds in ROLLUPS.items():
+                row = [ts - ts % seconds, 1, ts]
+                for value in values:
+                    row += [value, value, value, value]
+                conn.execute(_rollup_upsert_sql(rollup), row)
+        return True
+    finally:
+        conn.close()
+
+
+# ===== QUERY RENTANG WAKTU =====
+def pick_resolution(start, end):
+    span_seconds = end - start
+    for limit, resolution in AUTO_RESOLUTION:
+        if span_seconds <= limit:
+            return resolution
+    return "1d"
+
+def load_global_history(start=None, end=None, resolution="auto", db_file=None):
+    """
+    DataFrame history global metrics antara start dan end (epoch detik)
+    resolution: "raw", "1h", "1d" atau "auto". Untuk rollup nilai kolom = rata-rata bucket,
+    ditambah <kolom>_min / <kolom>_max
+    """
+    end = int(end if end is not None else time.time())
+    start = int(start if start is not None else 0)
+    if resolution == "auto":
+        resolution = pick_resolution(start, end)
+
+    conn = connect(db_file)
+    try:
+        if resolution == "raw":
+            df = pd.read_sql_query(
+                f"SELECT ts, {', '.join(GLOBAL_COLUMNS)} FROM global_snapshots "
+                "WHERE ts BETWEEN ? AND ? ORDER BY ts",
+                conn, params=(start, end),
+            )
+        else:
+            seconds = ROLLUPS[resolution]
+            selects = ["bucket AS ts", "n"]
+            for name in GLOBAL_COLUMNS:
+                selects += [f"sum_{name} / n AS {name}", f"min_{name} AS {name}_min", f"max_{name} AS {name}_max"]
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(selects)} FROM global_rollup_{resolution} "
+                "WHERE bucket BETWEEN ? AND ? ORDER BY bucket",
+                conn, params=(start - start % seconds, end),
+            )
+    finally:
+        conn.close()
+
+    df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+    df.attrs["resolution"] = resolution
+    return df
+
+def history_bounds(db_file=None):
+    """(ts snapshot pertama, ts terakhir, jumlah snapshot), None kalau masih kosong"""
+    conn = connect(db_file)
+    try:
+        first, last, count = conn.execute("SELECT MIN(ts), MAX(ts), COUNT(*) FROM global_snapshots").fetchone()
+    finally:
+        conn.close()
+    return (first, last, count) if count else None
+
+
+# ===== FEAR & GREED =====
+def save_fear_greed(points, db_file=None):
+    """
+    Simpan titik Fear & Greed (format response alternative.me: value, value_classification, timestamp)
+    Titik yang sudah ada ditimpa (nilai hari ini bisa berubah sampai harinya selesai)
+    """
+    rows = [(int(p["timestamp"]), int(p["value"]), p["value_classification"]) for p in points]
+    if not rows:
+        return 0
+    conn = connect(db_file)
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO fear_greed (ts, value, classification) VALUES (?, ?, ?)", rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+def fear_greed_last_ts(db_file=None):
+    """Timestamp titik Fear & Greed terbaru yang tersimpan, None kalau belum ada"""
+    conn = connect(db_file)
+    try:
+        return conn.execute("SELECT MAX(ts) FROM fear_greed").fetchone()[0]
+    finally:
+        conn.close()
+
+def load_fear_greed(start=None, end=None, db_file=None):
+    """DataFrame (ts, value, classification) urut naik antara start dan end (epoch detik)"""
+    end = int(end if end is not None else time.time())
+    start = int(start if start is not None else 0)
+    conn = connect(db_file)
+    try:
+        df = pd.read_sql_query(
+            "SELECT ts, value, classification FROM fear_greed WHERE ts BETWEEN ? AND ? ORDER BY ts",
+            conn, params=(start, end),
+        )
+    finally:
+        conn.close()
+    df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+    return df
+
+def fear_greed_at(ts, fear_greed=None, db_file=None):
+    """
+    Nilai Fear & Greed yang berlaku di setiap timestamp (epoch detik, array),
+    yaitu titik terakhir <= ts. NaN sebelum titik pertama
+    Untuk matrix harga NumPy (risk, backtest) tanpa lewat pandas
+    """
+    ts = np.asarray(ts, dtype=float)
+    if fear_greed is None:
+        fear_greed = load_fear_greed(db_file=db_file)
+    if fear_greed.empty:
+        return np.full(ts.shape, np.nan)
+    points = fear_greed["ts"].dt.as_unit("s").astype("int64").to_numpy()
+    values = fear_greed["value"].to_numpy(dtype=float)
+    index = np.searchsorted(points, ts, side="right") - 1
+    return np.where(index >= 0, values[np.maximum(index, 0)], np.nan)
+
+def join_fear_greed(df, on="ts", fear_greed=None, db_file=None):
+    """
+    Tambah kolom fear_greed dan fear_greed_classification ke DataFrame harga
+    (merge_asof ke belakang: setiap baris memakai nilai hari itu)
+    Kolom `on` harus datetime UTC dan urut naik
+    """
+    if fear_greed is None:
+        fear_greed = load_fear_greed(db_file=db_file)
+    fear_greed = fear_greed.rename(columns={"ts": on, "value": "fear_greed", "classification": "fear_greed_classification"})
+    fear_greed[on] = fear_greed[on].astype(df[on].dtype)
+    return pd.merge_asof(df, fear_greed, on=on, direction="backward")
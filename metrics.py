@@ -0,0 +1,218 @@
+"""
+Instrumentasi ringan untuk dashboard: span per rerun, cache hit/miss,
+latency upstream dan pemakaian credit CMC
+
+Export dalam format Prometheus:
+- METRICS_PORT=9464  -> endpoint http://<host>:9464/metrics
+- METRICS_FILE=metrics.prom -> file ditulis ulang di akhir setiap rerun
+Debug panel di sidebar aktif dengan DEBUG_PANEL=1 atau ?debug=1 di URL
+"""
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ===== KONFIGURASI METRICS =====
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_FILE = os.getenv("METRICS_FILE")
+DEBUG_PANEL = os.getenv("DEBUG_PANEL", "").lower() in ("1", "true", "yes")
+
+# Bucket histogram (detik), sama dengan default client Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_local = threading.local()
+_server_started = False
+
+
+# ===== REGISTRY =====
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def inc(name, value=1, **labels):
+    """Tambah counter"""
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, seconds, **labels):
+    """Catat satu nilai ke histogram"""
+    with _lock:
+        key = _key(name, labels)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": [0] * len(LATENCY_BUCKETS), "count": 0, "sum": 0.0}
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        hist["count"] += 1
+        hist["sum"] += seconds
+
+def snapshot():
+    """Salinan counters dan histograms untuk ditampilkan"""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: {**hist, "buckets": list(hist["buckets"])} for key, hist in _histograms.items()}
+    return counters, histograms
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# ===== SPAN PER RERUN =====
+def start_rerun():
+    """Dipanggil di awal app.py, mengosongkan daftar span untuk rerun ini"""
+    _local.spans = []
+    _local.rerun_started = time.perf_counter()
+
+@contextmanager
+def span(name):
+    """Ukur durasi blok kode, contoh: with span("tab_overview"): ..."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe("dashboard_span_seconds", elapsed, span=name)
+        spans = getattr(_local, "spans", None)
+        if spans is not None:
+            spans.append((name, elapsed))
+
+def rerun_spans():
+    """Span yang tercatat di rerun yang sedang berjalan (thread ini)"""
+    return list(getattr(_local, "spans", []))
+
+def finish_rerun():
+    """Dipanggil di akhir app.py: catat durasi rerun dan tulis METRICS_FILE"""
+    started = getattr(_local, "rerun_started", None)
+    if started is not None:
+        observe("dashboard_rerun_seconds", time.perf_counter() - started)
+        inc("dashboard_reruns_total")
+    if METRICS_FILE:
+        # Temp file unik per penulisan: beberapa sesi bisa selesai rerun bersamaan
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(METRICS_FILE)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(render_prometheus())
+            os.replace(tmp_file, METRICS_FILE)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+
+
+# ===== CACHE & UPSTREAM =====
+def track_cache(fetcher):
+    """
+    Decorator di luar @st.cache_data untuk menghitung cache hit/miss
+    Fungsi yang di-cache harus memanggil mark_cache_miss() di badannya
+    Flag miss disimpan dan dipulihkan per panggilan, jadi fungsi ter-cache yang
+    memanggil fungsi ter-cache lain tetap tercatat sesuai hasilnya sendiri
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            outer_miss = getattr(_local, "cache_miss", False)
+            _local.cache_miss = False
+            try:
+                with span(fetcher):
+                    result = func(*args, **kwargs)
+                inc("dashboard_cache_requests_total", fetcher=fetcher,
+                    result="miss" if _local.cache_miss else "hit")
+                return result
+            finally:
+                _local.cache_miss = outer_miss
+        wrapper.clear = func.clear
+        return wrapper
+    return decorator
+
+def mark_cache_miss():
+    _local.cache_miss = True
+
+def observe_upstream(endpoint, status, seconds, credits=0):
+    """Catat satu request ke API eksternal beserta credit CMC yang terpakai"""
+    observe("upstream_request_seconds", seconds, endpoint=endpoint)
+    inc("upstream_requests_total", endpoint=endpoint, status=str(status))
+    if credits:
+        inc("cmc_api_credits_total", credits, endpoint=endpoint)
+
+
+# ===== EXPORT PROMETHEUS =====
+_HELP = {
+    "dashboard_span_seconds": ("histogram", "Durasi blok kode per rerun (fetcher, tab, log I/O)"),
+    "dashboard_rerun_seconds": ("histogram", "Durasi satu rerun penuh app.py"),
+    "dashboard_reruns_total": ("counter", "Jumlah rerun app.py"),
+    "dashboard_cache_requests_total": ("counter", "Panggilan fetcher berdasarkan cache hit/miss"),
+    "upstream_request_seconds": ("histogram", "Latency request ke CMC / alternative.me"),
+    "upstream_requests_total": ("counter", "Jumlah request ke upstream per status HTTP"),
+    "cmc_api_credits_total": ("counter", "Credit CMC yang terpakai (dari status.credit_count)"),
+    "alert_cycle_seconds": ("histogram", "Durasi satu siklus alert engine"),
+    "alert_coins_evaluated_total": ("counter", "Coin yang dievaluasi ulang karena inputnya berubah"),
+    "alerts_sent_total": ("counter", "Alert yang terkirim ke sink per rule"),
+    "alerts_suppressed_total": ("counter", "Alert yang ditahan (duplicate / rate_limit)"),
+    "alert_sink_errors_total": ("counter", "Gagal kirim ke sink alert"),
+}
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+def render_prometheus():
+    """Semua metrics dalam text exposition format Prometheus"""
+    counters, histograms = snapshot()
+    lines = []
+    names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+    for name in names:
+        kind, help_text = _HELP.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_labels(labels)} {value}")
+        for (metric, labels), hist in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(LATENCY_BUCKETS, hist["buckets"]):
+                lines.append(f"{name}_bucket{_labels(labels, [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {hist['count']}")
+            lines.append(f"{name}_sum{_labels(labels)} {hist['sum']:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port=None):
+    """Jalankan endpoint /metrics sekali per proses (aman dipanggil di setiap rerun)"""
+    global _server_started
+    port = port or METRICS_PORT
+    if not port:
+        return
+    with _lock:
+        if _server_started:
+            return
+        _server_started = True
+    server = ThreadingHTTPServer(("0.0.0.0", int(port)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
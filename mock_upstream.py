@@ -0,0 +1,468 @@
+"""
+Mock server lokal untuk CoinMarketCap dan alternative.me (Fear & Greed)
+
+Mode:
+- record : teruskan request ke API asli lalu simpan response ke folder fixtures
+- replay : putar ulang fixtures dengan latency, error rate dan burst 429
+           (coin yang belum direkam dibuat sintetis, kecuali pakai --strict)
+
+Contoh:
+    python mock_upstream.py record --port 8765
+    python mock_upstream.py replay --port 8765 --latency-ms 150 --error-rate 0.02
+    MOCK_UPSTREAM_URL=http://127.0.0.1:8765 streamlit run app.py
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ===== KONFIGURASI =====
+CMC_UPSTREAM = "https://pro-api.coinmarketcap.com"
+FEAR_GREED_UPSTREAM = "https://api.alternative.me"
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Nama coin untuk data sintetis (sama dengan popular_coins di app.py)
+KNOWN_COINS = {
+    1: ("Bitcoin", "BTC", 65000.0),
+    1027: ("Ethereum", "ETH", 3200.0),
+    14806: ("MANTRA", "OM", 0.9),
+    1839: ("BNB", "BNB", 580.0),
+    5426: ("Solana", "SOL", 150.0),
+    74: ("Dogecoin", "DOGE", 0.12),
+    825: ("Tether", "USDT", 1.0),
+    3408: ("USD Coin", "USDC", 1.0),
+    52: ("XRP", "XRP", 0.55),
+    2010: ("Cardano", "ADA", 0.45),
+    5805: ("Avalanche", "AVAX", 30.0),
+    11840: ("Polygon", "MATIC", 0.6),
+    1958: ("TRON", "TRX", 0.12),
+    4943: ("Dai", "DAI", 1.0),
+    7083: ("Uniswap", "UNI", 8.0),
+}
+STABLECOINS = {825, 3408, 4943}
+
+
+# ===== FIXTURES =====
+def fixture_key(path, params):
+    """Nama file fixture dari path + query (urutan query tidak berpengaruh)"""
+    query = urlencode(sorted(params.items()))
+    slug = path.strip("/").replace("/", "_") or "root"
+    digest = hashlib.sha1(query.encode()).hexdigest()[:10]
+    return f"{slug}__{digest}.json"
+
+
+def save_fixture(fixtures_dir, path, params, status, body):
+    os.makedirs(fixtures_dir, exist_ok=True)
+    fixture = {
+        "request": {"path": path, "params": params},
+        "status": status,
+        "body": body,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(os.path.join(fixtures_dir, fixture_key(path, params)), "w") as f:
+        json.dump(fixture, f, indent=2)
+
+
+def load_fixture(fixtures_dir, path, params):
+    file_path = os.path.join(fixtures_dir, fixture_key(path, params))
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as f:
+        return json.load(f)
+
+
+# ===== DATA SINTETIS =====
+def _now_iso():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def synthetic_coin(coin_id, now=None):
+    """Quote sintetis yang deterministik per coin dan bergerak pelan terhadap waktu"""
+    now = time.time() if now is None else now
+    rng = random.Random(coin_id)
+    name, symbol, base_price = KNOWN_COINS.get(
+        coin_id, (f"Coin {coin_id}", f"C{coin_id}", 10 ** rng.uniform(-3, 3))
+    )
+    is_stable = coin_id in STABLECOINS
+    # Amplitudo gerakan: stablecoin hampir diam, sebagian coin sangat volatil
+    amplitude = 0.001 if is_stable else rng.choice([0.01, 0.03, 0.06, 0.15])
+    phase = rng.uniform(0, 2 * math.pi)
+
+    def price_at(t):
+        return base_price * (1 + amplitude * math.sin(t / 3600 + phase))
+
+    def change(seconds):
+        past = price_at(now - seconds)
+        return (price_at(now) - past) / past * 100
+
+    price = price_at(now)
+    supply = rng.uniform(1e7, 1e11) if not is_stable else rng.uniform(1e9, 1e11)
+    market_cap = price * supply
+    return {
+        "id": coin_id,
+        "name": name,
+        "symbol": symbol,
+        "slug": name.lower().replace(" ", "-"),
+        "cmc_rank": rng.randint(1, 500) if coin_id not in KNOWN_COINS else list(KNOWN_COINS).index(coin_id) + 1,
+        "circulating_supply": supply,
+        "total_supply": supply * 1.1,
+        "max_supply": None if is_stable else supply * 1.5,
+        "quote": {
+            "USD": {
+                "price": price,
+                "volume_24h": market_cap * rng.uniform(0.01, 0.2),
+                "volume_change_24h": rng.uniform(-40, 40),
+                "percent_change_1h": change(3600),
+                "percent_change_24h": change(86400) + amplitude * 100 * rng.uniform(-1, 1),
+                "percent_change_7d": rng.uniform(-20, 20) * amplitude * 10,
+                "percent_change_30d": rng.uniform(-40, 40) * amplitude * 10,
+                "market_cap": market_cap,
+                "market_cap_dominance": rng.uniform(0, 5),
+                "fully_diluted_market_cap": market_cap * 1.5,
+                "last_updated": _now_iso(),
+            }
+        },
+    }
+
+
+def synthetic_history(coin_id, count, now=None, step=86400):
+    """
+    Harga sintetis untuk quotes/historical, satu titik per `step` detik (daily / hourly)
+    Return harian = beta * faktor market (sama untuk semua coin) + noise per coin,
+    jadi korelasi antar coin realistis; stablecoin hampir tidak bergerak
+    """
+    now = time.time() if now is None else now
+    latest = int(now // step) * step
+    rng = random.Random(coin_id * 7919)
+    coin = synthetic_coin(coin_id, now)
+    beta = 0.0 if coin_id in STABLECOINS else rng.uniform(0.6, 1.6)
+    noise = 0.0005 if coin_id in STABLECOINS else rng.uniform(0.01, 0.05)
+    scale = math.sqrt(step / 86400)  # Volatilitas per titik mengikuti panjang interval
+    price = coin["quote"]["USD"]["price"]
+    quotes = []
+    # Mundur dari harga sekarang supaya titik terakhir sama dengan quotes/latest
+    for i in range(count):
+        ts = latest - i * step
+        quotes.append({
+            "timestamp": datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "quote": {"USD": {"price": price, "timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat()}},
+        })
+        market = random.Random(ts).gauss(0, 0.03 * scale)
+        price = price / math.exp(beta * market + rng.gauss(0, noise * scale))
+    quotes.reverse()
+    return {"id": coin_id, "name": coin["name"], "symbol": coin["symbol"], "quotes": quotes}
+
+
+def _cmc_status(credit_count=1):
+    return {
+        "timestamp": _now_iso(),
+        "error_code": 0,
+        "error_message": None,
+        "elapsed": 1,
+        "credit_count": credit_count,
+    }
+
+
+def synthetic_response(path, params):
+    """Response sintetis untuk endpoint yang dipakai app.py, None kalau tidak dikenal"""
+    if path == "/cmc/v1/cryptocurrency/quotes/latest":
+        ids = [int(i) for i in params.get("id", "1").split(",") if i]
+        data = {str(i): synthetic_coin(i) for i in ids}
+        return 200, {"status": _cmc_status(math.ceil(len(ids) / 100)), "data": data}
+
+    if path == "/cmc/v1/cryptocurrency/map":
+        limit = int(params.get("limit", 100))
+        coins = [
+            {"id": cid, "name": name, "symbol": symbol, "rank": rank + 1, "is_active": 1}
+            for rank, (cid, (name, symbol, _)) in enumerate(KNOWN_COINS.items())
+        ]
+        if params.get("symbol"):
+            symbols = params["symbol"].upper().split(",")
+            return 200, {"status": _cmc_status(), "data": [coin for coin in coins if coin["symbol"] in symbols]}
+        coins += [
+            {"id": 20000 + i, "name": f"Coin {20000 + i}", "symbol": f"C{20000 + i}",
+             "rank": len(coins) + i + 1, "is_active": 1}
+            for i in range(max(0, limit - len(coins)))
+        ]
+        return 200, {"status": _cmc_status(), "data": coins[:limit]}
+
+    if path == "/cmc/v2/cryptocurrency/quotes/historical":
+        ids = [int(i) for i in params.get("id", "1").split(",") if i]
+        count = int(params.get("count", 30))
+        step = 3600 if params.get("interval") == "hourly" else 86400
+        data = {str(i): synthetic_history(i, count, step=step) for i in ids}
+        return 200, {"status": _cmc_status(math.ceil(len(ids) * count / 100)), "data": data}
+
+    if path == "/cmc/v1/global-metrics/quotes/latest":
+        rng = random.Random(int(time.time() // 300))
+        btc, eth = rng.uniform(48, 56), rng.uniform(14, 18)
+        usd = {
+            "total_market_cap": rng.uniform(2.2e12, 2.6e12),
+            "total_volume_24h": rng.uniform(6e10, 1.2e11),
+            "btc_dominance": btc,
+            "eth_dominance": eth,
+            "defi_dominance": rng.uniform(3, 5),
+            "defi_volume_24h": rng.uniform(3e9, 8e9),
+            "stablecoin_dominance": rng.uniform(6, 8),
+            "last_updated": _now_iso(),
+        }
+        data = {"btc_dominance": btc, "eth_dominance": eth, "quote": {"USD": usd}}
+        return 200, {"status": _cmc_status(), "data": data}
+
+    if path in ("/fng", "/fng/"):
+        limit = int(params.get("limit", 1))
+        limit = 2000 if limit == 0 else limit
+        today = int(time.time() // 86400) * 86400
+        points = []
+        for day in range(limit):
+            ts = today - day * 86400
+            value = int(50 + 40 * math.sin(ts / (86400 * 45)) * random.Random(ts).uniform(0.6, 1))
+            points.append({
+                "value": str(value),
+                "value_classification": _fng_classification(value),
+                "timestamp": str(ts),
+            })
+        return 200, {"name": "Fear and Greed Index", "data": points, "metadata": {"error": None}}
+
+    return None
+
+
+def synthetic_ticks(coin_ids, interval, seed=None):
+    """Generator tick random walk tanpa akhir, harga awal dari synthetic_coin"""
+    rng = random.Random(seed)
+    state = {}
+    for coin_id in coin_ids:
+        coin = synthetic_coin(coin_id)
+        amplitude = 0.0002 if coin_id in STABLECOINS else 0.002
+        state[coin_id] = [coin["symbol"], coin["quote"]["USD"]["price"], amplitude]
+    while True:
+        for coin_id, coin in state.items():
+            symbol, price, amplitude = coin
+            coin[1] = price * (1 + rng.gauss(0, amplitude))
+            yield {"id": coin_id, "symbol": symbol, "price": coin[1],
+                   "volume": rng.expovariate(1.0), "ts": time.time()}
+        time.sleep(interval)
+
+
+def _fng_classification(value):
+    if value < 25:
+        return "Extreme Fear"
+    if value < 46:
+        return "Fear"
+    if value < 55:
+        return "Neutral"
+    if value < 76:
+        return "Greed"
+    return "Extreme Greed"
+
+
+# ===== SERVER =====
+class MockUpstream:
+    """State server: mode, fixtures dan simulasi gangguan upstream"""
+
+    def __init__(self, mode="replay", fixtures_dir=DEFAULT_FIXTURES_DIR, latency_ms=0,
+                 jitter_ms=0, error_rate=0.0, burst_every=0, burst_length=0,
+                 strict=False, seed=None):
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.strict = strict
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.webhooks = deque(maxlen=1000)
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.request_count = 0
+            self.stats = {}
+
+    def _record_stat(self, path, status):
+        endpoint = self.stats.setdefault(path, {"calls": 0, "by_status": {}})
+        endpoint["calls"] += 1
+        endpoint["by_status"][str(status)] = endpoint["by_status"].get(str(status), 0) + 1
+
+    def _fault(self):
+        """Tentukan apakah request ini kena 429 burst atau error acak"""
+        with self.lock:
+            self.request_count += 1
+            n = self.request_count
+            roll = self.rng.random()
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms))
+        if self.burst_every and self.burst_length:
+            position = (n - 1) % (self.burst_every + self.burst_length)
+            if position >= self.burst_every:
+                return delay, 429
+        if roll < self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def handle(self, path, params, headers):
+        delay, fault = self._fault()
+        if delay:
+            time.sleep(delay / 1000)
+
+        if fault == 429:
+            status, body = 429, {"status": {"error_code": 1008, "error_message":
+                                 "You've exceeded your API Key's HTTP request rate limit."}}
+        elif fault:
+            status, body = fault, {"status": {"error_code": fault, "error_message": "Simulated upstream error"}}
+        elif self.mode == "record":
+            status, body = self._forward(path, params, headers)
+            save_fixture(self.fixtures_dir, path, params, status, body)
+        else:
+            fixture = load_fixture(self.fixtures_dir, path, params)
+            if fixture:
+                status, body = fixture["status"], fixture["body"]
+            else:
+                synthetic = None if self.strict else synthetic_response(path, params)
+                status, body = synthetic or (404, {"error": f"No fixture for {path}"})
+
+        with self.lock:
+            self._record_stat(path, status)
+        return status, body
+
+    def _forward(self, path, params, headers):
+        if path.startswith("/cmc/"):
+            url = CMC_UPSTREAM + path[len("/cmc"):]
+            api_key = headers.get("X-CMC_PRO_API_KEY") or os.getenv("CMC_API_KEY")
+            upstream_headers = {"X-CMC_PRO_API_KEY": api_key}
+        else:
+            url = FEAR_GREED_UPSTREAM + path
+            upstream_headers = {}
+        response = requests.get(url, headers=upstream_headers, params=params, timeout=30)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"raw": response.text}
+        return response.status_code, body
+
+
+def _make_handler(upstream):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = dict(parse_qsl(parts.query))
+            if parts.path == "/__stats":
+                with upstream.lock:
+                    stats = json.loads(json.dumps(upstream.stats))
+                return self._send_json(200, {"requests": upstream.request_count, "endpoints": stats})
+            if parts.path == "/__webhooks":
+                with upstream.lock:
+                    webhooks = list(upstream.webhooks)
+                return self._send_json(200, {"webhooks": webhooks})
+            if parts.path == "/stream/ticks":
+                return self._stream_ticks(params)
+            status, body = upstream.handle(parts.path, params, self.headers)
+            self._send_json(status, body)
+
+        def _stream_ticks(self, params):
+            """Push feed NDJSON (stand-in untuk websocket exchange) sampai client memutus koneksi"""
+            coin_ids = [int(i) for i in params.get("ids", "1").split(",") if i]
+            interval = float(params.get("interval_ms", 500)) / 1000
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            with upstream.lock:
+                upstream._record_stat("/stream/ticks", 200)
+            try:
+                for tick in synthetic_ticks(coin_ids, interval):
+                    self.wfile.write(json.dumps(tick).encode() + b"\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def do_POST(self):
+            path = urlsplit(self.path).path
+            if path == "/__reset":
+                upstream.reset_stats()
+                return self._send_json(200, {"ok": True})
+            if path == "/webhook":
+                # Stand-in webhook untuk alerts.py, payload bisa dilihat di GET /__webhooks
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with upstream.lock:
+                    upstream.webhooks.append(payload)
+                    upstream._record_stat(path, 200)
+                return self._send_json(200, {"ok": True})
+            self._send_json(404, {"error": "Not found"})
+
+        def log_message(self, format, *args):
+            pass  # Jangan spam stdout
+
+    return Handler
+
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """Jalankan mock server di background thread, return (server, base_url)"""
+    upstream = MockUpstream(**options)
+    server = ThreadingHTTPServer((host, port), _make_handler(upstream))
+    server.daemon_threads = True
+    server.upstream = upstream
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock server CoinMarketCap + Fear & Greed")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="Folder fixtures")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency rata-rata per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Variasi latency (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Peluang HTTP 500 (0-1)")
+    parser.add_argument("--burst-every", type=int, default=0, help="Jumlah request normal sebelum burst 429")
+    parser.add_argument("--burst-length", type=int, default=0, help="Jumlah request 429 per burst")
+    parser.add_argument("--strict", action="store_true", help="Tanpa data sintetis, 404 kalau fixture tidak ada")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(MockUpstream(
+        mode=args.mode,
+        fixtures_dir=args.fixtures,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        strict=args.strict,
+        seed=args.seed,
+    )))
+    print(f"Mock upstream ({args.mode}) di http://{args.host}:{args.port}")
+    print(f"Set MOCK_UPSTREAM_URL=http://{args.host}:{args.port} sebelum menjalankan app.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Streaming harga per tick dengan update indikator incremental
+
+Feed diaktifkan dengan PRICE_STREAM_URL:
+- http(s)://...  -> stream NDJSON (satu tick JSON per baris), misalnya
+                    http://127.0.0.1:8765/stream/ticks dari mock_upstream.py
+- ws(s)://...    -> websocket, satu tick JSON per pesan
+Format tick: {"id": 1, "symbol": "BTC", "price": 65000.0, "volume": 0.5, "ts": 1700000000.0}
+Coin yang di-subscribe dikirim sebagai query ?ids=1,1027
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlencode
+
+import numpy as np
+import requests
+import streamlit as st
+
+import metrics
+from indicators import OnlineEMA, RollingHighLow, WilderRSI
+from resampler import BarResampler
+
+# ===== KONFIGURASI STREAM =====
+PRICE_STREAM_URL = os.getenv("PRICE_STREAM_URL")
+EMA_FAST = 12
+EMA_SLOW = 26
+RSI_PERIOD = 14
+PIVOT_WINDOW_SECONDS = 86400
+TICK_HISTORY = 5000  # Tick terakhir per coin yang disimpan untuk chart
+RECONNECT_DELAY = 2
+# Pivot dari High/Low live baru dipakai setelah stream berjalan minimal 1 jam
+LIVE_PIVOT_MIN_COVERAGE = 3600
+
+
+class CoinState:
+    """State live satu coin, diperbarui O(1) setiap tick"""
+
+    def __init__(self):
+        self.price = None
+        self.ts = None
+        self.symbol = None
+        self.ticks = 0
+        self.ema_fast = OnlineEMA(EMA_FAST)
+        self.ema_slow = OnlineEMA(EMA_SLOW)
+        self.rsi = WilderRSI(RSI_PERIOD)
+        self.range = RollingHighLow(PIVOT_WINDOW_SECONDS)
+        self.history = deque(maxlen=TICK_HISTORY)
+        self.bars = BarResampler()
+        self.bars_seeded = False  # Sudah digabung dengan history quotes/historical (seed_bars)
+
+    def update(self, tick):
+        price = float(tick["price"])
+        ts = float(tick.get("ts") or time.time())
+        self.price = price
+        self.ts = ts
+        self.symbol = tick.get("symbol", self.symbol)
+        self.ticks += 1
+        self.ema_fast.update(price)
+        self.ema_slow.update(price)
+        self.rsi.update(price)
+        self.range.update(ts, price)
+        volume = float(tick.get("volume") or 0)
+        self.history.append((ts, price, volume))
+        self.bars.update(ts, price, volume)
+
+    def snapshot(self):
+        return {
+            "symbol": self.symbol,
+            "price": self.price,
+            "ts": self.ts,
+            "ticks": self.ticks,
+            "ema_fast": self.ema_fast.value,
+            "ema_slow": self.ema_slow.value,
+            "rsi": self.rsi.value,
+            "high": self.range.high,
+            "low": self.range.low,
+            "coverage_seconds": self.range.coverage(self.ts),
+        }
+
+
+class PriceStream:
+    """Consumer feed di background thread, satu instance dibagi semua sesi"""
+
+    def __init__(self, url):
+        self.url = url
+        self.lock = threading.Lock()
+        self.coins = {}
+        self.subscribed = set()
+        self.connected = False
+        self.last_error = None
+        self._resubscribe = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="price-stream", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, coin_id):
+        """Tambah coin ke feed; koneksi dibuka ulang dengan daftar ids baru"""
+        with self.lock:
+            if coin_id in self.subscribed:
+                return
+            self.subscribed.add(coin_id)
+        self._resubscribe.set()
+
+    def snapshot(self, coin_id):
+        with self.lock:
+            state = self.coins.get(coin_id)
+            return state.snapshot() if state and state.ticks else None
+
+    def history(self, coin_id):
+        """List (ts, price, volume) tick terakhir"""
+        with self.lock:
+            state = self.coins.get(coin_id)
+            return list(state.history) if state else []
+
+    def history_arrays(self, coin_id):
+        """History tick sebagai array NumPy (ts, price, volume), untuk chart dan resampling"""
+        history = self.history(coin_id)
+        if not history:
+            return np.empty(0), np.empty(0), np.empty(0)
+        ts, price, volume = np.array(history, dtype=float).T
+        return ts, price, volume
+
+    def seed_bars(self, coin_id, bars):
+        """
+        Pakai BarResampler berisi history (misalnya harga per jam) sebagai dasar bar
+        multi-timeframe coin ini; tick yang sudah diterima diputar ulang di atasnya
+        """
+        with self.lock:
+            state = self.coins.get(coin_id)
+            if state is None:
+                state = self.coins[coin_id] = CoinState()
+            if state.bars_seeded:
+                return
+            if state.history:
+                ts, price, volume = np.array(state.history, dtype=float).T
+                bars.add_prices(ts, price, volume)
+            state.bars = bars
+            state.bars_seeded = True
+
+    def timeframe_pivots(self, coin_id):
+        """BarResampler.pivots() coin ini, None kalau bar belum di-seed"""
+        with self.lock:
+            state = self.coins.get(coin_id)
+            return state.bars.pivots() if state and state.bars_seeded else None
+
+    def stop(self):
+        self._stop.set()
+        self._resubscribe.set()
+
+    def _handle(self, raw):
+        tick = json.loads(raw)
+        coin_id = int(tick["id"])
+        with self.lock:
+            state = self.coins.get(coin_id)
+            if state is None:
+                state = self.coins[coin_id] = CoinState()
+            state.update(tick)
+        metrics.inc("price_stream_ticks_total")
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self.lock:
+                ids = sorted(self.subscribed)
+            if not ids:
+                self._resubscribe.wait()
+                self._resubscribe.clear()
+                continue
+            self._resubscribe.clear()
+            try:
+                if self.url.startswith(("ws://", "wss://")):
+                    self._consume_websocket(ids)
+                else:
+                    self._consume_http(ids)
+            except Exception as e:
+                self.last_error = str(e)
+                metrics.inc("price_stream_errors_total")
+                self.connected = False
+                self._stop.wait(RECONNECT_DELAY)
+            self.connected = False
+
+    def _stream_url(self, ids):
+        separator = "&" if "?" in self.url else "?"
+        return f"{self.url}{separator}{urlencode({'ids': ','.join(map(str, ids))})}"
+
+    def _consume_http(self, ids):
+        with requests.get(self._stream_url(ids), stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            self.connected = True
+            for line in response.iter_lines():
+                if self._resubscribe.is_set():
+                    return
+                if line:
+                    self._handle(line)
+
+    def _consume_websocket(self, ids):
+        from websockets.sync.client import connect
+
+        with connect(self._stream_url(ids), open_timeout=5) as ws:
+            self.connected = True
+            while not self._resubscribe.is_set():
+                try:
+                    message = ws.recv(timeout=1)
+                except TimeoutError:
+                    continue
+                self._handle(message)
+
+
+@st.cache_resource
+def get_price_stream():
+    """PriceStream bersama untuk semua sesi, None kalau PRICE_STREAM_URL tidak di-set"""
+    if not PRICE_STREAM_URL:
+        return None
+    return PriceStream(PRICE_STREAM_URL)
@@ -0,0 +1,112 @@
+"""
+Tabel quote CMC berbentuk kolom (satu NumPy array per field)
+
+Pengganti dict 17-key per coin untuk cache dan tampilan multi-coin:
+- column(name) -> array read-only tanpa copy, langsung bisa dipakai kode vectorized
+- record(coin_id) -> dict dengan key yang sama seperti get_cmc_data untuk UI
+- pickle (st.cache_data) hanya menyimpan beberapa array besar, bukan ribuan dict
+"""
+import numpy as np
+
+# ===== SKEMA KOLOM =====
+# (nama kolom, dtype, field asal di response CMC). Field None di CMC jadi NaN / 0
+NUMERIC_COLUMNS = [
+    ("harga", "f8", "price"),
+    ("perubahan_1h", "f8", "percent_change_1h"),
+    ("perubahan_24h", "f8", "percent_change_24h"),
+    ("perubahan_7d", "f8", "percent_change_7d"),
+    ("perubahan_30d", "f8", "percent_change_30d"),
+    ("volume", "f8", "volume_24h"),
+    ("volume_change", "f8", "volume_change_24h"),
+    ("market_cap", "f8", "market_cap"),
+    ("market_cap_dominance", "f8", "market_cap_dominance"),
+    ("fully_diluted_market_cap", "f8", "fully_diluted_market_cap"),
+]
+SUPPLY_COLUMNS = ["circulating_supply", "total_supply", "max_supply"]
+# Field yang wajib ada (sama seperti akses quote[...] di versi dict)
+REQUIRED_QUOTE_FIELDS = {"price", "volume_24h", "market_cap", "last_updated"}
+
+
+class QuoteTable:
+    """Quote banyak coin dalam kolom-kolom NumPy, di-index dengan CMC coin id"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._index = {int(coin_id): row for row, coin_id in enumerate(columns["id"])}
+        for array in columns.values():
+            array.flags.writeable = False
+
+    @classmethod
+    def from_cmc_data(cls, data):
+        """
+        Bangun tabel dari bagian "data" response CMC
+        (dict id -> coin seperti quotes/latest, atau list coin)
+        """
+        coins = list(data.values()) if isinstance(data, dict) else list(data)
+        quotes = [coin["quote"]["USD"] for coin in coins]
+        for coin, quote in zip(coins, quotes):
+            missing = REQUIRED_QUOTE_FIELDS - quote.keys()
+            if missing:
+                raise KeyError(f"Quote {coin.get('id')} tanpa field {sorted(missing)}")
+
+        # Satu list comprehension per kolom lalu konversi sekali, jauh lebih cepat dari isi per elemen
+        columns = {
+            "id": np.array([coin["id"] for coin in coins], dtype="i8"),
+            "cmc_rank": np.array([coin.get("cmc_rank") or 0 for coin in coins], dtype="i4"),
+            "name": np.array([coin["name"] for coin in coins], dtype=object),
+            "symbol": np.array([coin["symbol"] for coin in coins], dtype=object),
+            "last_updated": np.array([quote["last_updated"].rstrip("Z") for quote in quotes], dtype="datetime64[ms]"),
+        }
+        for name, dtype, field in NUMERIC_COLUMNS:
+            columns[name] = np.array([quote.get(field) or 0 for quote in quotes], dtype=dtype)
+        for name in SUPPLY_COLUMNS:
+            columns[name] = np.array([coin.get(name) for coin in coins], dtype=float)
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __contains__(self, coin_id):
+        return int(coin_id) in self._index
+
+    # Pickle (st.cache_data) cukup kolomnya saja, index dibangun ulang saat load
+    def __getstate__(self):
+        return self.columns
+
+    def __setstate__(self, columns):
+        self.__init__(columns)
+
+    @property
+    def ids(self):
+        return self.columns["id"]
+
+    def column(self, name):
+        """Array kolom tanpa copy (read-only)"""
+        return self.columns[name]
+
+    def rows(self, coin_ids):
+        """Posisi baris untuk daftar coin id (coin yang tidak ada dilewati)"""
+        return np.array([self._index[int(i)] for i in coin_ids if int(i) in self._index], dtype=np.intp)
+
+    def select(self, coin_ids):
+        """Tabel baru berisi coin tertentu saja, urut sesuai coin_ids"""
+        rows = self.rows(coin_ids)
+        return QuoteTable({name: array[rows] for name, array in self.columns.items()})
+
+    def record(self, coin_id):
+        """Dict satu coin dengan key yang sama seperti get_cmc_data (untuk UI)"""
+        row = self._index.get(int(coin_id))
+        if row is None:
+            return None
+        record = {
+            "name": self.columns["name"][row],
+            "symbol": self.columns["symbol"][row],
+        }
+        for name, _, _ in NUMERIC_COLUMNS:
+            record[name] = float(self.columns[name][row])
+        record["last_updated"] = f"{self.columns['last_updated'][row]}Z"
+        for name in SUPPLY_COLUMNS:
+            value = self.columns[name][row]
+            record[name] = None if np.isnan(value) else float(value)
+        record["cmc_rank"] = int(self.columns["cmc_rank"][row])
+        return record
@@ -0,0 +1,113 @@
+"""
+Bar OHLCV multi-timeframe (1H, 4H, 1D, 1W) dan pivot per timeframe
+
+Bar dasar masuk dari harga per jam quotes/historical (seed) lalu dari tick
+price_stream. Setiap update hanya mengubah bar yang sedang terbuka; bar yang
+sudah tutup disimpan apa adanya dan tidak pernah dihitung ulang.
+Pivot periode berjalan memakai High/Low/Close bar tertutup terakhir, semua
+timeframe dan metode dihitung dalam satu panggilan vectorized
+"""
+from collections import deque
+
+import numpy as np
+
+from analysis import calculate_pivot_sets
+
+# ===== KONFIGURASI TIMEFRAME =====
+TIMEFRAMES = {"1H": 3600, "4H": 4 * 3600, "1D": 86400, "1W": 7 * 86400}
+# Epoch 0 jatuh di hari Kamis, bar mingguan dimulai Senin 00:00 UTC
+TIMEFRAME_OFFSETS = {"1W": 4 * 86400}
+MAX_CLOSED_BARS = 500  # Bar tertutup yang disimpan per timeframe
+BAR_FIELDS = ["ts", "open", "high", "low", "close", "volume"]
+
+
+class BarResampler:
+    """Bar untuk beberapa timeframe sekaligus, satu instance per coin"""
+
+    def __init__(self, timeframes=TIMEFRAMES, max_closed=MAX_CLOSED_BARS):
+        self.timeframes = list(timeframes)
+        self.seconds = [timeframes[name] for name in self.timeframes]
+        self.offsets = [TIMEFRAME_OFFSETS.get(name, 0) for name in self.timeframes]
+        self.open_bars = [None] * len(self.timeframes)  # [ts, open, high, low, close, volume] bar berjalan
+        self.closed = [deque(maxlen=max_closed) for _ in self.timeframes]
+        self.last_ts = None
+
+    def update(self, ts, price, volume=0.0):
+        """
+        Satu tick, O(jumlah timeframe). Tick yang lebih tua dari data terakhir diabaikan
+        (bar yang sudah tutup tidak dibuka lagi). Return True kalau tick dipakai
+        """
+        if self.last_ts is not None and ts < self.last_ts:
+            return False
+        self.last_ts = ts
+        for i, bar in enumerate(self.open_bars):
+            bucket = (ts - self.offsets[i]) // self.seconds[i] * self.seconds[i] + self.offsets[i]
+            if bar is not None and bucket == bar[0]:
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[4] = price
+                bar[5] += volume
+                continue
+            if bar is not None:
+                self.closed[i].append(tuple(bar))
+            self.open_bars[i] = [bucket, price, price, price, price, volume]
+        return True
+
+    def add_bars(self, ts, open_, high, low, close, volume=None):
+        """
+        Gabungkan banyak bar dasar sekaligus (ts urut naik), vectorized per timeframe
+        dengan reduceat seperti charts.ohlc_bars. Bar pertama yang jatuh di bar
+        terbuka digabung ke bar itu, sisanya menjadi bar tertutup / bar terbuka baru
+        """
+        ts = np.asarray(ts, dtype=float)
+        columns = [np.asarray(values, dtype=float) for values in (open_, high, low, close)]
+        volume = np.zeros(len(ts)) if volume is None else np.asarray(volume, dtype=float)
+        if self.last_ts is not None:
+            keep = ts >= self.last_ts
+            ts, volume = ts[keep], volume[keep]
+            columns = [values[keep] for values in columns]
+        if not len(ts):
+            return 0
+        open_, high, low, close = columns
+
+        for i in range(len(self.timeframes)):
+            bucket = (ts - self.offsets[i]) // self.seconds[i] * self.seconds[i] + self.offsets[i]
+            starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+            ends = np.append(starts[1:], len(ts)) - 1
+            bars = np.column_stack([
+                bucket[starts], open_[starts],
+                np.maximum.reduceat(high, starts), np.minimum.reduceat(low, starts),
+                close[ends], np.add.reduceat(volume, starts),
+            ]).tolist()
+            current = self.open_bars[i]
+            if current is not None and bars[0][0] == current[0]:
+                # Lanjutan bar yang sedang terbuka
+                bars[0][1] = current[1]
+                bars[0][2] = max(bars[0][2], current[2])
+                bars[0][3] = min(bars[0][3], current[3])
+                bars[0][5] += current[5]
+            elif current is not None:
+                self.closed[i].append(tuple(current))
+            self.closed[i].extend(map(tuple, bars[:-1]))
+            self.open_bars[i] = bars[-1]
+        self.last_ts = float(ts[-1])
+        return len(ts)
+
+    def add_prices(self, ts, price, volume=None):
+        """Bar dasar yang hanya punya satu harga per titik (misalnya quotes/historical per jam)"""
+        return self.add_bars(ts, price, price, price, price, volume)
+
+    def pivots(self):
+        """
+        Pivot periode berjalan untuk semua timeframe dari bar tertutup terakhir
+        Return dict: timeframes, bar_ts (awal bar sumber, NaN kalau belum ada bar tertutup),
+        levels (calculate_pivot_sets dengan satu elemen array per timeframe)
+        """
+        previous = np.array(
+            [closed[-1] if closed else [np.nan] * len(BAR_FIELDS) for closed in self.closed], dtype=float
+        )
+        return {
+            "timeframes": self.timeframes,
+            "bar_ts": previous[:, 0],
+            "levels": calculate_pivot_sets(previous[:, 2], previous[:, 3], previous[:, 4]),
+        }
@@ -0,0 +1,140 @@
+"""
+Risk portfolio lintas coin: korelasi return, volatilitas dan Value at Risk
+
+Input berupa matrix harga (hari x coin) yang sudah sejajar per tanggal,
+misalnya dari fetchers.get_price_history. Data kosong (NaN, coin baru listing)
+ditangani pairwise: setiap pasangan coin memakai hari di mana keduanya ada.
+Semua perhitungan berupa operasi matrix NumPy, tanpa loop per coin.
+"""
+from statistics import NormalDist
+
+import numpy as np
+
+# ===== KONFIGURASI RISK =====
+PERIODS_PER_YEAR = 365  # Crypto diperdagangkan setiap hari
+MIN_OBSERVATIONS = 10   # Pasangan dengan data lebih sedikit dianggap tidak ada (NaN)
+MAX_ROLLING_WINDOWS = 60  # Jendela rolling yang dihitung untuk chart, sisanya dilewati dengan step
+
+
+# ===== RETURN & STATISTIK PAIRWISE =====
+def log_returns(prices):
+    """Log return harian, baris pertama hilang; harga <= 0 / NaN menghasilkan NaN"""
+    prices = np.asarray(prices, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_prices = np.log(np.where(prices > 0, prices, np.nan))
+    return np.diff(log_prices, axis=0)
+
+def _pairwise_moments(returns):
+    """
+    Jumlah observasi, kovarians dan varians pairwise-complete via perkalian matrix:
+    n_ij = jumlah hari di mana coin i dan j sama-sama ada
+    """
+    valid = np.isfinite(returns)
+    x = np.where(valid, returns, 0.0)
+    m = valid.astype(float)
+    n = m.T @ m
+    sum_x = x.T @ m          # sum_x[i, j] = jumlah return i di hari di mana j juga ada
+    sum_xx = (x * x).T @ m
+    sum_xy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sum_xy - sum_x * sum_x.T / n) / (n - 1)
+        var_i = (sum_xx - sum_x ** 2 / n) / (n - 1)
+    cov[n < MIN_OBSERVATIONS] = np.nan
+    return n, cov, var_i
+
+def covariance_matrix(returns):
+    """Kovarians pairwise-complete (coin x coin)"""
+    _, cov, _ = _pairwise_moments(np.asarray(returns, dtype=float))
+    return cov
+
+def correlation_matrix(returns):
+    """Korelasi Pearson pairwise-complete, diagonal = 1 untuk coin yang punya data cukup"""
+    _, cov, var_i = _pairwise_moments(np.asarray(returns, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var_i * var_i.T)
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr
+
+def rolling_correlation(returns, window, step=1):
+    """
+    Generator (index baris akhir, matrix korelasi) untuk setiap jendela `window` hari,
+    bergeser `step` hari. Sengaja tidak di-stack: 300 coin x 365 jendela = ratusan MB
+    """
+    returns = np.asarray(returns, dtype=float)
+    for end in range(window, len(returns) + 1, step):
+        yield end, correlation_matrix(returns[end - window:end])
+
+def average_correlation(corr):
+    """Rata-rata korelasi antar coin (tanpa diagonal), indikator seberapa terdiversifikasi watchlist"""
+    corr = np.asarray(corr, dtype=float)
+    n = corr.shape[-1]
+    if n < 2:
+        return np.full(corr.shape[:-2], np.nan)
+    off_diagonal = ~np.eye(n, dtype=bool)
+    return np.nanmean(corr[..., off_diagonal], axis=-1)
+
+def volatility(returns, periods_per_year=PERIODS_PER_YEAR):
+    """Volatilitas tahunan per coin (std log return x sqrt(periode per tahun))"""
+    returns = np.asarray(returns, dtype=float)
+    counts = np.isfinite(returns).sum(axis=0)
+    with np.errstate(invalid="ignore"):
+        std = np.nanstd(returns, axis=0, ddof=1) if len(returns) > 1 else np.full(returns.shape[1], np.nan)
+    std = np.where(counts >= MIN_OBSERVATIONS, std, np.nan)
+    return std * np.sqrt(periods_per_year)
+
+
+# ===== VALUE AT RISK =====
+def portfolio_var(returns, weights, confidence=0.95, horizon_days=1):
+    """
+    VaR portfolio (dalam fraksi nilai portfolio, angka positif = potensi rugi)
+    - parametric : z * sqrt(w' Σ w) * sqrt(horizon), kovarians pairwise
+    - historical : persentil return portfolio harian, diskalakan sqrt(horizon)
+    - volatility : volatilitas tahunan portfolio
+    Coin tanpa data cukup dikeluarkan lalu bobot dinormalisasi ulang
+    """
+    returns = np.asarray(returns, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    cov = covariance_matrix(returns)
+    usable = (weights > 0) & np.isfinite(np.diag(cov))
+    result = {"parametric": np.nan, "historical": np.nan, "volatility": np.nan,
+              "expected_shortfall": np.nan, "coins_used": int(usable.sum())}
+    if not usable.any() or weights[usable].sum() <= 0:
+        return result
+
+    w = weights[usable] / weights[usable].sum()
+    sub_cov = np.nan_to_num(cov[np.ix_(usable, usable)])
+    sigma = float(np.sqrt(max(w @ sub_cov @ w, 0.0)))
+    z = NormalDist().inv_cdf(confidence)
+    result["parametric"] = z * sigma * np.sqrt(horizon_days)
+    result["volatility"] = sigma * np.sqrt(PERIODS_PER_YEAR)
+
+    # Historical: hanya hari di mana semua coin yang dipakai punya data
+    sub_returns = returns[:, usable]
+    complete = np.isfinite(sub_returns).all(axis=1)
+    if complete.sum() >= MIN_OBSERVATIONS:
+        # Log return -> return sederhana supaya bisa dijumlah dengan bobot
+        portfolio = np.expm1(sub_returns[complete]) @ w
+        cutoff = np.quantile(portfolio, 1 - confidence)
+        result["historical"] = -cutoff * np.sqrt(horizon_days)
+        result["expected_shortfall"] = -portfolio[portfolio <= cutoff].mean() * np.sqrt(horizon_days)
+    return result
+
+def risk_report(prices, weights=None, window=30, confidence=0.95):
+    """
+    Ringkasan risk untuk `window` hari terakhir: korelasi, volatilitas, VaR dan
+    rata-rata korelasi rolling sepanjang history (maksimal MAX_ROLLING_WINDOWS titik)
+    weights None = bobot sama
+    """
+    returns = log_returns(prices)
+    n_coins = returns.shape[1]
+    weights = np.ones(n_coins) if weights is None else np.asarray(weights, dtype=float)
+    recent = returns[-window:]
+    step = max(1, (len(returns) - window) // MAX_ROLLING_WINDOWS + 1)
+    rolling = [(end, average_correlation(corr)) for end, corr in rolling_correlation(returns, window, step)]
+    return {
+        "correlation": correlation_matrix(recent),
+        "volatility": volatility(recent),
+        "var": portfolio_var(recent, weights, confidence),
+        "rolling_ends": np.array([end for end, _ in rolling], dtype=int),
+        "rolling_avg_correlation": np.array([value for _, value in rolling]),
+    }
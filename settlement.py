@@ -0,0 +1,176 @@
+"""
+Settlement otomatis trading log: TP atau SL yang tersentuh lebih dulu
+
+Setiap trade berstatus OPEN_STATUSES di-scan terhadap harga harian coin-nya
+(fetchers.get_price_history) mulai hari setelah tanggal trade. Scan berjalan
+per batch sebagai matrix (trade x hari) NumPy, tanpa loop per baris.
+Harga harian hanya satu titik per hari, jadi sentuhan intraday (wick) yang
+tidak bertahan sampai titik harian tidak terdeteksi
+"""
+import numpy as np
+import pandas as pd
+
+from trading_log import OPEN_STATUSES, base_symbols
+
+# ===== KONFIGURASI SETTLEMENT =====
+MAX_SCAN_CELLS = 4_000_000  # Batas ukuran matrix (trade x hari) per batch
+FIRST_BLOCK_DAYS = 16       # Panjang blok hari pertama yang di-scan, berikutnya 2x lipat
+MAX_HISTORY_DAYS = 730      # History terpanjang yang diambil untuk trade lama
+HISTORY_DAYS_STEP = 30      # Jumlah hari dibulatkan ke atas supaya cache get_price_history jarang berganti key
+TP_HIT = "TP Hit"
+SL_HIT = "SL Hit"
+# Alasan trade terbuka yang tidak bisa dicek otomatis (lihat unsettled_reasons)
+UNKNOWN_SYMBOL = "symbol tidak ditemukan di CMC"
+NO_HISTORY = "harga historis coin tidak tersedia"
+TOO_OLD = f"lebih tua dari history harian yang diambil (maks {MAX_HISTORY_DAYS} hari)"
+# Batas kelas Fear & Greed (sama dengan klasifikasi alternative.me), nilai integer 0-100
+SENTIMENT_BINS = [-1, 24, 44, 55, 75, 100]
+SENTIMENT_LABELS = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
+
+
+# ===== SCAN TP / SL =====
+def first_hits(prices, start, column, tp, sl, is_long):
+    """
+    Hari pertama TP atau SL tersentuh untuk setiap trade
+    prices: matrix (hari x coin); start, column: index hari pertama yang di-scan dan kolom coin per trade
+    Return (index hari, -1 kalau belum tersentuh; outcome 1 = TP, -1 = SL, 0 = belum)
+    """
+    prices = np.asarray(prices, dtype=float)
+    start = np.asarray(start, dtype=np.int64)
+    n_days = len(prices)
+    hit_day = np.full(len(start), -1, dtype=np.int64)
+    outcome = np.zeros(len(start), dtype=np.int8)
+
+    # Kebanyakan trade selesai dalam beberapa hari: scan blok hari pendek dulu,
+    # hanya trade yang belum tersentuh yang lanjut ke blok berikutnya (2x lebih panjang)
+    active = np.flatnonzero(start < n_days)
+    offset, block = 0, FIRST_BLOCK_DAYS
+    while len(active):
+        n_batches = max(1, len(active) * block // MAX_SCAN_CELLS)
+        for batch in np.array_split(active, n_batches):
+            days = start[batch, None] + offset + np.arange(block)
+            valid = days < n_days
+            path = prices[np.minimum(days, n_days - 1), column[batch, None]]
+            up = is_long[batch, None]
+            # Perbandingan dengan NaN (hari tanpa data) selalu False
+            tp_hit = valid & np.where(up, path >= tp[batch, None], path <= tp[batch, None])
+            sl_hit = valid & np.where(up, path <= sl[batch, None], path >= sl[batch, None])
+            first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), block)
+            first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), block)
+            first = np.minimum(first_tp, first_sl)
+            hit = first < block
+            # TP dan SL di hari yang sama dianggap SL (konservatif)
+            outcome[batch] = np.where(hit, np.where(first_sl <= first_tp, -1, 1), 0)
+            hit_day[batch] = np.where(hit, start[batch] + offset + first, -1)
+        offset += block
+        block *= 2
+        active = active[(outcome[active] == 0) & (start[active] + offset < n_days)]
+    return hit_day, outcome
+
+
+# ===== SETTLEMENT TRADING LOG =====
+def open_symbols(df_log):
+    """Symbol coin (tuple urut) dari trade yang belum ditutup"""
+    if df_log.empty:
+        return ()
+    open_log = df_log[df_log['Status'].isin(OPEN_STATUSES)]
+    return tuple(sorted(set(base_symbols(open_log['Coin']))))
+
+def history_days(df_log, now=None):
+    """Jumlah hari history harian yang dibutuhkan untuk trade terbuka tertua"""
+    open_log = df_log[df_log['Status'].isin(OPEN_STATUSES)]
+    if open_log.empty:
+        return 0
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    days = (now.normalize() - open_log['Tanggal'].min().normalize()).days + 2
+    days = -(-days // HISTORY_DAYS_STEP) * HISTORY_DAYS_STEP
+    return int(min(days, MAX_HISTORY_DAYS))
+
+def settle_trades(df_log, history, symbol_ids):
+    """
+    Tutup trade yang TP/SL-nya sudah tersentuh, lalu hitung % Gain, Laba Bersih dan
+    Total Saldo dari harga exit (fee dengan rumus yang sama seperti form)
+    history: hasil get_price_history, symbol_ids: symbol -> CMC id (get_coin_ids_by_symbol)
+    Return (DataFrame log, jumlah trade yang ditutup)
+    """
+    if df_log.empty or not history or not len(history['ids']):
+        return df_log, 0
+    column_by_id = {int(coin_id): i for i, coin_id in enumerate(history['ids'])}
+    columns = base_symbols(df_log['Coin']).map(symbol_ids).map(column_by_id)
+    # Trade sebelum awal history tidak bisa dinilai (harga di antaranya tidak ada), biarkan terbuka
+    covered = df_log['Tanggal'].dt.normalize() >= pd.to_datetime(history['ts'][0], unit="s")
+    candidates = df_log['Status'].isin(OPEN_STATUSES) & columns.notna() & covered
+    if not candidates.any():
+        return df_log, 0
+
+    trades = df_log[candidates]
+    entry = trades['Entry Price'].to_numpy(dtype=float)
+    tp = trades['TP Price'].to_numpy(dtype=float)
+    sl = trades['SL Price'].to_numpy(dtype=float)
+    is_long = (trades['Type'] != "Short").to_numpy()
+    trade_day = trades['Tanggal'].dt.normalize().to_numpy().astype("datetime64[s]").astype(np.int64)
+    start = np.searchsorted(history['ts'], trade_day, side="right")  # Mulai hari setelah tanggal trade
+    hit_day, outcome = first_hits(
+        history['prices'], start, columns[candidates].to_numpy(dtype=np.int64), tp, sl, is_long
+    )
+    settled = outcome != 0
+    if not settled.any():
+        return df_log, 0
+
+    rows = trades.index[settled]
+    exit_price = np.where(outcome[settled] == 1, tp[settled], sl[settled])
+    direction = np.where(is_long[settled], 1, -1)
+    gain = direction * (exit_price - entry[settled]) / entry[settled] * 100
+    modal = trades.loc[rows, 'Modal (Rp)'].to_numpy(dtype=float)
+    laba_kotor = modal * gain / 100
+    laba_bersih = laba_kotor - np.abs(laba_kotor) * trades.loc[rows, 'Fee (%)'].to_numpy(dtype=float) / 100
+
+    df_log = df_log.copy()
+    for column in ('Exit Price', '% Gain', 'Laba Bersih (Rp)', 'Total Saldo (Rp)'):
+        df_log[column] = df_log[column].astype(float)
+    df_log['Tanggal Tutup'] = pd.to_datetime(df_log['Tanggal Tutup'])
+    df_log.loc[rows, 'Status'] = np.where(outcome[settled] == 1, TP_HIT, SL_HIT)
+    df_log.loc[rows, 'Exit Price'] = exit_price
+    df_log.loc[rows, 'Tanggal Tutup'] = pd.to_datetime(history['ts'][hit_day[settled]], unit="s")
+    df_log.loc[rows, '% Gain'] = gain.round(2)
+    df_log.loc[rows, 'Laba Bersih (Rp)'] = laba_bersih.round(0)
+    df_log.loc[rows, 'Total Saldo (Rp)'] = (modal + laba_bersih).round(0)
+    return df_log, int(settled.sum())
+
+
+def unsettled_reasons(df_log, history, symbol_ids):
+    """
+    Trade terbuka yang tidak bisa dinilai settle_trades dan alasannya: symbol tidak dikenal,
+    coin tanpa harga historis (termasuk fetch gagal), atau tanggal trade sebelum awal history
+    Return Series alasan -> jumlah trade (kosong kalau semua trade terbuka bisa dinilai)
+    """
+    open_log = df_log[df_log['Status'].isin(OPEN_STATUSES)]
+    if open_log.empty:
+        return pd.Series(dtype="int64")
+    coin_ids = base_symbols(open_log['Coin']).map(symbol_ids)
+    has_history = bool(history) and len(history['ids']) > 0
+    in_history = coin_ids.isin([int(coin_id) for coin_id in history['ids']] if has_history else [])
+    too_old = in_history
+    if has_history:
+        too_old = too_old & (open_log['Tanggal'].dt.normalize() < pd.to_datetime(history['ts'][0], unit="s"))
+    reasons = pd.Series(
+        np.select([coin_ids.isna(), ~in_history, too_old], [UNKNOWN_SYMBOL, NO_HISTORY, TOO_OLD], default=""),
+        index=open_log.index,
+    )
+    return reasons[reasons != ""].value_counts()
+
+# ===== STATISTIK TRADE =====
+def sentiment_performance(df_log, fear_greed_values):
+    """
+    Jumlah trade, win rate dan rata-rata % Gain trade tertutup per kelas Fear & Greed saat entry
+    fear_greed_values: nilai per baris df_log (market_history.fear_greed_at dari Tanggal), NaN diabaikan
+    """
+    closed = ~df_log['Status'].isin(OPEN_STATUSES).to_numpy()
+    sentiment = pd.cut(np.asarray(fear_greed_values, dtype=float)[closed], SENTIMENT_BINS, labels=SENTIMENT_LABELS)
+    gain = df_log.loc[closed, '% Gain'].astype(float).to_numpy()
+    grouped = pd.DataFrame({"sentiment": sentiment, "gain": gain, "win": gain > 0}).groupby("sentiment", observed=True)
+    return pd.DataFrame({
+        "Trades": grouped.size(),
+        "Win Rate (%)": grouped["win"].mean() * 100,
+        "Avg Gain (%)": grouped["gain"].mean(),
+    }).rename_axis("Fear & Greed")
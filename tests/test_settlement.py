@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from settlement import (
+    NO_HISTORY, SL_HIT, TOO_OLD, TP_HIT, UNKNOWN_SYMBOL,
+    first_hits, sentiment_performance, settle_trades, unsettled_reasons,
+)
+
+DAY = 86400
+START = int(pd.Timestamp("2024-01-01").timestamp())
+
+
+def _hits(prices, tp, sl, is_long, start=0):
+    prices = np.asarray(prices, dtype=float)[:, None]
+    n = len(tp)
+    return first_hits(
+        prices, np.full(n, start), np.zeros(n, dtype=np.int64),
+        np.asarray(tp, dtype=float), np.asarray(sl, dtype=float), np.asarray(is_long),
+    )
+
+def _history(prices):
+    prices = np.asarray(prices, dtype=float)
+    return {
+        "ts": START + np.arange(len(prices), dtype=np.int64) * DAY,
+        "ids": np.array([1]),
+        "symbols": ["BTC"],
+        "prices": prices[:, None],
+    }
+
+def _log(rows):
+    df_log = pd.DataFrame(rows)
+    df_log['Tanggal'] = pd.to_datetime(df_log['Tanggal'])
+    df_log['Coin'] = "BTCUSDT"
+    df_log['Status'] = "Open"
+    df_log['Modal (Rp)'] = 1_000_000.0
+    df_log['Fee (%)'] = 0.0
+    for column in ('% Gain', 'Laba Bersih (Rp)', 'Total Saldo (Rp)', 'Exit Price', 'Tanggal Tutup'):
+        df_log[column] = np.nan
+    return df_log
+
+
+def test_first_hits_long_tp_and_sl():
+    hit_day, outcome = _hits([100, 104, 111, 90], tp=[110, 200], sl=[95, 95], is_long=[True, True])
+    assert hit_day.tolist() == [2, 3]
+    assert outcome.tolist() == [1, -1]
+
+def test_first_hits_short_mirrors_long():
+    hit_day, outcome = _hits([100, 96, 89, 120], tp=[90, 50], sl=[110, 110], is_long=[False, False])
+    assert hit_day.tolist() == [2, 3]
+    assert outcome.tolist() == [1, -1]
+
+def test_first_hits_same_day_tp_and_sl_counts_as_sl():
+    # Satu titik harian menyentuh TP dan SL sekaligus: urutan intraday tidak diketahui
+    hit_day, outcome = _hits([100, 105], tp=[104, 106], sl=[106, 104], is_long=[True, False], start=1)
+    assert hit_day.tolist() == [1, 1]
+    assert outcome.tolist() == [-1, -1]
+
+def test_first_hits_skips_nan_days():
+    hit_day, outcome = _hits([100, np.nan, np.nan, 112], tp=[110], sl=[95], is_long=[True])
+    assert hit_day.tolist() == [3]
+    assert outcome.tolist() == [1]
+
+def test_first_hits_beyond_first_block():
+    prices = np.full(100, 100.0)
+    prices[70] = 120
+    hit_day, outcome = _hits(prices, tp=[110], sl=[90], is_long=[True])
+    assert hit_day.tolist() == [70]
+    assert outcome.tolist() == [1]
+
+def test_first_hits_untouched_and_start_past_history():
+    hit_day, outcome = _hits([100, 101, 102], tp=[110], sl=[90], is_long=[True])
+    assert hit_day.tolist() == [-1] and outcome.tolist() == [0]
+    hit_day, outcome = _hits([100, 200], tp=[110], sl=[90], is_long=[True], start=2)
+    assert hit_day.tolist() == [-1] and outcome.tolist() == [0]
+
+def test_settle_trades_long_and_short():
+    df_log = _log([
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2024-01-01", "Type": "Short", "Entry Price": 100.0, "TP Price": 90.0, "SL Price": 115.0},
+    ])
+    settled_log, settled = settle_trades(df_log, _history([100, 103, 112, 80]), {"BTC": 1})
+    assert settled == 2
+    assert settled_log['Status'].tolist() == [TP_HIT, TP_HIT]
+    assert settled_log['Exit Price'].tolist() == [110.0, 90.0]
+    assert settled_log['% Gain'].tolist() == [10.0, 10.0]
+    assert settled_log['Tanggal Tutup'].tolist() == [pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-04")]
+    assert settled_log['Total Saldo (Rp)'].tolist() == [1_100_000.0, 1_100_000.0]
+
+def test_settle_trades_ignores_trade_day_price():
+    # Scan mulai hari setelah tanggal trade, harga di hari trade sendiri tidak dihitung
+    df_log = _log([
+        {"Tanggal": "2024-01-02", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ])
+    settled_log, settled = settle_trades(df_log, _history([100, 120, 100]), {"BTC": 1})
+    assert settled == 0
+    assert settled_log['Status'].tolist() == ["Open"]
+
+def test_settle_trades_leaves_trades_older_than_history_open():
+    df_log = _log([
+        {"Tanggal": "2023-12-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ])
+    settled_log, settled = settle_trades(df_log, _history([100, 120]), {"BTC": 1})
+    assert settled == 1
+    assert settled_log['Status'].tolist() == ["Open", TP_HIT]
+    assert np.isnan(settled_log['Exit Price'].iloc[0])
+
+def test_settle_trades_unknown_symbol_stays_open():
+    df_log = _log([
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ])
+    settled_log, settled = settle_trades(df_log, _history([100, 120]), {})
+    assert settled == 0
+    assert settled_log['Status'].tolist() == ["Open"]
+
+def test_settle_trades_sl_applies_fee():
+    df_log = _log([
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ])
+    df_log['Fee (%)'] = 1.0
+    settled_log, settled = settle_trades(df_log, _history([100, 94]), {"BTC": 1})
+    assert settled == 1
+    assert settled_log['Status'].iloc[0] == SL_HIT
+    assert settled_log['% Gain'].iloc[0] == -5.0
+    # Rugi 50.000 ditambah fee 1% dari |laba kotor|
+    assert settled_log['Laba Bersih (Rp)'].iloc[0] == -50_500.0
+
+def test_sentiment_performance_groups_closed_trades():
+    df_log = _log([
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ] * 5)
+    df_log['Status'] = [TP_HIT, SL_HIT, TP_HIT, "Open", TP_HIT]
+    df_log['% Gain'] = [10.0, -5.0, 4.0, 10.0, 2.0]
+    stats = sentiment_performance(df_log, [10, 20, 80, 10, np.nan])
+    assert stats.index.tolist() == ["Extreme Fear", "Extreme Greed"]
+    assert stats['Trades'].tolist() == [2, 1]
+    assert stats['Win Rate (%)'].tolist() == [50.0, 100.0]
+    assert stats['Avg Gain (%)'].tolist() == [2.5, 4.0]
+
+def test_unsettled_reasons():
+    df_log = _log([
+        {"Tanggal": "2023-12-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2024-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+        {"Tanggal": "2023-01-01", "Type": "Long", "Entry Price": 100.0, "TP Price": 110.0, "SL Price": 95.0},
+    ])
+    df_log['Coin'] = ["BTCUSDT", "BTCUSDT", "ETHUSDT", "XYZUSDT", "BTCUSDT"]
+    df_log.loc[4, 'Status'] = SL_HIT
+    reasons = unsettled_reasons(df_log, _history([100, 101]), {"BTC": 1, "ETH": 1027})
+    assert reasons.to_dict() == {TOO_OLD: 1, NO_HISTORY: 1, UNKNOWN_SYMBOL: 1}
+    # Fetch history gagal: semua coin yang dikenal dianggap tanpa harga historis
+    reasons = unsettled_reasons(df_log, None, {"BTC": 1, "ETH": 1027})
+    assert reasons.to_dict() == {NO_HISTORY: 3, UNKNOWN_SYMBOL: 1}
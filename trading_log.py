@@ -0,0 +1,97 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+# ===== KONFIGURASI TRADING LOG =====
+LOG_FILE = os.getenv("TRADING_LOG_FILE", "trading_log.csv")
+LOG_COLUMNS = [
+    "Tanggal", "Coin", "Type", "Entry Price", "TP Price", "SL Price", "Modal (Rp)", "Fee (%)",
+    "% Gain", "Laba Bersih (Rp)", "Total Saldo (Rp)", "Status", "Exit Price", "Tanggal Tutup",
+]
+DEFAULT_FEE_PERCENT = 0.075  # Sama dengan default form, untuk log lama yang belum menyimpan fee
+# Status posisi yang modalnya masih terpakai (dipakai untuk bobot portfolio di risk.py)
+OPEN_STATUSES = ["Planned", "Open"]
+# Suffix quote currency yang dibuang dari nama pair, dicek dari yang terpanjang
+QUOTE_SUFFIXES = ("FDUSD", "USDT", "USDC", "BUSD", "USD", "IDR", "BTC", "ETH")
+
+
+# ===== FUNGSI TRADING LOG =====
+def empty_log():
+    return pd.DataFrame(columns=LOG_COLUMNS)
+
+def load_log(log_file=LOG_FILE):
+    """Baca trading log dari CSV, DataFrame kosong kalau file belum ada"""
+    if not os.path.exists(log_file):
+        return empty_log()
+    df_log = pd.read_csv(log_file)
+    # Log lama belum punya kolom Type / Fee / Exit: isi default
+    if 'Type' not in df_log:
+        df_log['Type'] = np.where(df_log['TP Price'] >= df_log['Entry Price'], "Long", "Short")
+    if 'Fee (%)' not in df_log:
+        df_log['Fee (%)'] = DEFAULT_FEE_PERCENT
+    for column in ('Exit Price', 'Tanggal Tutup'):
+        if column not in df_log:
+            df_log[column] = np.nan
+    # Ensure proper column types
+    df_log['Tanggal'] = pd.to_datetime(df_log['Tanggal'])
+    df_log['Tanggal Tutup'] = pd.to_datetime(df_log['Tanggal Tutup'])
+    df_log['Exit Price'] = df_log['Exit Price'].astype(float)
+    return df_log
+
+def save_log(df_log, log_file=LOG_FILE):
+    df_log.to_csv(log_file, index=False)
+
+def append_log(df_log, new_row, log_file=LOG_FILE):
+    """Tambah satu baris lalu simpan ulang seluruh log ke CSV"""
+    df_log = pd.concat([df_log, pd.DataFrame([new_row])], ignore_index=True)
+    save_log(df_log, log_file)
+    return df_log
+
+def filter_log(df_log, date_range=None, coin='All', status='All'):
+    """Filter log berdasarkan rentang tanggal (tuple 2 date), coin dan status"""
+    df_filtered = df_log.copy()
+
+    if date_range is not None and len(date_range) == 2:
+        df_filtered = df_filtered[
+            (df_filtered['Tanggal'].dt.date >= date_range[0]) &
+            (df_filtered['Tanggal'].dt.date <= date_range[1])
+        ]
+
+    if coin != 'All':
+        df_filtered = df_filtered[df_filtered['Coin'] == coin]
+
+    if status != 'All':
+        df_filtered = df_filtered[df_filtered['Status'] == status]
+
+    return df_filtered
+
+def base_symbol(coin):
+    """Symbol coin dari nama pair di log: 'BTCUSDT', 'btc/usdt', 'BTC-USD' -> 'BTC'"""
+    coin = str(coin).upper().strip()
+    for separator in ("/", "-", "_"):
+        if separator in coin:
+            return coin.split(separator)[0]
+    for suffix in QUOTE_SUFFIXES:
+        if coin.endswith(suffix) and len(coin) > len(suffix):
+            return coin[:-len(suffix)]
+    return coin
+
+def base_symbols(coins):
+    """base_symbol untuk Series nama pair, dihitung sekali per pair unik"""
+    return coins.map({coin: base_symbol(coin) for coin in coins.unique()})
+
+def open_positions(df_log):
+    """Total Modal (Rp) per symbol untuk posisi yang belum ditutup"""
+    if df_log.empty:
+        return {}
+    open_log = df_log[df_log['Status'].isin(OPEN_STATUSES)]
+    return open_log.groupby(base_symbols(open_log['Coin']))['Modal (Rp)'].sum().to_dict()
+
+def to_excel_bytes(df_log):
+    """Export log ke file Excel (bytes) untuk download_button"""
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        df_log.to_excel(writer, sheet_name='Trading_Log', index=False)
+    return excel_buffer.getvalue()
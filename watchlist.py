@@ -0,0 +1,34 @@
+"""
+Watchlist coin (CMC id) yang dipakai bersama oleh tab Trading Signals dan modul risk
+Disimpan sebagai JSON di WATCHLIST_FILE supaya bertahan antar restart
+"""
+import json
+import os
+import tempfile
+
+# ===== KONFIGURASI WATCHLIST =====
+WATCHLIST_FILE = os.getenv("WATCHLIST_FILE", "watchlist.json")
+# Default: coin populer non-stablecoin (BTC, ETH, BNB, SOL, XRP, DOGE, ADA, AVAX)
+DEFAULT_WATCHLIST = [1, 1027, 1839, 5426, 52, 74, 2010, 5805]
+
+
+def load_watchlist(watchlist_file=WATCHLIST_FILE):
+    """List coin id di watchlist, default kalau file belum ada atau rusak"""
+    if not os.path.exists(watchlist_file):
+        return list(DEFAULT_WATCHLIST)
+    try:
+        with open(watchlist_file) as f:
+            return [int(coin_id) for coin_id in json.load(f)["coins"]]
+    except (ValueError, KeyError, TypeError):
+        return list(DEFAULT_WATCHLIST)
+
+def save_watchlist(coin_ids, watchlist_file=WATCHLIST_FILE):
+    # Temp file unik per penulisan supaya dua sesi yang menyimpan bersamaan tidak saling tabrak
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(watchlist_file)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump({"coins": [int(coin_id) for coin_id in coin_ids]}, f, indent=2)
+        os.replace(tmp_file, watchlist_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise